@@ -7,9 +7,12 @@
 # ====================================================================
 
 import os  # Importa el módulo os para interactuar con el sistema operativo
-import pandas as pd  # Importa pandas para la manipulación de datos
-import matplotlib.pyplot as plt  # Importa matplotlib para la creación de gráficos
-import numpy as np  # Importa numpy para operaciones con arreglos y números
+import sys  # Importa sys para poder importar los módulos compartidos de la carpeta opciones_financieras
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Carpeta opciones_financieras (módulos compartidos)
+from estrategias import venta_call  # Motor de estrategias de opciones (payoff vectorizado)
+from grilla_precios import grilla_precios  # Grilla con los strikes y puntos de equilibrio exactos
+import salidas  # Gráfico, tabla y exportación (pandas y matplotlib se importan solo si se usan)
 
 # Parámetros
 precio_strike = 3910  # Precio de strike de la opción (precio de ejercicio)
@@ -17,6 +20,17 @@ prima = 158  # Prima de la opción (el costo de la opción)
 cant_contratos = 1  # Cantidad de contratos vendidos
 rango = 40  # Rango de precios alrededor del precio de equilibrio para analizar
 
+# Resultado antes del vencimiento con Black-Scholes (con dias_al_vencimiento = 0 solo se calcula el resultado al vencimiento)
+dias_al_vencimiento = 0  # Días que faltan para el vencimiento
+volatilidad = 0.30  # Volatilidad anual del subyacente (0.30 = 30%)
+tasa_interes = 0.0  # Tasa libre de riesgo anual (0.05 = 5%)
+
+# Simulación Monte Carlo del resultado al vencimiento (con simulaciones_montecarlo = 0 no se simula).
+# Usa dias_al_vencimiento y volatilidad de arriba (con dias_al_vencimiento = 0 se avisa y no se simula)
+simulaciones_montecarlo = 0  # Cantidad de trayectorias simuladas (por ejemplo 1_000_000)
+precio_subyacente = precio_strike  # Precio actual del subyacente (punto de partida de la simulación)
+semilla = None  # Semilla para repetir exactamente la misma simulación (None = distinta en cada ejecución)
+
 # Código alternativo para entrada de datos por teclado (descomentar si se prefiere y comentar el código de arriba en Parámetros)
 """
 precio_strike = int(input("Introduce el strike: "))
@@ -25,79 +39,70 @@ cant_contratos = int(input("Introduce la cantidad de contratos: "))
 rango = int(input("Introduce el rango: "))
 """
 
-# Punto de equilibrio
-punto_equilibrio = precio_strike + prima  # El punto donde la ganancia es igual a la prima recibida
-
-# Rango de precios centrado en el punto de equilibrio
-precios = np.arange(punto_equilibrio - rango*8, punto_equilibrio + rango*10, rango)  # Rango de precios en pasos de 'rango' alrededor del punto de equilibrio
-if punto_equilibrio not in precios:  # Verifica si el punto de equilibrio ya está en el rango de precios
-    precios = np.append(precios, punto_equilibrio)  # Si no está, lo agrega
-    precios = np.sort(precios)  # Ordena el arreglo de precios de menor a mayor
-
-# Cálculo del payoff (ganancia/pérdida)
-datos = []  # Lista vacía para almacenar los resultados
-for precio_sub in precios:  # Itera sobre cada precio en el rango de precios
-    # Fórmula para venta de CALL: prima - max(0, precio_sub - precio_strike)
-    # Es el opuesto del payoff de compra de CALL
-    resultado = prima - max(0, precio_sub - precio_strike)
-    datos.append([precio_sub, resultado * cant_contratos])  # Agrega el precio y el resultado al listado de datos
-
-# Crear DataFrame de pandas con los datos
-df = pd.DataFrame(datos, columns=['Precio Sub', 'Resultado'])  # Convierte los datos a un DataFrame para mejor manejo
-
-# Obtener la ruta del directorio donde se encuentra este script
-directorio_actual = os.path.dirname(os.path.abspath(__file__))
-
-# Crear la carpeta de resultados al mismo nivel que el script
-carpeta_resultados = os.path.join(directorio_actual, 'resultados')  # Define la ruta completa de la carpeta
-
-# Verificar si la carpeta no existe y crearla si es necesario
-if not os.path.exists(carpeta_resultados):  # Verifica si la carpeta no existe
-    os.makedirs(carpeta_resultados)  # Si no existe, la crea
-
-# Gráfico de resultados
-plt.figure(figsize=(10, 6))  # Define el tamaño del gráfico (más compacto)
-
-# Líneas guía en el gráfico
-plt.axhline(y=0, color='blue', linestyle='--')  # Línea horizontal para el punto de equilibrio
-plt.axhline(y=prima, color='green', linestyle='--', label='Ganancia máxima')  # Línea horizontal para la ganancia máxima
-plt.axvline(x=punto_equilibrio, color='blue', linestyle='--', label='Punto de equilibrio')  # Línea vertical para el punto de equilibrio
-
-# Línea principal del gráfico
-plt.plot(df['Precio Sub'], df['Resultado'], marker='o', color='black', label='Payoff Opción')  # Plotea el payoff de la opción
-
-# Personalización del gráfico
-plt.xticks(df['Precio Sub'], rotation=60, fontsize=12)  # Rotación de las etiquetas del eje X para mejor visualización
-
-# Eje Y: Utilizamos los resultados calculados en la tabla como ticks en el eje Y
-yticks = np.unique(df['Resultado'])  # Obtiene los valores únicos de los resultados para los ticks del eje Y
-plt.yticks(yticks, fontsize=12)  # Establece los valores del eje Y según los resultados
-
-plt.ylim(min(yticks) - 10, max(yticks) + 10)  # Establece los límites del eje Y con un pequeño margen
-
-# Etiquetas y leyenda
-plt.xlabel('Precio Subyacente', fontsize=14)  # Etiqueta para el eje X
-plt.ylabel('Ganancia / Pérdida', fontsize=14)  # Etiqueta para el eje Y
-plt.title('Resultado de una Venta de CALL', fontsize=16)  # Título del gráfico
-plt.grid(color='gray', linestyle='--', linewidth=0.5)  # Añade una cuadrícula ligera en el gráfico
-plt.legend(fontsize=12)  # Muestra la leyenda con una fuente de tamaño 12
-plt.tight_layout(pad=2)  # Ajusta el espacio en el gráfico para evitar que las etiquetas se corten
-
-# Guardar el gráfico como imagen
-nombre_imagen = f"{precio_strike}_venta_call_grafico.png"
-ruta_imagen = os.path.join(carpeta_resultados, nombre_imagen)
-plt.savefig(ruta_imagen, dpi=300, bbox_inches='tight')
-plt.show()  # Muestra el gráfico
-
-# Mostrar DataFrame en la consola
-print("\nTabla de ganancias y pérdidas:")
-print(df)  # Imprime el DataFrame con los resultados
-
-# Exportar directamente a Excel dentro de la carpeta de resultados
-nombre_archivo = f"{precio_strike}_venta_call_tabla_PL.xlsx"  # Define el nombre del archivo Excel
-ruta_archivo = os.path.join(carpeta_resultados, nombre_archivo)  # Crea la ruta completa del archivo
-df.to_excel(ruta_archivo, index=False)  # Guarda el DataFrame en un archivo Excel en la ruta especificada
-
-# Mensaje de confirmación
-print(f"\n✅ El resultado se exportó a Excel como: {ruta_archivo}")  # Imprime el mensaje de éxito
-print(f"✅ El gráfico se guardó como: {ruta_imagen}")  # Imprime el mensaje de éxito para la imagen 
\ No newline at end of file
+
+def calcular(precio_strike, prima, cant_contratos, rango, dias_al_vencimiento=0, volatilidad=0.30, tasa_interes=0.0):
+    """Calcula la tabla de ganancias y pérdidas sin gráficos ni archivos.
+
+    Devuelve (estrategia, punto_equilibrio, tabla), donde tabla es un diccionario columna -> arreglo de NumPy
+    ('Precio Sub', 'Resultado' y, con dias_al_vencimiento > 0, 'Resultado Hoy').
+    """
+    # Punto de equilibrio
+    punto_equilibrio = precio_strike + prima  # El punto donde la ganancia es igual a la prima recibida
+
+    # Cálculo del payoff (ganancia/pérdida) para todos los precios a la vez
+    # Venta de CALL: prima - max(0, precio_sub - precio_strike), el opuesto del payoff de compra de CALL
+    estrategia = venta_call(precio_strike, prima, cant_contratos)  # Estrategia de una sola pata
+
+    # Rango de precios en pasos de 'rango' alrededor del punto de equilibrio, con el strike y el punto de equilibrio exactos
+    precios = grilla_precios(estrategia, punto_equilibrio - rango*8, punto_equilibrio + rango*9, paso=rango, origen=punto_equilibrio)
+    tabla = {'Precio Sub': precios, 'Resultado': estrategia.payoff(precios)}  # Ganancia/pérdida total (ya multiplicada por la cantidad de contratos)
+    if dias_al_vencimiento > 0:  # Valor teórico de la posición hoy, según los días que faltan para el vencimiento
+        tabla['Resultado Hoy'] = estrategia.resultado_teorico(precios, volatilidad, dias_al_vencimiento / 365, tasa_interes)
+    return estrategia, punto_equilibrio, tabla
+
+
+def main():
+    args = salidas.parsear_argumentos("Análisis de una Venta de CALL.")
+    estrategia, punto_equilibrio, tabla = calcular(precio_strike, prima, cant_contratos, rango,
+                                                   dias_al_vencimiento, volatilidad, tasa_interes)
+
+    # Carpeta de resultados al mismo nivel que el script
+    carpeta_resultados = salidas.carpeta_resultados(__file__)
+    ruta_imagen = None
+
+    # Gráfico de resultados (matplotlib se importa recién acá)
+    if not args.sin_grafico:
+        ruta_imagen = os.path.join(carpeta_resultados, f"{precio_strike}_venta_call_grafico.png")
+        salidas.graficar_payoff(tabla, 'Resultado de una Venta de CALL', punto_equilibrio,
+                                (prima, 'Ganancia máxima', 'green'),  # Línea horizontal para la ganancia máxima
+                                ruta_imagen, dias_al_vencimiento, mostrar=not args.sin_mostrar)
+
+    # Mostrar la tabla en la consola
+    if not args.solo_calculo:
+        salidas.mostrar_tabla(tabla)
+
+    # Distribución del resultado por Monte Carlo, repartida entre todos los núcleos
+    if simulaciones_montecarlo > 0 and dias_al_vencimiento > 0:
+        from montecarlo import simular_resultado, imprimir_resumen  # Simulación Monte Carlo del resultado al vencimiento
+        resumen = simular_resultado(estrategia, precio_subyacente, volatilidad, dias_al_vencimiento / 365,
+                                    simulaciones_montecarlo, tasa_interes, semilla=semilla)
+        imprimir_resumen(resumen)
+    elif simulaciones_montecarlo > 0:
+        print("\n🎲 Simulación Monte Carlo omitida: con dias_al_vencimiento = 0 la opción ya venció y el resultado "
+              "no tiene incertidumbre (es el de la tabla). Indicá los días al vencimiento para simular.")
+
+    # Exportar la tabla dentro de la carpeta de resultados (Excel por defecto, CSV y Parquet a pedido)
+    ruta_base = os.path.join(carpeta_resultados, f"{precio_strike}_venta_call_tabla_PL")
+    rutas = salidas.exportar_tabla(tabla, ruta_base, excel=not args.sin_excel, csv=args.csv, parquet=args.parquet)
+
+    # Mensaje de confirmación
+    if rutas:
+        print()
+    for ruta_archivo in rutas:
+        print(f"✅ La tabla se exportó como: {ruta_archivo}")  # Imprime el mensaje de éxito
+    if ruta_imagen:
+        print(f"✅ El gráfico se guardó como: {ruta_imagen}")  # Imprime el mensaje de éxito para la imagen
+
+
+if __name__ == "__main__":
+    main()
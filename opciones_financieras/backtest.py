@@ -0,0 +1,293 @@
+# ====================================================================
+# Autor: Emiliano Carracedo
+# Título: Analista de Sistemas
+# Ubicación: Córdoba, Argentina
+# Contacto: ecarracedo@gmail.com
+# Descripción: Backtest de las estrategias de los scripts (compra de CALL,
+#              venta de CALL y compra de PUT) sobre una serie histórica de
+#              precios. En cada rollo abre una opción con strike relativo al
+#              precio del día y prima de Black-Scholes (volatilidad histórica),
+#              la valúa día a día y la cierra al vencimiento o antes si toca la
+#              toma de ganancia o el stop. Todas las fechas y todos los strikes
+#              de una combinación se calculan juntos con NumPy, y el barrido de
+#              parámetros se reparte entre varios procesos.
+# ====================================================================
+
+import argparse  # Importa argparse para leer los parámetros de línea de comandos
+import itertools  # Combinaciones de parámetros del barrido
+import os  # Importa el módulo os para interactuar con el sistema operativo
+import time  # Importa time para medir la duración del backtest
+from concurrent.futures import ProcessPoolExecutor  # Reparte las combinaciones entre varios procesos
+
+import numpy as np  # Importa numpy para operaciones con arreglos y números
+
+import black_scholes  # Primas y valuación diaria de las opciones
+
+RUEDAS_POR_ANIO = 252  # Días hábiles por año (plazos y volatilidad anualizada)
+VENTANA_VOLATILIDAD = 20  # Ruedas de la volatilidad histórica con la que se valúan las opciones
+
+# Estrategia -> (tipo de opción, signo de la posición)
+ESTRATEGIAS = {
+    "compra_call": ("call", 1.0),
+    "venta_call": ("call", -1.0),
+    "compra_put": ("put", 1.0),
+}
+
+
+def volatilidad_historica(precios, ventana=VENTANA_VOLATILIDAD):
+    """Volatilidad anual de los rendimientos logarítmicos de las últimas `ventana` ruedas, para cada fecha.
+
+    La volatilidad de una fecha usa solo los precios hasta esa fecha. Las primeras `ventana` fechas no tienen
+    historia suficiente y quedan en NaN (no se completan con datos posteriores: sería mirar el futuro).
+    """
+    if ventana < 2:
+        raise ValueError(f"La ventana de volatilidad debe ser de al menos 2 ruedas (se indicó {ventana})")
+    if len(precios) <= ventana:
+        raise ValueError(f"La serie tiene {len(precios)} precios: la volatilidad de {ventana} ruedas necesita al menos "
+                         f"{ventana + 1}")
+    rendimientos = np.diff(np.log(precios))
+    suma = np.concatenate(([0.0], np.cumsum(rendimientos)))
+    suma_cuadrados = np.concatenate(([0.0], np.cumsum(rendimientos ** 2)))
+    volatilidad = np.full(len(precios), np.nan)
+    media = (suma[ventana:] - suma[:-ventana]) / ventana
+    varianza = (suma_cuadrados[ventana:] - suma_cuadrados[:-ventana]) / ventana - media ** 2
+    volatilidad[ventana:] = np.sqrt(np.maximum(varianza, 0) * ventana / (ventana - 1) * RUEDAS_POR_ANIO)
+    return volatilidad
+
+
+def simular_ciclos(precios, volatilidad, estrategia, ruedas, desplazamientos, toma_ganancia=None, stop=None, tasa=0.0):
+    """Resultado por contrato de rollos sucesivos de ruedas días, para varios desplazamientos de strike a la vez.
+
+    Los rollos empiezan en la primera fecha con volatilidad (después de la ventana de la volatilidad histórica).
+    En cada rollo (cada `ruedas` ruedas) se abre la opción con strike = precio * (1 + desplazamiento) y prima de
+    Black-Scholes, se valúa en cada rueda hasta el vencimiento y se cierra en la primera rueda en que el resultado
+    llega a toma_ganancia * prima o cae a -stop * prima (si se indican), o al vencimiento. Todo se calcula con
+    arreglos desplazamientos x rollos x ruedas, sin recorrer las fechas.
+
+    Devuelve (inicio, resultado_diario, resultado_rollo, anticipadas): resultado_diario es el cambio del resultado
+    acumulado en cada rueda desde inicio + 1 (desplazamientos x rollos * ruedas), resultado_rollo el resultado de
+    cada rollo (desplazamientos x rollos) y anticipadas cuántos rollos se cerraron antes del vencimiento.
+    """
+    tipo, signo = ESTRATEGIAS[estrategia]
+    desplazamientos = np.asarray(desplazamientos, dtype=float)
+    con_volatilidad = np.flatnonzero(~np.isnan(volatilidad))
+    desde = con_volatilidad[0] if len(con_volatilidad) else len(precios)
+    entradas = np.arange(desde, len(precios) - ruedas, ruedas)  # Ruedas en que se abre cada rollo
+    if len(entradas) == 0:
+        raise ValueError(f"La serie tiene {len(precios)} precios: después de las {desde} ruedas sin volatilidad "
+                         f"histórica no alcanza para un rollo de {ruedas} ruedas")
+    indices = entradas[:, None] + np.arange(ruedas + 1)[None, :]  # rollos x (ruedas + 1)
+
+    camino = precios[indices][None, :, :]
+    strike = precios[entradas][None, :, None] * (1 + desplazamientos[:, None, None])
+    plazo = ((ruedas - np.arange(ruedas + 1)) / RUEDAS_POR_ANIO)[None, None, :]  # Años al vencimiento en cada rueda
+    valor = black_scholes.precio(tipo, camino, strike, volatilidad[indices][None, :, :], plazo, tasa)
+    prima = valor[:, :, :1]
+    resultado = signo * (valor - prima)  # Resultado acumulado por contrato si se cerrara en cada rueda
+
+    # Primera rueda que cumple la regla de salida (o el vencimiento)
+    salir = np.zeros(resultado.shape, dtype=bool)
+    if toma_ganancia is not None:
+        salir |= resultado >= toma_ganancia * prima
+    if stop is not None:
+        salir |= resultado <= -stop * prima
+    salir[:, :, 0] = False
+    salir[:, :, -1] = True
+    salida = salir.argmax(axis=2)  # desplazamientos x rollos
+
+    # Después de la salida el resultado queda fijo (la posición está cerrada hasta el próximo rollo)
+    cerrado = np.arange(ruedas + 1)[None, None, :] > salida[:, :, None]
+    resultado_rollo = np.take_along_axis(resultado, salida[:, :, None], axis=2)
+    resultado = np.where(cerrado, resultado_rollo, resultado)
+
+    # Los rollos son consecutivos, así que los cambios diarios forman una serie continua desde la primera entrada
+    resultado_diario = np.diff(resultado, axis=2).reshape(len(desplazamientos), -1)
+    anticipadas = np.count_nonzero(salida < ruedas, axis=1)
+    return entradas[0], resultado_diario, resultado_rollo[:, :, 0], anticipadas
+
+
+def estadisticas(curva, resultado_rollo, anticipadas):
+    """Resumen de una curva de capital (resultado acumulado por fecha) y de los resultados de sus rollos."""
+    cambios = np.diff(curva, prepend=0.0)
+    desvio = cambios.std()
+    return {
+        "operaciones": len(resultado_rollo),
+        "resultado_total": float(curva[-1]),
+        "resultado_promedio": float(resultado_rollo.mean()),
+        "tasa_acierto": float(np.count_nonzero(resultado_rollo > 0) / len(resultado_rollo)),
+        "max_drawdown": float((np.maximum.accumulate(curva) - curva).max()),
+        "sharpe": float(cambios.mean() / desvio * np.sqrt(RUEDAS_POR_ANIO)) if desvio > 0 else 0.0,
+        "salidas_anticipadas": int(anticipadas),
+    }
+
+
+def _curvas(precios, inicio, resultado_diario):
+    """Curvas de capital por contrato alineadas con las fechas: 0 antes de la primera entrada y fijas después del último rollo."""
+    curvas = np.zeros((len(resultado_diario), len(precios)))
+    fin = inicio + 1 + resultado_diario.shape[1]
+    curvas[:, inicio + 1:fin] = np.cumsum(resultado_diario, axis=1)
+    curvas[:, fin:] = curvas[:, fin - 1:fin]
+    return curvas
+
+
+def _evaluar(argumentos):
+    """Filas del resumen de todas las combinaciones de desplazamiento y tamaño de una (estrategia, ruedas, toma_ganancia, stop).
+
+    El resultado es lineal en la cantidad de contratos, así que los tamaños no agregan cálculo: se multiplica.
+    """
+    precios, volatilidad, estrategia, ruedas, desplazamientos, tamanos, toma_ganancia, stop, tasa = argumentos
+    inicio, resultado_diario, resultado_rollo, anticipadas = simular_ciclos(
+        precios, volatilidad, estrategia, ruedas, desplazamientos, toma_ganancia, stop, tasa)
+    curvas = _curvas(precios, inicio, resultado_diario)
+
+    filas = []
+    for (i, desplazamiento), tamano in itertools.product(enumerate(desplazamientos), tamanos):
+        filas.append({
+            "estrategia": estrategia,
+            "ruedas": ruedas,
+            "desplazamiento": desplazamiento,
+            "contratos": tamano,
+            "toma_ganancia": toma_ganancia,
+            "stop": stop,
+            **estadisticas(curvas[i] * tamano, resultado_rollo[i] * tamano, anticipadas[i]),
+        })
+    return filas
+
+
+def barrido(precios, estrategias, ruedas, desplazamientos, tamanos=(1,), tomas_ganancia=(None,), stops=(None,),
+            tasa=0.0, ventana=VENTANA_VOLATILIDAD, procesos=None):
+    """Backtest de todas las combinaciones de parámetros. Devuelve una fila de resumen por combinación.
+
+    Cada tarea del pool es una (estrategia, ruedas, toma_ganancia, stop) y calcula juntos todos los
+    desplazamientos, todas las fechas y todos los tamaños. procesos=1 calcula en el proceso actual; None usa
+    todos los núcleos. Las curvas de capital no se guardan (miles de combinaciones por miles de fechas ocupan
+    mucha memoria): curvas_capital las recalcula para las combinaciones elegidas.
+    """
+    precios = np.asarray(precios, dtype=float)
+    volatilidad = volatilidad_historica(precios, ventana)
+    tareas = [(precios, volatilidad, estrategia, int(r), list(desplazamientos), list(tamanos), tg, st, tasa)
+              for estrategia, r, tg, st in itertools.product(estrategias, ruedas, tomas_ganancia, stops)]
+
+    if procesos == 1 or len(tareas) == 1:
+        partes = list(map(_evaluar, tareas))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            partes = list(pool.map(_evaluar, tareas))  # Devuelve las partes en el orden de las tareas
+    return [fila for parte in partes for fila in parte]
+
+
+def curvas_capital(precios, filas, tasa=0.0, ventana=VENTANA_VOLATILIDAD):
+    """Curva de capital (resultado acumulado en cada fecha) de cada combinación (filas de barrido)."""
+    precios = np.asarray(precios, dtype=float)
+    volatilidad = volatilidad_historica(precios, ventana)
+    curvas = np.empty((len(filas), len(precios)))
+    for i, fila in enumerate(filas):
+        inicio, resultado_diario, _, _ = simular_ciclos(precios, volatilidad, fila["estrategia"], fila["ruedas"],
+                                                        [fila["desplazamiento"]], fila["toma_ganancia"], fila["stop"], tasa)
+        curvas[i] = _curvas(precios, inicio, resultado_diario)[0] * fila["contratos"]
+    return curvas
+
+
+def leer_precios(ruta, columna_fecha="fecha", columna_precio="cierre"):
+    """Lee la serie histórica (CSV o Parquet) ordenada por fecha. Devuelve (fechas, precios)."""
+    import pandas as pd  # Importa pandas para leer la serie
+
+    serie = pd.read_parquet(ruta) if ruta.endswith(".parquet") else pd.read_csv(ruta)
+    faltantes = [c for c in (columna_fecha, columna_precio) if c not in serie]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en {ruta}: {', '.join(faltantes)} (ver --columna-fecha y --columna-precio)")
+    serie = serie[[columna_fecha, columna_precio]].dropna()
+    serie[columna_fecha] = pd.to_datetime(serie[columna_fecha])
+    serie = serie.sort_values(columna_fecha)
+    return serie[columna_fecha].to_numpy(), serie[columna_precio].to_numpy(dtype=float)
+
+
+def graficar_curvas(fechas, curvas, etiquetas, ruta_imagen):
+    """Gráfico de las curvas de capital indicadas."""
+    import matplotlib.pyplot as plt  # Solo se importa si se genera el gráfico
+
+    plt.figure(figsize=(10, 6))
+    for curva, etiqueta in zip(curvas, etiquetas):
+        plt.plot(fechas, curva, label=etiqueta)
+    plt.axhline(y=0, color='blue', linestyle='--')
+    plt.xlabel("Fecha", fontsize=14)
+    plt.ylabel("Resultado acumulado", fontsize=14)
+    plt.title("Backtest: mejores combinaciones", fontsize=16)
+    plt.grid(color="gray", linestyle="--", linewidth=0.5)
+    plt.legend(fontsize=10)
+    plt.tight_layout(pad=2)
+    plt.savefig(ruta_imagen, dpi=300, bbox_inches="tight")
+    plt.close()
+
+
+def parsear_argumentos():
+    parser = argparse.ArgumentParser(description="Backtest de compra de CALL, venta de CALL y compra de PUT sobre una serie histórica.")
+    parser.add_argument("precios", help="CSV o Parquet con la serie histórica del subyacente")
+    parser.add_argument("--columna-fecha", default="fecha", help="Columna de la fecha (por defecto fecha)")
+    parser.add_argument("--columna-precio", default="cierre", help="Columna del precio (por defecto cierre)")
+    parser.add_argument("--estrategias", nargs="+", choices=sorted(ESTRATEGIAS), default=sorted(ESTRATEGIAS),
+                        help="Estrategias a evaluar (por defecto todas)")
+    parser.add_argument("--ruedas", type=int, nargs="+", default=[21],
+                        help="Ruedas hasta el vencimiento de cada rollo (por defecto 21, un mes)")
+    parser.add_argument("--desplazamientos", type=float, nargs="+", default=[-0.05, 0.0, 0.05],
+                        help="Strike relativo al precio de entrada (0.05 = 5%% por encima)")
+    parser.add_argument("--contratos", type=int, nargs="+", default=[1], help="Cantidades de contratos")
+    parser.add_argument("--toma-ganancia", type=float, nargs="+",
+                        help="Cierra cuando el resultado llega a esta fracción de la prima (por ejemplo 0.5)")
+    parser.add_argument("--stop", type=float, nargs="+",
+                        help="Cierra cuando la pérdida llega a esta fracción de la prima (por ejemplo 1.0)")
+    parser.add_argument("--tasa", type=float, default=0.0, help="Tasa libre de riesgo anual")
+    parser.add_argument("--ventana", type=int, default=VENTANA_VOLATILIDAD,
+                        help=f"Ruedas de la volatilidad histórica (por defecto {VENTANA_VOLATILIDAD})")
+    parser.add_argument("--procesos", type=int, help="Procesos en paralelo (por defecto, todos los núcleos)")
+    parser.add_argument("--mejores", type=int, default=5, help="Curvas de capital que se guardan (las de mayor resultado)")
+    parser.add_argument("--formato", choices=["parquet", "csv"], default="csv", help="Formato de la salida (por defecto csv)")
+    parser.add_argument("--salida", help="Carpeta de salida (por defecto, resultados/ junto a la serie)")
+    parser.add_argument("--sin-grafico", action="store_true", help="No genera el gráfico de las mejores curvas")
+    return parser.parse_args()
+
+
+def main():
+    import pandas as pd  # Importa pandas para exportar el resumen y las curvas
+    from escenarios import guardar  # Guardado en Parquet o CSV según la extensión
+
+    args = parsear_argumentos()
+    fechas, precios = leer_precios(args.precios, args.columna_fecha, args.columna_precio)
+
+    inicio = time.perf_counter()
+    filas = barrido(precios, args.estrategias, args.ruedas, args.desplazamientos, args.contratos,
+                    args.toma_ganancia or [None], args.stop or [None], args.tasa, args.ventana, args.procesos)
+    print(f"📈 {len(filas):,} combinaciones sobre {len(precios):,} ruedas en {time.perf_counter() - inicio:.2f} s")
+
+    resumen = pd.DataFrame(filas).sort_values("resultado_total", ascending=False)
+    print(resumen.head(args.mejores).to_string(index=False))
+
+    carpeta_resultados = args.salida or os.path.join(os.path.dirname(os.path.abspath(args.precios)), "resultados")
+    os.makedirs(carpeta_resultados, exist_ok=True)
+    nombre = os.path.splitext(os.path.basename(args.precios))[0]
+
+    ruta_resumen = os.path.join(carpeta_resultados, f"{nombre}_backtest_resumen.{args.formato}")
+    guardar(resumen, ruta_resumen)
+    print(f"\n✅ El resumen del backtest se guardó en: {ruta_resumen}")
+
+    # Curvas de capital de las mejores combinaciones, una columna por combinación
+    mejores = [filas[i] for i in resumen.index[:args.mejores]]
+    curvas = curvas_capital(precios, mejores, args.tasa, args.ventana)
+    etiquetas = [f"{f['estrategia']} {f['ruedas']}r {f['desplazamiento']:+.0%} x{f['contratos']}"
+                 + (f" tg {f['toma_ganancia']:g}" if f["toma_ganancia"] is not None else "")
+                 + (f" stop {f['stop']:g}" if f["stop"] is not None else "")
+                 for f in mejores]
+    tabla_curvas = pd.DataFrame(curvas.T, columns=etiquetas)
+    tabla_curvas.insert(0, "fecha", fechas)
+    ruta_curvas = os.path.join(carpeta_resultados, f"{nombre}_backtest_curvas.{args.formato}")
+    guardar(tabla_curvas, ruta_curvas)
+    print(f"✅ Las curvas de capital se guardaron en: {ruta_curvas}")
+
+    if not args.sin_grafico:
+        ruta_imagen = os.path.join(carpeta_resultados, f"{nombre}_backtest_curvas.png")
+        graficar_curvas(fechas, curvas, etiquetas, ruta_imagen)
+        print(f"✅ El gráfico se guardó como: {ruta_imagen}")
+
+
+if __name__ == "__main__":
+    main()
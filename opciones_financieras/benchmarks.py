@@ -0,0 +1,201 @@
+# ====================================================================
+# Autor: Emiliano Carracedo
+# Título: Analista de Sistemas
+# Ubicación: Córdoba, Argentina
+# Contacto: ecarracedo@gmail.com
+# Descripción: Mediciones de rendimiento del análisis de opciones: payoff con
+#              el bucle original y vectorizado, valuación y griegas de una
+#              cadena grande, volatilidad implícita y simulación Monte Carlo.
+#              Guarda una base en JSON y termina con error si alguna medición
+#              cae por debajo de la base más que el umbral indicado, o si no
+#              hay una base comparable (otra escala) para controlar.
+# ====================================================================
+
+import argparse  # Importa argparse para leer los parámetros de línea de comandos
+import json  # Lectura y escritura de la base de mediciones
+import os  # Importa el módulo os para interactuar con el sistema operativo
+import platform  # Datos del equipo para la base
+import sys  # Código de salida cuando hay regresiones
+import time  # Importa time para medir la duración de cada prueba
+
+import numpy as np  # Importa numpy para operaciones con arreglos y números
+
+import black_scholes  # Valuación y griegas
+from estrategias import compra_call, iron_condor  # Estrategias de las pruebas de payoff
+from montecarlo import simular_resultado  # Simulación Monte Carlo
+from volatilidad_implicita import volatilidad_implicita  # Inversión de Black-Scholes
+
+RUTA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks_base.json")
+UMBRAL = 0.20  # Caída máxima de rendimiento tolerada respecto de la base (20%)
+REPETICIONES = 5
+
+# Códigos de salida
+SALIDA_REGRESION = 1  # Alguna prueba cayó por debajo de la base más que el umbral
+SALIDA_SIN_BASE = 2  # No hay base, o se tomó con otra escala: no se pudo controlar
+
+
+def _payoff_bucle(n):
+    """Payoff de una compra de CALL con el bucle original de los scripts (un precio por vuelta)."""
+    precio_strike, prima, cant_contratos = 3910, 158, 1
+    precios = np.linspace(3000, 5000, n)
+
+    def correr():
+        datos = []
+        for precio_sub in precios:
+            resultado = max(0, precio_sub - precio_strike) - prima
+            datos.append([precio_sub, resultado * cant_contratos])
+        return datos
+    return correr
+
+
+def _payoff_vectorizado(n):
+    """Payoff de un iron cóndor (4 patas) con Estrategia.payoff."""
+    estrategia = iron_condor((3500, 3700, 4100, 4300), (20, 60, 70, 25))
+    precios = np.linspace(3000, 5000, n)
+    return lambda: estrategia.payoff(precios)
+
+
+def _griegas_cadena(n):
+    """Prima y griegas de una cadena de 200 strikes sobre n / 200 precios del subyacente."""
+    strikes = np.linspace(3000, 5000, 200)[None, :]
+    spots = np.linspace(3000, 5000, n // 200)[:, None]
+    tipos = np.where(np.arange(200) % 2 == 0, "call", "put")[None, :]
+    return lambda: black_scholes.griegas(tipos, spots, strikes, 0.30, 30 / 365, 0.05)
+
+
+def _volatilidad_implicita(n):
+    """Volatilidad implícita de n opciones con volatilidades, strikes y plazos variados."""
+    generador = np.random.default_rng(0)
+    tipos = generador.choice(["call", "put"], n)
+    strikes = generador.uniform(3000, 5000, n)
+    tiempos = generador.uniform(7, 365, n) / 365
+    primas = black_scholes.precio(tipos, 3900, strikes, generador.uniform(0.1, 0.8, n), tiempos, 0.05)
+    return lambda: volatilidad_implicita(tipos, primas, 3900, strikes, tiempos, 0.05)
+
+
+def _montecarlo(n):
+    """n trayectorias de un iron cóndor en un solo proceso (el rendimiento por núcleo)."""
+    estrategia = iron_condor((3500, 3700, 4100, 4300), (20, 60, 70, 25))
+    return lambda: simular_resultado(estrategia, 3900, 0.30, 30 / 365, n, semilla=42, procesos=1)
+
+
+# Nombre -> (armado de la prueba, cantidad de elementos por corrida, unidad)
+PRUEBAS = {
+    "payoff_bucle": (_payoff_bucle, 100_000, "precios"),
+    "payoff_vectorizado": (_payoff_vectorizado, 1_000_000, "precios"),
+    "griegas_cadena": (_griegas_cadena, 1_000_000, "opciones"),
+    "volatilidad_implicita": (_volatilidad_implicita, 20_000, "opciones"),
+    "montecarlo": (_montecarlo, 2_000_000, "trayectorias"),
+}
+
+
+def medir(nombre, repeticiones=REPETICIONES, escala=1.0):
+    """Mejor tiempo de varias corridas (después de una de calentamiento) y elementos por segundo."""
+    armar, elementos, unidad = PRUEBAS[nombre]
+    elementos = max(int(elementos * escala), 200)
+    correr = armar(elementos)
+    correr()  # Calentamiento: cachés, importaciones diferidas y memoria ya reservada
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        correr()
+        tiempos.append(time.perf_counter() - inicio)
+    mejor = min(tiempos)  # El mínimo es la medición menos afectada por otros procesos
+    return {"elementos": elementos, "unidad": unidad, "segundos": mejor, "por_segundo": elementos / mejor}
+
+
+def entorno():
+    """Datos del equipo y las versiones con las que se tomó la medición."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sistema": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "nucleos": os.cpu_count(),
+    }
+
+
+def comparar(resultados, base, umbral=UMBRAL):
+    """Compara con la base. Devuelve (comparacion, sin_base): (nombre, cambio relativo, regresión) de cada prueba
+    presente en las dos, y los nombres de las pruebas medidas que no están en la base (nuevas o renombradas)."""
+    comparacion = []
+    sin_base = []
+    for nombre, actual in resultados.items():
+        if nombre not in base:
+            sin_base.append(nombre)
+            continue
+        cambio = actual["por_segundo"] / base[nombre]["por_segundo"] - 1
+        comparacion.append((nombre, cambio, cambio < -umbral))
+    return comparacion, sin_base
+
+
+def parsear_argumentos():
+    parser = argparse.ArgumentParser(description="Mediciones de rendimiento del análisis de opciones, comparadas con una base.")
+    parser.add_argument("--base", default=RUTA_BASE, help="Archivo JSON de la base (por defecto benchmarks_base.json junto al script)")
+    parser.add_argument("--guardar-base", action="store_true", help="Guarda las mediciones como nueva base")
+    parser.add_argument("--umbral", type=float, default=UMBRAL,
+                        help=f"Caída máxima tolerada respecto de la base (0.2 = 20%%); si se supera termina con código {SALIDA_REGRESION}")
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES, help=f"Corridas por prueba (por defecto {REPETICIONES})")
+    parser.add_argument("--escala", type=float, default=1.0, help="Multiplica el tamaño de las pruebas (0.1 para una corrida rápida)")
+    parser.add_argument("--pruebas", nargs="+", choices=list(PRUEBAS), default=list(PRUEBAS), help="Pruebas a correr (por defecto todas)")
+    parser.add_argument("--json", help="Guarda también las mediciones de esta corrida en este archivo")
+    parser.add_argument("--sin-comparar", action="store_true", help="Solo mide, sin comparar con la base")
+    return parser.parse_args()
+
+
+def main():
+    args = parsear_argumentos()
+    resultados = {}
+    for nombre in args.pruebas:
+        resultados[nombre] = medir(nombre, args.repeticiones, args.escala)
+        r = resultados[nombre]
+        print(f"{nombre:<23}{r['por_segundo']:>16,.0f} {r['unidad']}/s   ({r['elementos']:,} en {r['segundos'] * 1000:,.2f} ms)")
+    if "payoff_bucle" in resultados and "payoff_vectorizado" in resultados:
+        aceleracion = resultados["payoff_vectorizado"]["por_segundo"] / resultados["payoff_bucle"]["por_segundo"]
+        print(f"\nPayoff vectorizado: {aceleracion:,.0f} veces más precios por segundo que el bucle original")
+
+    medicion = {"entorno": entorno(), "fecha": time.strftime("%Y-%m-%d %H:%M:%S"), "escala": args.escala,
+                "resultados": resultados}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as archivo:
+            json.dump(medicion, archivo, indent=2, ensure_ascii=False)
+
+    if args.guardar_base:
+        with open(args.base, "w", encoding="utf-8") as archivo:
+            json.dump(medicion, archivo, indent=2, ensure_ascii=False)
+        print(f"\n✅ Base guardada en: {args.base}")
+        return
+
+    if args.sin_comparar:
+        return
+    if not os.path.exists(args.base):
+        print(f"\n❌ No hay base en {args.base}: no se controlaron regresiones. Correr con --guardar-base para crearla "
+              f"en este equipo (o con --sin-comparar para solo medir).")
+        sys.exit(SALIDA_SIN_BASE)
+    with open(args.base, encoding="utf-8") as archivo:
+        base = json.load(archivo)
+    if base.get("escala") != args.escala:  # Con otro tamaño de prueba los elementos por segundo no son comparables
+        print(f"\n❌ La base se tomó con --escala {base.get('escala', '(sin registrar)')} y esta corrida con --escala "
+              f"{args.escala}: no se comparan. Correr con la misma escala o guardar una base nueva.")
+        sys.exit(SALIDA_SIN_BASE)
+    if base.get("entorno") != medicion["entorno"]:
+        print("\n⚠️ La base se tomó en otro equipo o con otras versiones: la comparación puede no ser representativa.")
+
+    comparacion, sin_base = comparar(resultados, base["resultados"], args.umbral)
+    print(f"\nComparación con la base del {base.get('fecha', '?')} (umbral {args.umbral:.0%}):")
+    for nombre, cambio, regresion in comparacion:
+        print(f"   {nombre:<23}{cambio:>+8.1%}  {'❌ regresión' if regresion else '✅'}")
+    for nombre in sin_base:
+        print(f"   {nombre:<23}{'—':>8}  ❌ sin base")
+    regresiones = [nombre for nombre, _, regresion in comparacion if regresion]
+    if regresiones:
+        print(f"\n❌ {len(regresiones)} prueba(s) por debajo de la base: {', '.join(regresiones)}")
+        sys.exit(SALIDA_REGRESION)
+    if sin_base:  # Una prueba nueva o renombrada nunca quedaría controlada
+        print(f"\n❌ {len(sin_base)} prueba(s) sin medición en la base: {', '.join(sin_base)}. Guardar una base nueva "
+              f"con --guardar-base para controlarlas.")
+        sys.exit(SALIDA_SIN_BASE)
+
+
+if __name__ == "__main__":
+    main()
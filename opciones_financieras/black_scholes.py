@@ -0,0 +1,105 @@
+# ====================================================================
+# Autor: Emiliano Carracedo
+# Título: Analista de Sistemas
+# Ubicación: Córdoba, Argentina
+# Contacto: ecarracedo@gmail.com
+# Descripción: Valuación de opciones europeas con Black-Scholes y cálculo de
+#              las griegas (Delta, Gamma, Theta, Vega y Rho). Todas las funciones
+#              aceptan arreglos de NumPy, así que una cadena completa de strikes o
+#              una superficie precio x tiempo se valúa en una sola llamada.
+# ====================================================================
+
+import numpy as np  # Importa numpy para operaciones con arreglos y números
+from scipy.special import ndtr  # Función de distribución normal estándar acumulada (vectorizada)
+
+RAIZ_2PI = np.sqrt(2 * np.pi)
+
+
+def densidad_normal(x):
+    """Densidad de la normal estándar."""
+    return np.exp(-0.5 * x * x) / RAIZ_2PI
+
+
+def es_call(tipo):
+    """Convierte "call"/"put" (o un arreglo de ellos) en un arreglo booleano: True para los CALL."""
+    tipo = np.asarray(tipo)
+    invalidos = ~np.isin(tipo, ("call", "put"))
+    if invalidos.any():
+        raise ValueError(f"Tipo de opción inválido: {tipo[invalidos].ravel()[0]!r} (debe ser 'call' o 'put')")
+    return tipo == "call"
+
+
+def _d1_d2(spot, strike, volatilidad, tiempo, tasa, dividendo):
+    """Devuelve d1, d2, los factores de descuento y la máscara de opciones con volatilidad y plazo positivos.
+
+    Con plazo o volatilidad cero, d1 y d2 valen ±inf según la opción esté dentro o fuera del dinero,
+    así las fórmulas devuelven el valor intrínseco sin casos especiales.
+    """
+    spot, strike, volatilidad, tiempo, tasa, dividendo = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (spot, strike, volatilidad, tiempo, tasa, dividendo))
+    )
+    tiempo = np.maximum(tiempo, 0.0)
+    descuento_tasa = np.exp(-tasa * tiempo)
+    descuento_dividendo = np.exp(-dividendo * tiempo)
+    raiz_t = np.sqrt(tiempo)
+    desvio = volatilidad * raiz_t
+    valido = desvio > 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(spot / strike) + (tasa - dividendo + 0.5 * volatilidad ** 2) * tiempo) / desvio
+    dentro = spot * descuento_dividendo > strike * descuento_tasa  # Opción CALL dentro del dinero (en valor presente)
+    d1 = np.where(valido, d1, np.where(dentro, np.inf, -np.inf))
+    d2 = np.where(valido, d1 - desvio, d1)
+    return d1, d2, descuento_tasa, descuento_dividendo, raiz_t, valido
+
+
+def precio(tipo, spot, strike, volatilidad, tiempo, tasa=0.0, dividendo=0.0):
+    """Prima teórica de opciones europeas.
+
+    tiempo en años, volatilidad, tasa y dividendo anuales (0.30 = 30%). Los argumentos se combinan con las
+    reglas de broadcasting de NumPy: por ejemplo spot[:, None] y tiempo[None, :] devuelven una superficie.
+    """
+    call = es_call(tipo)
+    spot, strike = np.asarray(spot, dtype=float), np.asarray(strike, dtype=float)
+    d1, d2, descuento_tasa, descuento_dividendo, _, _ = _d1_d2(spot, strike, volatilidad, tiempo, tasa, dividendo)
+    valor_call = spot * descuento_dividendo * ndtr(d1) - strike * descuento_tasa * ndtr(d2)
+    valor_put = strike * descuento_tasa * ndtr(-d2) - spot * descuento_dividendo * ndtr(-d1)
+    return np.where(call, valor_call, valor_put)
+
+
+def griegas(tipo, spot, strike, volatilidad, tiempo, tasa=0.0, dividendo=0.0):
+    """Prima teórica y griegas de opciones europeas (mismos argumentos que precio).
+
+    Devuelve un diccionario de arreglos con "precio", "delta", "gamma", "theta" (por año; dividir por 365 para
+    obtener el cambio por día), "vega" (por 1.00 de volatilidad) y "rho" (por 1.00 de tasa).
+    """
+    call = es_call(tipo)
+    spot, strike = np.asarray(spot, dtype=float), np.asarray(strike, dtype=float)
+    volatilidad = np.asarray(volatilidad, dtype=float)
+    tasa, dividendo = np.asarray(tasa, dtype=float), np.asarray(dividendo, dtype=float)
+    d1, d2, descuento_tasa, descuento_dividendo, raiz_t, valido = _d1_d2(spot, strike, volatilidad, tiempo, tasa, dividendo)
+    tiempo = raiz_t ** 2
+
+    nd1, nd2 = ndtr(d1), ndtr(d2)
+    n_menos_d1, n_menos_d2 = ndtr(-d1), ndtr(-d2)  # Más precisos que 1 - nd1 y 1 - nd2 lejos del dinero
+    densidad = densidad_normal(d1)
+    spot_descontado = spot * descuento_dividendo
+    strike_descontado = strike * descuento_tasa
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = np.where(valido, descuento_dividendo * densidad / (spot * volatilidad * raiz_t), 0.0)
+        decaimiento = np.where(valido, -spot_descontado * densidad * volatilidad / (2 * raiz_t), 0.0)
+    vega = spot_descontado * densidad * raiz_t
+
+    theta_call = decaimiento - tasa * strike_descontado * nd2 + dividendo * spot_descontado * nd1
+    theta_put = decaimiento + tasa * strike_descontado * n_menos_d2 - dividendo * spot_descontado * n_menos_d1
+
+    return {
+        "precio": np.where(call, spot_descontado * nd1 - strike_descontado * nd2,
+                           strike_descontado * n_menos_d2 - spot_descontado * n_menos_d1),
+        "delta": np.where(call, descuento_dividendo * nd1, -descuento_dividendo * n_menos_d1),
+        "gamma": gamma,
+        "theta": np.where(call, theta_call, theta_put),
+        "vega": vega,
+        "rho": np.where(call, strike * tiempo * descuento_tasa * nd2, -strike * tiempo * descuento_tasa * n_menos_d2),
+    }
@@ -0,0 +1,263 @@
+# ====================================================================
+# Autor: Emiliano Carracedo
+# Título: Analista de Sistemas
+# Ubicación: Córdoba, Argentina
+# Contacto: ecarracedo@gmail.com
+# Descripción: Cartera de posiciones de opciones sobre uno o varios
+#              subyacentes. Suma (neta) el resultado al vencimiento, el
+#              resultado antes del vencimiento y las griegas de todas las
+#              posiciones de cada subyacente sobre una grilla de precios común,
+#              y actualiza los totales al agregar o quitar una sola posición sin
+#              recalcular la cartera completa.
+# ====================================================================
+
+import argparse  # Importa argparse para leer los parámetros de línea de comandos
+import os  # Importa el módulo os para interactuar con el sistema operativo
+import time  # Importa time para medir la duración del cálculo
+from dataclasses import dataclass, field  # Clases de datos para los subyacentes y las posiciones
+
+import numpy as np  # Importa numpy para operaciones con arreglos y números
+
+import black_scholes  # Valuación y griegas de cada pata
+from estrategias import Estrategia, Pata  # Patas y estrategias de cada posición
+
+MEDIDAS = ("resultado", "resultado_hoy", "delta", "gamma", "theta", "vega", "rho")
+PUNTOS_POR_DEFECTO = 400  # Precios de la grilla de cada subyacente (desde la línea de comandos)
+MARGEN_POR_DEFECTO = 0.2  # La grilla va de (1 - margen) * menor strike a (1 + margen) * mayor strike
+PATAS_POR_BLOQUE = 2000  # Patas que se valúan juntas (acota la memoria de los arreglos patas x precios)
+
+
+@dataclass
+class Subyacente:
+    """Grilla de precios y parámetros de valuación de un subyacente, con los totales netos de sus posiciones."""
+    precios: np.ndarray
+    volatilidad: float
+    dias: float = 0.0
+    tasa: float = 0.0
+    totales: dict = field(default_factory=dict)
+    posiciones: int = 0
+
+    def __post_init__(self):
+        self.precios = np.asarray(self.precios, dtype=float)
+        if not self.totales:
+            self.totales = {medida: np.zeros_like(self.precios) for medida in MEDIDAS}
+
+
+@dataclass(frozen=True)
+class Posicion:
+    """Una estrategia sobre un subyacente. dias=None usa los días al vencimiento del subyacente."""
+    subyacente: str
+    estrategia: Estrategia
+    dias: float = None
+
+
+class Cartera:
+    """Posiciones de opciones agrupadas por subyacente, con resultado y griegas netos en una grilla común.
+
+    Agregar o quitar una posición calcula solo esa posición (una llamada vectorizada sobre la grilla) y la
+    suma o resta de los totales, así que el costo no depende del tamaño de la cartera. agregar_varias y
+    recalcular valúan todas las patas de un subyacente juntas. Las sumas y restas
+    sucesivas acumulan errores de redondeo muy chicos; recalcular() rehace los totales desde cero.
+    """
+
+    def __init__(self):
+        self.subyacentes = {}
+        self.posiciones = {}
+
+    def agregar_subyacente(self, nombre, precios, volatilidad, dias=0.0, tasa=0.0):
+        """Define la grilla común y los parámetros de valuación de un subyacente (dias: al vencimiento)."""
+        if nombre in self.subyacentes and self.subyacentes[nombre].posiciones:
+            raise ValueError(f"El subyacente {nombre!r} ya tiene posiciones: quitarlas antes de cambiar su grilla")
+        self.subyacentes[nombre] = Subyacente(precios, volatilidad, dias, tasa)
+
+    def agregar(self, id_posicion, subyacente, estrategia, dias=None):
+        """Agrega una posición (o la reemplaza si ya hay una con el mismo id) y actualiza los totales."""
+        self.agregar_varias({id_posicion: Posicion(subyacente, estrategia, dias)})
+
+    def agregar_varias(self, posiciones):
+        """Agrega muchas posiciones (diccionario id -> Posicion) calculando juntas todas las patas de cada subyacente."""
+        desconocidos = {p.subyacente for p in posiciones.values()} - set(self.subyacentes)
+        if desconocidos:
+            raise ValueError(f"Subyacente desconocido: {sorted(desconocidos)[0]!r} (definirlo antes con agregar_subyacente)")
+        for id_posicion in posiciones.keys() & self.posiciones.keys():
+            self.quitar(id_posicion)
+        for subyacente, grupo in self._por_subyacente(posiciones.values()).items():
+            self._sumar(subyacente, grupo, 1.0)
+        self.posiciones.update(posiciones)
+
+    def quitar(self, id_posicion):
+        """Quita una posición y resta su aporte de los totales."""
+        posicion = self.posiciones.pop(id_posicion)
+        self._sumar(posicion.subyacente, [posicion], -1.0)
+
+    def recalcular(self):
+        """Rehace los totales de todos los subyacentes a partir de las posiciones."""
+        for datos in self.subyacentes.values():
+            for total in datos.totales.values():
+                total.fill(0.0)
+            datos.posiciones = 0
+        for subyacente, grupo in self._por_subyacente(self.posiciones.values()).items():
+            self._sumar(subyacente, grupo, 1.0)
+
+    @staticmethod
+    def _por_subyacente(posiciones):
+        grupos = {}
+        for posicion in posiciones:
+            grupos.setdefault(posicion.subyacente, []).append(posicion)
+        return grupos
+
+    def _aporte(self, subyacente, posiciones):
+        """Suma del resultado y las griegas de posiciones del mismo subyacente en su grilla.
+
+        Las patas del mismo contrato (tipo, strike, volatilidad y días) se netean antes de valuar, así cada contrato
+        se valúa una sola vez aunque aparezca en muchas posiciones. Los contratos se valúan juntos con arreglos
+        contratos x precios (en bloques de PATAS_POR_BLOQUE) y se suman ponderados por sus contratos netos con un
+        producto de matrices.
+        """
+        datos = self.subyacentes[subyacente]
+        netos = {}  # (tipo, strike, volatilidad, días) -> contratos con signo
+        primas = 0.0  # Primas pagadas y recibidas
+        for posicion in posiciones:
+            dias = datos.dias if posicion.dias is None else posicion.dias
+            for pata in posicion.estrategia.patas:
+                sigma = datos.volatilidad if pata.volatilidad is None else pata.volatilidad
+                clave = (pata.tipo, pata.strike, sigma, dias)
+                netos[clave] = netos.get(clave, 0.0) + pata.factor
+                primas += pata.factor * pata.prima
+
+        s = datos.precios[None, :]
+        aporte = {medida: np.zeros_like(datos.precios) for medida in MEDIDAS}
+        aporte["resultado"] -= primas
+        aporte["resultado_hoy"] -= primas
+        contratos = list(netos.items())
+        for inicio in range(0, len(contratos), PATAS_POR_BLOQUE):
+            bloque = contratos[inicio:inicio + PATAS_POR_BLOQUE]
+            tipo, strike, sigma, dias = (np.array(columna)[:, None] for columna in zip(*(clave for clave, _ in bloque)))
+            factor = np.array([neto for _, neto in bloque], dtype=float)
+
+            griegas = black_scholes.griegas(tipo, s, strike, sigma, dias / 365, datos.tasa)
+            for medida in MEDIDAS[2:]:
+                aporte[medida] += factor @ griegas[medida]
+            aporte["resultado_hoy"] += factor @ griegas["precio"]
+            intrinseco = np.maximum(np.where(tipo == "call", s - strike, strike - s), 0)
+            aporte["resultado"] += factor @ intrinseco
+        return aporte
+
+    def _sumar(self, subyacente, posiciones, signo):
+        """Suma (signo 1) o resta (signo -1) el aporte de las posiciones a los totales del subyacente."""
+        datos = self.subyacentes[subyacente]
+        for medida, valores in self._aporte(subyacente, posiciones).items():
+            if signo > 0:
+                datos.totales[medida] += valores
+            else:
+                datos.totales[medida] -= valores
+        datos.posiciones += int(signo) * len(posiciones)
+
+    def totales(self, subyacente):
+        """Totales netos del subyacente en su grilla: 'precio_sub' y cada medida de MEDIDAS (arreglos)."""
+        datos = self.subyacentes[subyacente]
+        return {"precio_sub": datos.precios, **datos.totales}
+
+    def en_precio(self, subyacente, precio):
+        """Totales netos del subyacente en un precio (interpolados linealmente entre los puntos de la grilla)."""
+        datos = self.subyacentes[subyacente]
+        return {medida: float(np.interp(precio, datos.precios, valores)) for medida, valores in datos.totales.items()}
+
+    def tabla(self):
+        """Tabla larga (subyacente, precio_sub y medidas) de todos los subyacentes, como DataFrame de pandas."""
+        import pandas as pd  # Importa pandas solo si se pide la tabla
+
+        tablas = [pd.DataFrame({"subyacente": nombre, **self.totales(nombre)}) for nombre in self.subyacentes]
+        return pd.concat(tablas, ignore_index=True) if tablas else pd.DataFrame(columns=["subyacente", "precio_sub", *MEDIDAS])
+
+
+def grilla_subyacente(strikes, puntos=PUNTOS_POR_DEFECTO, margen=MARGEN_POR_DEFECTO):
+    """Grilla regular alrededor de los strikes que incluye además cada strike (donde se quiebra el payoff neto)."""
+    strikes = np.unique(strikes)
+    regulares = np.linspace(strikes[0] * (1 - margen), strikes[-1] * (1 + margen), puntos)
+    return np.unique(np.concatenate((regulares, strikes)))
+
+
+def cargar_cartera(posiciones, volatilidad, dias=0.0, tasa=0.0, puntos=PUNTOS_POR_DEFECTO, margen=MARGEN_POR_DEFECTO):
+    """Arma una cartera desde una tabla de patas con el formato de escenarios.py más la columna subyacente.
+
+    Cada id_estrategia es una posición. La grilla de cada subyacente cubre los strikes de todas sus posiciones.
+    """
+    cartera = Cartera()
+    for nombre, grupo in posiciones.groupby("subyacente", sort=True):
+        cartera.agregar_subyacente(nombre, grilla_subyacente(grupo["strike"].to_numpy(dtype=float), puntos, margen),
+                                   volatilidad, dias, tasa)
+    patas = {}  # (subyacente, id_estrategia) -> patas (se arman desde listas: más rápido que recorrer grupos de pandas)
+    columnas = ["subyacente", "id_estrategia", "tipo", "posicion", "strike", "prima", "contratos", "volatilidad"]
+    for nombre, id_posicion, tipo, posicion, strike, prima, contratos, sigma in zip(*(posiciones[c].tolist() for c in columnas)):
+        pata = Pata(tipo, posicion, strike, prima, contratos, None if np.isnan(sigma) else sigma)
+        patas.setdefault((nombre, id_posicion), []).append(pata)
+    nuevas = {id_posicion: Posicion(nombre, Estrategia(lista, str(id_posicion))) for (nombre, id_posicion), lista in patas.items()}
+    cartera.agregar_varias(nuevas)
+    return cartera
+
+
+def parsear_argumentos():
+    parser = argparse.ArgumentParser(description="Resultado y griegas netos de una cartera de posiciones de opciones.")
+    parser.add_argument("posiciones",
+                        help="CSV o Parquet con el formato de escenarios.py (id_estrategia, tipo, posicion, strike, prima, "
+                             "contratos, volatilidad) y la columna subyacente")
+    parser.add_argument("--volatilidad", type=float, default=0.30, help="Volatilidad anual para las patas sin volatilidad propia")
+    parser.add_argument("--dias", type=float, default=0.0, help="Días al vencimiento")
+    parser.add_argument("--tasa", type=float, default=0.0, help="Tasa libre de riesgo anual")
+    parser.add_argument("--puntos", type=int, default=PUNTOS_POR_DEFECTO,
+                        help=f"Precios de la grilla de cada subyacente (por defecto {PUNTOS_POR_DEFECTO})")
+    parser.add_argument("--margen", type=float, default=MARGEN_POR_DEFECTO,
+                        help="Margen de la grilla alrededor de los strikes (0.2 = 20%%)")
+    parser.add_argument("--spot", nargs=2, action="append", metavar=("SUBYACENTE", "PRECIO"), default=[],
+                        help="Muestra los totales netos del subyacente en ese precio (se puede repetir)")
+    parser.add_argument("--formato", choices=["parquet", "csv"], default="csv", help="Formato de la salida (por defecto csv)")
+    parser.add_argument("--salida", help="Carpeta de salida (por defecto, resultados/ junto al archivo de posiciones)")
+    args = parser.parse_args()
+    for subyacente, precio in args.spot:
+        try:
+            float(precio)
+        except ValueError:
+            parser.error(f"--spot {subyacente}: el precio debe ser un número (se indicó {precio!r})")
+    return parser, args
+
+
+def main():
+    from escenarios import guardar, leer_posiciones  # Lectura y validación de las patas, y guardado en Parquet o CSV
+
+    parser, args = parsear_argumentos()
+    posiciones = leer_posiciones(args.posiciones)
+    if "subyacente" not in posiciones:
+        raise SystemExit(f"Falta la columna subyacente en {args.posiciones}")
+    nombres = {str(nombre): nombre for nombre in posiciones["subyacente"].unique()}  # --spot siempre llega como texto
+    for subyacente, _ in args.spot:
+        if subyacente not in nombres:
+            parser.error(f"--spot: subyacente desconocido {subyacente!r} (la cartera tiene: {', '.join(sorted(nombres))})")
+
+    inicio = time.perf_counter()
+    cartera = cargar_cartera(posiciones, args.volatilidad, args.dias, args.tasa, args.puntos, args.margen)
+    print(f"📊 {len(cartera.posiciones)} posiciones en {len(cartera.subyacentes)} subyacentes, "
+          f"cargadas en {time.perf_counter() - inicio:.3f} s")
+
+    # Tiempo de actualización al cambiar una sola posición (se quita y se vuelve a agregar la última)
+    id_posicion, posicion = next(reversed(cartera.posiciones.items()))
+    inicio = time.perf_counter()
+    cartera.quitar(id_posicion)
+    cartera.agregar(id_posicion, posicion.subyacente, posicion.estrategia, posicion.dias)
+    print(f"   Actualización de una posición: {(time.perf_counter() - inicio) * 1000:.2f} ms")
+
+    for subyacente, precio in args.spot:
+        print(f"\n{subyacente} a {float(precio):,.2f}")
+        for medida, valor in cartera.en_precio(nombres[subyacente], float(precio)).items():
+            print(f"   {medida + ':':<15}{valor:,.4f}")
+
+    carpeta_resultados = args.salida or os.path.join(os.path.dirname(os.path.abspath(args.posiciones)), "resultados")
+    os.makedirs(carpeta_resultados, exist_ok=True)
+    nombre = os.path.splitext(os.path.basename(args.posiciones))[0]
+    ruta_archivo = os.path.join(carpeta_resultados, f"{nombre}_cartera.{args.formato}")
+    guardar(cartera.tabla(), ruta_archivo)
+    print(f"\n✅ Los totales netos de la cartera se guardaron en: {ruta_archivo}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# ====================================================================
+# Autor: Emiliano Carracedo
+# Título: Analista de Sistemas
+# Ubicación: Córdoba, Argentina
+# Contacto: ecarracedo@gmail.com
+# Descripción: Análisis en lote de una cartera de estrategias de opciones.
+#              Lee un CSV o Parquet con las patas de cientos de estrategias,
+#              calcula todas las tablas de ganancias y pérdidas en una sola
+#              operación de NumPy y guarda una salida consolidada (Parquet o
+#              CSV) más un resumen opcional por estrategia.
+# ====================================================================
+
+import argparse  # Importa argparse para leer los parámetros de línea de comandos
+import os  # Importa el módulo os para interactuar con el sistema operativo
+import time  # Importa time para medir la duración del cálculo
+
+import numpy as np  # Importa numpy para operaciones con arreglos y números
+import pandas as pd  # Importa pandas para leer las posiciones y exportar los resultados
+
+import black_scholes  # Valuación antes del vencimiento
+from estrategias import Estrategia, Pata  # Motor de estrategias (puntos de equilibrio y extremos exactos)
+
+COLUMNAS_OBLIGATORIAS = ["id_estrategia", "tipo", "posicion", "strike", "prima"]
+PUNTOS_POR_DEFECTO = 200  # Precios de la grilla de cada estrategia
+MARGEN_POR_DEFECTO = 0.2  # La grilla va de (1 - margen) * menor strike a (1 + margen) * mayor strike
+ESTRATEGIAS_POR_BLOQUE = 2000  # Estrategias que se calculan juntas (acota la memoria de los arreglos 3D)
+
+
+def leer_posiciones(ruta):
+    """Lee las patas desde CSV o Parquet y valida las columnas."""
+    posiciones = pd.read_parquet(ruta) if ruta.endswith(".parquet") else pd.read_csv(ruta)
+    faltantes = [c for c in COLUMNAS_OBLIGATORIAS if c not in posiciones]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en {ruta}: {', '.join(faltantes)}")
+    posiciones = posiciones.copy()
+    if "contratos" not in posiciones:
+        posiciones["contratos"] = 1
+    if "volatilidad" not in posiciones:
+        posiciones["volatilidad"] = np.nan
+    posiciones["tipo"] = posiciones["tipo"].str.strip().str.lower()
+    posiciones["posicion"] = posiciones["posicion"].str.strip().str.lower()
+    black_scholes.es_call(posiciones["tipo"].to_numpy())  # Valida los tipos (ValueError si hay alguno inválido)
+    invalidas = ~posiciones["posicion"].isin(["compra", "venta"])
+    if invalidas.any():
+        raise ValueError(f"Posición inválida: {posiciones.loc[invalidas, 'posicion'].iloc[0]!r} (debe ser 'compra' o 'venta')")
+    return posiciones
+
+
+def matrices_patas(posiciones):
+    """Convierte las patas en matrices (estrategias x patas), completando con patas de 0 contratos.
+
+    Devuelve los ids en orden y un diccionario de matrices: strike, prima, factor (contratos con signo),
+    call (bool) y volatilidad (NaN si la pata no tiene una propia).
+    """
+    ids, fila = np.unique(posiciones["id_estrategia"].to_numpy(), return_inverse=True)
+    columna = posiciones.groupby(fila).cumcount().to_numpy()  # Número de pata dentro de su estrategia
+    forma = (len(ids), columna.max() + 1)
+
+    def matriz(valores, relleno, dtype=float):
+        m = np.full(forma, relleno, dtype=dtype)
+        m[fila, columna] = valores
+        return m
+
+    signo = np.where(posiciones["posicion"].to_numpy() == "compra", 1.0, -1.0)
+    return ids, {
+        "strike": matriz(posiciones["strike"].to_numpy(dtype=float), 0.0),
+        "prima": matriz(posiciones["prima"].to_numpy(dtype=float), 0.0),
+        "factor": matriz(signo * posiciones["contratos"].to_numpy(dtype=float), 0.0),
+        "call": matriz(posiciones["tipo"].to_numpy() == "call", True, bool),
+        "volatilidad": matriz(posiciones["volatilidad"].to_numpy(dtype=float), np.nan),
+    }
+
+
+def grillas_precios(patas, puntos, margen):
+    """Grilla de precios de cada estrategia (estrategias x puntos), alrededor de sus strikes."""
+    con_contratos = patas["factor"] != 0
+    bajo = np.where(con_contratos, patas["strike"], np.inf).min(axis=1) * (1 - margen)
+    alto = np.where(con_contratos, patas["strike"], -np.inf).max(axis=1) * (1 + margen)
+    return bajo[:, None] + (alto - bajo)[:, None] * np.linspace(0, 1, puntos)[None, :]
+
+
+def calcular_resultados(patas, precios, volatilidad=None, tiempo=0.0, tasa=0.0):
+    """Resultado de cada estrategia en cada precio de su grilla, con arreglos estrategias x patas x precios.
+
+    Si se indica volatilidad y tiempo > 0 devuelve también el resultado antes del vencimiento (Black-Scholes).
+    """
+    strike = patas["strike"][:, :, None]
+    factor = patas["factor"][:, :, None]
+    call = patas["call"][:, :, None]
+    s = precios[:, None, :]
+    primas = (patas["factor"] * patas["prima"]).sum(axis=1)[:, None]
+
+    intrinseco = np.maximum(np.where(call, s - strike, strike - s), 0)
+    resultado = (factor * intrinseco).sum(axis=1) - primas
+
+    resultado_hoy = None
+    if volatilidad is not None and tiempo > 0:
+        sigma = np.where(np.isnan(patas["volatilidad"]), volatilidad, patas["volatilidad"])[:, :, None]
+        tipos = np.where(call, "call", "put")
+        valor = black_scholes.precio(tipos, s, strike, sigma, tiempo, tasa)
+        resultado_hoy = (factor * valor).sum(axis=1) - primas
+    return resultado, resultado_hoy
+
+
+def resumen_estrategias(posiciones):
+    """Pérdida y ganancia máximas y puntos de equilibrio exactos de cada estrategia."""
+    filas = []
+    for id_estrategia, grupo in posiciones.groupby("id_estrategia", sort=True):
+        estrategia = Estrategia([Pata(p.tipo, p.posicion, p.strike, p.prima, p.contratos)
+                                 for p in grupo.itertuples(index=False)])
+        perdida, ganancia = estrategia.resultado_extremo()
+        filas.append({
+            "id_estrategia": id_estrategia,
+            "patas": len(grupo),
+            "prima_neta": -sum(p.factor * p.prima for p in estrategia.patas),
+            "perdida_maxima": perdida,
+            "ganancia_maxima": ganancia,
+            "puntos_equilibrio": " / ".join(f"{x:g}" for x in estrategia.puntos_equilibrio()),
+        })
+    return pd.DataFrame(filas)
+
+
+def analizar(posiciones, puntos=PUNTOS_POR_DEFECTO, margen=MARGEN_POR_DEFECTO, volatilidad=None, dias=0.0, tasa=0.0,
+             estrategias_por_bloque=ESTRATEGIAS_POR_BLOQUE):
+    """Tabla larga (id_estrategia, precio_sub, resultado[, resultado_hoy]) de todas las estrategias."""
+    ids, patas = matrices_patas(posiciones)
+    tablas = []
+    for inicio in range(0, len(ids), estrategias_por_bloque):
+        bloque = slice(inicio, inicio + estrategias_por_bloque)
+        patas_bloque = {nombre: m[bloque] for nombre, m in patas.items()}
+        precios = grillas_precios(patas_bloque, puntos, margen)
+        resultado, resultado_hoy = calcular_resultados(patas_bloque, precios, volatilidad, dias / 365, tasa)
+        tabla = pd.DataFrame({
+            "id_estrategia": np.repeat(ids[bloque], puntos),
+            "precio_sub": precios.ravel(),
+            "resultado": resultado.ravel(),
+        })
+        if resultado_hoy is not None:
+            tabla["resultado_hoy"] = resultado_hoy.ravel()
+        tablas.append(tabla)
+    return pd.concat(tablas, ignore_index=True)
+
+
+def guardar(tabla, ruta):
+    """Guarda en Parquet o CSV según la extensión de la ruta."""
+    if ruta.endswith(".parquet"):
+        try:
+            tabla.to_parquet(ruta, index=False)
+        except ImportError:
+            raise SystemExit("Para guardar en Parquet hace falta pyarrow (pip install pyarrow); usá --formato csv.")
+    else:
+        tabla.to_csv(ruta, index=False)
+
+
+def parsear_argumentos():
+    parser = argparse.ArgumentParser(description="Tablas de ganancias y pérdidas de muchas estrategias de opciones en una sola corrida.")
+    parser.add_argument("posiciones",
+                        help="CSV o Parquet con las columnas id_estrategia, tipo, posicion, strike, prima y opcionalmente contratos y volatilidad")
+    parser.add_argument("--puntos", type=int, default=PUNTOS_POR_DEFECTO,
+                        help=f"Precios de la grilla de cada estrategia (por defecto {PUNTOS_POR_DEFECTO})")
+    parser.add_argument("--margen", type=float, default=MARGEN_POR_DEFECTO,
+                        help="Margen de la grilla alrededor de los strikes (0.2 = 20%% por debajo del menor y por encima del mayor)")
+    parser.add_argument("--dias", type=float, default=0.0, help="Días al vencimiento (con --volatilidad agrega resultado_hoy)")
+    parser.add_argument("--volatilidad", type=float, help="Volatilidad anual para las patas sin volatilidad propia")
+    parser.add_argument("--tasa", type=float, default=0.0, help="Tasa libre de riesgo anual")
+    parser.add_argument("--formato", choices=["parquet", "csv"], default="parquet", help="Formato de la salida (por defecto parquet)")
+    parser.add_argument("--salida", help="Carpeta de salida (por defecto, resultados/ junto al archivo de posiciones)")
+    parser.add_argument("--resumen", action="store_true", help="Guarda también un resumen por estrategia")
+    return parser.parse_args()
+
+
+def main():
+    args = parsear_argumentos()
+    posiciones = leer_posiciones(args.posiciones)
+
+    inicio = time.perf_counter()
+    tabla = analizar(posiciones, args.puntos, args.margen, args.volatilidad, args.dias, args.tasa)
+    cantidad = tabla["id_estrategia"].nunique()
+    print(f"📊 {cantidad} estrategias ({len(posiciones)} patas), {len(tabla):,} filas en {time.perf_counter() - inicio:.3f} s")
+
+    carpeta_resultados = args.salida or os.path.join(os.path.dirname(os.path.abspath(args.posiciones)), "resultados")
+    os.makedirs(carpeta_resultados, exist_ok=True)
+    nombre = os.path.splitext(os.path.basename(args.posiciones))[0]
+
+    ruta_archivo = os.path.join(carpeta_resultados, f"{nombre}_tabla_PL.{args.formato}")
+    guardar(tabla, ruta_archivo)
+    print(f"\n✅ Las tablas de ganancias y pérdidas se guardaron en: {ruta_archivo}")
+
+    if args.resumen:
+        ruta_resumen = os.path.join(carpeta_resultados, f"{nombre}_resumen.{args.formato}")
+        guardar(resumen_estrategias(posiciones), ruta_resumen)
+        print(f"✅ El resumen por estrategia se guardó en: {ruta_resumen}")
+
+
+if __name__ == "__main__":
+    main()
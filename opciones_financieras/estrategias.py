@@ -0,0 +1,227 @@
+# ====================================================================
+# Autor: Emiliano Carracedo
+# Título: Analista de Sistemas
+# Ubicación: Córdoba, Argentina
+# Contacto: ecarracedo@gmail.com
+# Descripción: Motor de estrategias de opciones con varias patas (calls y puts,
+#              compradas o vendidas). Calcula el payoff al vencimiento, y antes del
+#              vencimiento con Black-Scholes, sobre una grilla de precios de
+#              cualquier tamaño con operaciones de NumPy.
+# ====================================================================
+
+from dataclasses import dataclass, field  # Clases de datos para las patas y las estrategias
+
+import numpy as np  # Importa numpy para operaciones con arreglos y números
+
+TIPOS = ("call", "put")
+POSICIONES = ("compra", "venta")
+
+
+@dataclass(frozen=True)
+class Pata:
+    """Una opción de la estrategia: tipo (call/put), posición (compra/venta), strike, prima y contratos.
+
+    volatilidad es opcional: si se indica, se usa para valuar esta pata en lugar de la volatilidad de la estrategia.
+    """
+    tipo: str
+    posicion: str
+    strike: float
+    prima: float
+    contratos: int = 1
+    volatilidad: float = None
+
+    def __post_init__(self):
+        if self.tipo not in TIPOS:
+            raise ValueError(f"Tipo de opción inválido: {self.tipo!r} (debe ser 'call' o 'put')")
+        if self.posicion not in POSICIONES:
+            raise ValueError(f"Posición inválida: {self.posicion!r} (debe ser 'compra' o 'venta')")
+
+    @property
+    def factor(self):
+        """Contratos con signo: positivo si la opción se compra, negativo si se vende."""
+        return self.contratos if self.posicion == "compra" else -self.contratos
+
+
+@dataclass
+class Estrategia:
+    """Conjunto de patas que se evalúan juntas. El payoff es la suma del payoff de cada pata."""
+    patas: list = field(default_factory=list)
+    nombre: str = ""
+
+    def payoff(self, precios):
+        """Ganancia/pérdida al vencimiento para cada precio del subyacente (arreglo del mismo tamaño que precios).
+
+        Por pata: compra -> (valor intrínseco - prima) * contratos; venta -> (prima - valor intrínseco) * contratos.
+        """
+        precios = np.asarray(precios, dtype=float)
+        total = np.full_like(precios, -sum(pata.factor * pata.prima for pata in self.patas))  # Primas pagadas y recibidas
+        intrinseco = np.empty_like(precios)  # Se reutiliza para todas las patas (sin arreglos temporales por pata)
+        for pata in self.patas:
+            if pata.tipo == "call":
+                np.subtract(precios, pata.strike, out=intrinseco)  # precio - strike
+            else:
+                np.subtract(pata.strike, precios, out=intrinseco)  # strike - precio
+            np.maximum(intrinseco, 0, out=intrinseco)  # max(0, ...)
+            intrinseco *= pata.factor
+            total += intrinseco
+        return total
+
+    def resultado_teorico(self, precios, volatilidad, tiempo, tasa=0.0, dividendo=0.0):
+        """Ganancia/pérdida antes del vencimiento: valor teórico de Black-Scholes de cada pata menos su prima.
+
+        tiempo en años hasta el vencimiento (con tiempo=0 coincide con payoff). precios y tiempo pueden ser
+        arreglos combinables por broadcasting, por ejemplo precios[:, None] y tiempo[None, :].
+        """
+        import black_scholes  # Se importa al usarlo: scipy tarda en cargar y el payoff al vencimiento no lo necesita
+
+        total = -sum(pata.factor * pata.prima for pata in self.patas)
+        for pata in self.patas:
+            sigma = volatilidad if pata.volatilidad is None else pata.volatilidad
+            total = total + pata.factor * black_scholes.precio(pata.tipo, precios, pata.strike, sigma, tiempo, tasa, dividendo)
+        return np.asarray(total, dtype=float)
+
+    def griegas(self, precios, volatilidad, tiempo, tasa=0.0, dividendo=0.0):
+        """Griegas de la estrategia (suma de las griegas de cada pata por sus contratos con signo).
+
+        Mismos argumentos y unidades que black_scholes.griegas; "precio" es el valor teórico de la posición.
+        """
+        import black_scholes  # Se importa al usarlo (ver resultado_teorico)
+
+        total = {}
+        for pata in self.patas:
+            sigma = volatilidad if pata.volatilidad is None else pata.volatilidad
+            for nombre, valor in black_scholes.griegas(pata.tipo, precios, pata.strike, sigma, tiempo, tasa, dividendo).items():
+                total[nombre] = total.get(nombre, 0.0) + pata.factor * valor
+        return total
+
+    def quiebres(self):
+        """Strikes ordenados y sin repetir: los precios donde cambia la pendiente del payoff."""
+        return np.unique([pata.strike for pata in self.patas])
+
+    def pendientes_extremas(self):
+        """Pendiente del payoff por debajo del menor strike y por encima del mayor strike."""
+        izquierda = -sum(pata.factor for pata in self.patas if pata.tipo == "put")
+        derecha = sum(pata.factor for pata in self.patas if pata.tipo == "call")
+        return izquierda, derecha
+
+    def puntos_equilibrio(self):
+        """Precios donde el resultado es cero, calculados de forma exacta (el payoff es lineal entre strikes)."""
+        strikes = self.quiebres()
+        if len(strikes) == 0:
+            return np.array([])
+        valores = self.payoff(strikes)
+        izquierda, derecha = self.pendientes_extremas()
+        raices = []
+
+        if izquierda != 0:  # Tramo por debajo del menor strike (los precios no pueden ser negativos)
+            raiz = strikes[0] - valores[0] / izquierda
+            if 0 <= raiz < strikes[0]:
+                raices.append(raiz)
+        for i in range(len(strikes)):
+            if valores[i] == 0:
+                raices.append(strikes[i])
+            elif i + 1 < len(strikes) and valores[i] * valores[i + 1] < 0:  # Cambio de signo entre dos strikes
+                raices.append(strikes[i] - valores[i] * (strikes[i + 1] - strikes[i]) / (valores[i + 1] - valores[i]))
+        if derecha != 0:  # Tramo por encima del mayor strike
+            raiz = strikes[-1] - valores[-1] / derecha
+            if raiz > strikes[-1]:
+                raices.append(raiz)
+        return np.array(raices)
+
+    def resultado_extremo(self):
+        """(pérdida máxima, ganancia máxima) al vencimiento; ±inf si no está acotada."""
+        puntos = np.concatenate(([0.0], self.quiebres()))  # El mínimo y el máximo están en 0 o en un strike
+        valores = self.payoff(puntos)
+        _, derecha = self.pendientes_extremas()
+        minimo = -np.inf if derecha < 0 else float(valores.min())
+        maximo = np.inf if derecha > 0 else float(valores.max())
+        return minimo, maximo
+
+
+# Estrategias de una sola pata (las de los scripts compra_call.py, venta_call.py y compra_put.py)
+
+def compra_call(strike, prima, contratos=1):
+    return Estrategia([Pata("call", "compra", strike, prima, contratos)], "Compra de CALL")
+
+
+def venta_call(strike, prima, contratos=1):
+    return Estrategia([Pata("call", "venta", strike, prima, contratos)], "Venta de CALL")
+
+
+def compra_put(strike, prima, contratos=1):
+    return Estrategia([Pata("put", "compra", strike, prima, contratos)], "Compra de PUT")
+
+
+def venta_put(strike, prima, contratos=1):
+    return Estrategia([Pata("put", "venta", strike, prima, contratos)], "Venta de PUT")
+
+
+# Estrategias combinadas. strikes y primas se pasan de menor a mayor strike.
+
+def bull_spread(strikes, primas, contratos=1, tipo="call"):
+    """Spread alcista: compra el strike bajo y vende el alto."""
+    (strike_bajo, strike_alto), (prima_baja, prima_alta) = strikes, primas
+    return Estrategia([
+        Pata(tipo, "compra", strike_bajo, prima_baja, contratos),
+        Pata(tipo, "venta", strike_alto, prima_alta, contratos),
+    ], f"Bull spread con {tipo.upper()}")
+
+
+def bear_spread(strikes, primas, contratos=1, tipo="put"):
+    """Spread bajista: vende el strike bajo y compra el alto."""
+    (strike_bajo, strike_alto), (prima_baja, prima_alta) = strikes, primas
+    return Estrategia([
+        Pata(tipo, "venta", strike_bajo, prima_baja, contratos),
+        Pata(tipo, "compra", strike_alto, prima_alta, contratos),
+    ], f"Bear spread con {tipo.upper()}")
+
+
+def straddle(strike, prima_call, prima_put, contratos=1, posicion="compra"):
+    """Cono: CALL y PUT del mismo strike, ambos comprados (o ambos vendidos)."""
+    return Estrategia([
+        Pata("call", posicion, strike, prima_call, contratos),
+        Pata("put", posicion, strike, prima_put, contratos),
+    ], f"Straddle ({posicion})")
+
+
+def strangle(strikes, primas, contratos=1, posicion="compra"):
+    """Cuna: PUT del strike bajo y CALL del strike alto, ambos comprados (o ambos vendidos)."""
+    (strike_put, strike_call), (prima_put, prima_call) = strikes, primas
+    return Estrategia([
+        Pata("put", posicion, strike_put, prima_put, contratos),
+        Pata("call", posicion, strike_call, prima_call, contratos),
+    ], f"Strangle ({posicion})")
+
+
+def mariposa(strikes, primas, contratos=1, tipo="call"):
+    """Mariposa: compra el strike bajo y el alto y vende dos veces el del medio."""
+    (strike_bajo, strike_medio, strike_alto), (prima_baja, prima_media, prima_alta) = strikes, primas
+    return Estrategia([
+        Pata(tipo, "compra", strike_bajo, prima_baja, contratos),
+        Pata(tipo, "venta", strike_medio, prima_media, 2 * contratos),
+        Pata(tipo, "compra", strike_alto, prima_alta, contratos),
+    ], f"Mariposa con {tipo.upper()}")
+
+
+def condor(strikes, primas, contratos=1, tipo="call"):
+    """Cóndor: compra los strikes extremos y vende los dos del medio."""
+    k1, k2, k3, k4 = strikes
+    p1, p2, p3, p4 = primas
+    return Estrategia([
+        Pata(tipo, "compra", k1, p1, contratos),
+        Pata(tipo, "venta", k2, p2, contratos),
+        Pata(tipo, "venta", k3, p3, contratos),
+        Pata(tipo, "compra", k4, p4, contratos),
+    ], f"Cóndor con {tipo.upper()}")
+
+
+def iron_condor(strikes, primas, contratos=1):
+    """Iron cóndor: bull spread con PUT en los dos strikes bajos y bear spread con CALL en los dos altos."""
+    k1, k2, k3, k4 = strikes
+    p1, p2, p3, p4 = primas
+    return Estrategia([
+        Pata("put", "compra", k1, p1, contratos),
+        Pata("put", "venta", k2, p2, contratos),
+        Pata("call", "venta", k3, p3, contratos),
+        Pata("call", "compra", k4, p4, contratos),
+    ], "Iron cóndor")
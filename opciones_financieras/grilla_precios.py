@@ -0,0 +1,83 @@
+# ====================================================================
+# Autor: Emiliano Carracedo
+# Título: Analista de Sistemas
+# Ubicación: Córdoba, Argentina
+# Contacto: ecarracedo@gmail.com
+# Descripción: Grilla de precios del subyacente para las tablas y gráficos de
+#              una estrategia de opciones con cualquier cantidad de patas.
+#              Incluye de forma exacta todos los strikes (donde cambia la
+#              pendiente del payoff, y donde están la pérdida y la ganancia
+#              máximas) y todos los puntos de equilibrio, y completa entre
+#              ellos con un paso fijo o de forma adaptativa según la curvatura.
+# ====================================================================
+
+import numpy as np  # Importa numpy para operaciones con arreglos y números
+
+SEPARACION_MINIMA = 0.25  # Fracción del paso: los puntos regulares más cerca que esto de un punto clave se descartan
+MAX_PUNTOS = 100_000  # Límite de puntos del refinamiento adaptativo
+
+
+def puntos_clave(estrategia, desde=-np.inf, hasta=np.inf):
+    """Strikes y puntos de equilibrio de la estrategia dentro de [desde, hasta], ordenados y sin repetir.
+
+    Entre dos puntos clave consecutivos el payoff al vencimiento es una recta, así que evaluarlo en estos
+    puntos (más los extremos de la grilla) alcanza para reproducirlo exactamente.
+    """
+    puntos = np.unique(np.concatenate((estrategia.quiebres(), estrategia.puntos_equilibrio())))
+    return puntos[(puntos >= desde) & (puntos <= hasta)]
+
+
+def grilla_precios(estrategia, desde, hasta, paso=None, origen=None):
+    """Precios de desde a hasta con todos los puntos clave de la estrategia.
+
+    Sin paso devuelve solo los puntos clave y los extremos: la menor cantidad de puntos con la que la tabla y
+    el gráfico al vencimiento son exactos. Con paso agrega los múltiplos de paso contados desde origen (por
+    defecto desde), salvo los que quedan a menos de SEPARACION_MINIMA * paso de un punto clave.
+    """
+    claves = puntos_clave(estrategia, desde, hasta)
+    precios = [claves, [desde, hasta]]
+    if paso:
+        origen = desde if origen is None else origen
+        primero = origen + np.ceil((desde - origen) / paso - 1e-9) * paso
+        regulares = np.arange(primero, hasta + paso * 1e-9, paso)
+        if len(claves):  # Distancia de cada punto regular al punto clave más cercano (con búsqueda binaria)
+            posicion = np.searchsorted(claves, regulares)
+            anterior = claves[np.clip(posicion - 1, 0, len(claves) - 1)]
+            siguiente = claves[np.clip(posicion, 0, len(claves) - 1)]
+            distancia = np.minimum(np.abs(regulares - anterior), np.abs(regulares - siguiente))
+            regulares = regulares[(distancia == 0) | (distancia >= SEPARACION_MINIMA * paso)]
+        precios.append(regulares)
+    return np.unique(np.concatenate(precios))
+
+
+def refinar(funcion, precios, tolerancia, paso_minimo=0.0, max_puntos=MAX_PUNTOS):
+    """Agrega puntos medios donde la curva funcion(precios) se aparta de una recta más que tolerancia.
+
+    Sirve para el resultado antes del vencimiento, que es curvo: los tramos casi lineales quedan con pocos
+    puntos y los cercanos a los strikes se subdividen hasta que la interpolación lineal tenga un error menor
+    a tolerancia (o el tramo mida menos de 2 * paso_minimo). En cada vuelta solo se evalúan los tramos
+    nuevos, todos juntos en una llamada a funcion. Devuelve (precios, valores).
+    """
+    precios = np.unique(np.asarray(precios, dtype=float))
+    valores = np.asarray(funcion(precios), dtype=float)
+    revisar = np.ones(len(precios) - 1, dtype=bool)  # Tramos que todavía no se compararon con su punto medio
+
+    while revisar.any() and len(precios) < max_puntos:
+        tramos = np.flatnonzero(revisar)
+        medios = 0.5 * (precios[tramos] + precios[tramos + 1])
+        valores_medios = np.asarray(funcion(medios), dtype=float)
+        error = np.abs(valores_medios - 0.5 * (valores[tramos] + valores[tramos + 1]))
+        dividir = (error > tolerancia) & (precios[tramos + 1] - precios[tramos] > 2 * paso_minimo)
+        dividir &= np.cumsum(dividir) <= max_puntos - len(precios)  # No pasarse del límite de puntos
+        if not dividir.any():
+            break
+
+        divididos = tramos[dividir]
+        precios = np.insert(precios, divididos + 1, medios[dividir])
+        valores = np.insert(valores, divididos + 1, valores_medios[dividir])
+        # Las dos mitades de cada tramo dividido se revisan en la próxima vuelta; el resto ya está bien
+        revisar = np.zeros(len(precios) - 1, dtype=bool)
+        izquierda = divididos + np.arange(len(divididos))  # Índice del tramo después de las inserciones previas
+        revisar[izquierda] = True
+        revisar[izquierda + 1] = True
+    return precios, valores
@@ -0,0 +1,190 @@
+# ====================================================================
+# Autor: Emiliano Carracedo
+# Título: Analista de Sistemas
+# Ubicación: Córdoba, Argentina
+# Contacto: ecarracedo@gmail.com
+# Descripción: Distribución del resultado de una estrategia de opciones por
+#              simulación Monte Carlo. Simula el precio del subyacente al
+#              vencimiento (movimiento browniano geométrico, opcionalmente con
+#              saltos de Merton) en bloques de tamaño fijo repartidos entre
+#              varios procesos, y reporta resultado esperado, probabilidad de
+#              ganancia, VaR y CVaR.
+# ====================================================================
+
+import argparse  # Importa argparse para leer los parámetros de línea de comandos
+import time  # Importa time para medir la duración de la simulación
+from concurrent.futures import ProcessPoolExecutor  # Reparte los bloques entre varios procesos
+from dataclasses import dataclass  # Parámetros de los saltos
+
+import numpy as np  # Importa numpy para operaciones con arreglos y números
+
+import estrategias  # Motor de estrategias (payoff vectorizado)
+
+TAMANO_BLOQUE = 1_000_000  # Trayectorias por bloque: acota la memoria de cada proceso (unos 30 MB por bloque)
+NIVEL_CONFIANZA = 0.95
+
+
+@dataclass(frozen=True)
+class Saltos:
+    """Saltos de Merton: intensidad (saltos por año) y media y desvío del logaritmo de cada salto."""
+    intensidad: float
+    media: float
+    desvio: float
+
+
+def simular_precios_finales(generador, n, spot, volatilidad, tiempo, tendencia=0.0, saltos=None):
+    """Precios del subyacente al vencimiento para n trayectorias.
+
+    tendencia es el rendimiento anual esperado del subyacente (la tasa libre de riesgo para una simulación
+    neutral al riesgo). Con saltos, la deriva se corrige para que el rendimiento esperado no cambie.
+    """
+    deriva = (tendencia - 0.5 * volatilidad ** 2) * tiempo
+    logaritmo = generador.standard_normal(n)
+    logaritmo *= volatilidad * np.sqrt(tiempo)
+    logaritmo += deriva
+    if saltos is not None and saltos.intensidad > 0:
+        compensacion = np.exp(saltos.media + 0.5 * saltos.desvio ** 2) - 1  # Rendimiento medio de un salto
+        cantidad = generador.poisson(saltos.intensidad * tiempo, n)
+        # La suma de k saltos normales es normal con media k*media y desvío sqrt(k)*desvío
+        logaritmo += cantidad * saltos.media + np.sqrt(cantidad) * saltos.desvio * generador.standard_normal(n)
+        logaritmo -= saltos.intensidad * compensacion * tiempo
+    np.exp(logaritmo, out=logaritmo)
+    logaritmo *= spot
+    return logaritmo
+
+
+def _simular_bloque(argumentos):
+    """Simula un bloque con su propia semilla y devuelve el resultado de cada trayectoria (float32)."""
+    estrategia, n, semilla, spot, volatilidad, tiempo, tendencia, saltos = argumentos
+    generador = np.random.default_rng(semilla)
+    precios = simular_precios_finales(generador, n, spot, volatilidad, tiempo, tendencia, saltos)
+    return estrategia.payoff(precios).astype(np.float32)
+
+
+def simular_resultado(estrategia, spot, volatilidad, tiempo, simulaciones, tendencia=0.0, saltos=None, semilla=None,
+                      procesos=None, tamano_bloque=TAMANO_BLOQUE, nivel=NIVEL_CONFIANZA):
+    """Simula el resultado al vencimiento de la estrategia y devuelve un resumen de la distribución.
+
+    Cada bloque tiene una semilla derivada de semilla con SeedSequence.spawn, así que con la misma semilla
+    y el mismo tamano_bloque el resultado es idéntico sin importar la cantidad de procesos. procesos=1 simula
+    en el proceso actual (sin pool); None usa todos los núcleos.
+    """
+    if simulaciones <= 0:
+        raise ValueError(f"La cantidad de simulaciones debe ser mayor que 0 (se pidieron {simulaciones})")
+    cantidades = [tamano_bloque] * (simulaciones // tamano_bloque)
+    if simulaciones % tamano_bloque:
+        cantidades.append(simulaciones % tamano_bloque)
+    semillas = np.random.SeedSequence(semilla).spawn(len(cantidades))
+    tareas = [(estrategia, n, s, spot, volatilidad, tiempo, tendencia, saltos) for n, s in zip(cantidades, semillas)]
+
+    resultados = np.empty(simulaciones, dtype=np.float32)  # 4 bytes por trayectoria (40 MB para 10 millones)
+    inicio = 0
+    if procesos == 1 or len(tareas) == 1:
+        for bloque in map(_simular_bloque, tareas):
+            resultados[inicio:inicio + len(bloque)] = bloque
+            inicio += len(bloque)
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            for bloque in pool.map(_simular_bloque, tareas):  # Devuelve los bloques en orden
+                resultados[inicio:inicio + len(bloque)] = bloque
+                inicio += len(bloque)
+
+    return resumir(resultados, nivel)
+
+
+def resumir(resultados, nivel=NIVEL_CONFIANZA):
+    """Resultado esperado, desvío, probabilidad de ganancia, VaR y CVaR (como pérdidas positivas) al nivel indicado."""
+    if len(resultados) == 0:
+        raise ValueError("No hay resultados para resumir: la simulación necesita al menos una trayectoria")
+    posicion = int(np.floor((1 - nivel) * (len(resultados) - 1)))
+    cola = np.partition(resultados, posicion)[:posicion + 1]  # Los peores resultados (sin ordenar todo el arreglo)
+    cuantil = float(cola.max())
+    return {
+        "simulaciones": len(resultados),
+        "resultado_esperado": float(resultados.mean(dtype=np.float64)),
+        "desvio": float(resultados.std(dtype=np.float64)),
+        "probabilidad_ganancia": float(np.count_nonzero(resultados > 0) / len(resultados)),
+        "nivel": nivel,
+        "var": -cuantil,
+        "cvar": -float(cola.mean(dtype=np.float64)),
+        "peor": float(cola.min()),
+        "mejor": float(resultados.max()),
+    }
+
+
+def imprimir_resumen(resumen):
+    """Muestra el resumen de la simulación en la consola."""
+    nivel = f"{resumen['nivel']:.0%}"
+    filas = [
+        ("Resultado esperado", f"{resumen['resultado_esperado']:,.2f} (desvío {resumen['desvio']:,.2f})"),
+        ("Probabilidad de ganancia", f"{resumen['probabilidad_ganancia']:.2%}"),
+        (f"VaR {nivel}", f"{resumen['var']:,.2f}"),
+        (f"CVaR {nivel}", f"{resumen['cvar']:,.2f}"),
+        ("Peor / mejor resultado", f"{resumen['peor']:,.2f} / {resumen['mejor']:,.2f}"),
+    ]
+    print(f"\n🎲 Simulación Monte Carlo ({resumen['simulaciones']:,} trayectorias)")
+    for etiqueta, valor in filas:
+        print(f"   {etiqueta + ':':<27}{valor}")
+
+
+# Estrategias que se pueden simular desde la línea de comandos -> función que la arma a partir de strikes y primas
+ESTRATEGIAS = {
+    "compra_call": lambda k, p, c: estrategias.compra_call(k[0], p[0], c),
+    "venta_call": lambda k, p, c: estrategias.venta_call(k[0], p[0], c),
+    "compra_put": lambda k, p, c: estrategias.compra_put(k[0], p[0], c),
+    "venta_put": lambda k, p, c: estrategias.venta_put(k[0], p[0], c),
+    "bull_spread": lambda k, p, c: estrategias.bull_spread(k, p, c),
+    "bear_spread": lambda k, p, c: estrategias.bear_spread(k, p, c),
+    "straddle": lambda k, p, c: estrategias.straddle(k[0], p[0], p[1], c),
+    "strangle": lambda k, p, c: estrategias.strangle(k, p, c),
+    "mariposa": lambda k, p, c: estrategias.mariposa(k, p, c),
+    "condor": lambda k, p, c: estrategias.condor(k, p, c),
+    "iron_condor": lambda k, p, c: estrategias.iron_condor(k, p, c),
+}
+
+
+def entero_positivo(texto):
+    """Tipo de argparse para cantidades que deben ser mayores que 0."""
+    valor = int(texto)
+    if valor <= 0:
+        raise argparse.ArgumentTypeError(f"debe ser un entero mayor que 0 (se indicó {texto})")
+    return valor
+
+
+def parsear_argumentos():
+    parser = argparse.ArgumentParser(description="Distribución del resultado de una estrategia de opciones por Monte Carlo.")
+    parser.add_argument("estrategia", choices=sorted(ESTRATEGIAS), help="Estrategia a simular")
+    parser.add_argument("--strikes", type=float, nargs="+", required=True, help="Strikes de menor a mayor")
+    parser.add_argument("--primas", type=float, nargs="+", required=True,
+                        help="Primas en el mismo orden que los strikes (straddle: prima del CALL y del PUT)")
+    parser.add_argument("--contratos", type=int, default=1, help="Cantidad de contratos (por defecto 1)")
+    parser.add_argument("--spot", type=float, required=True, help="Precio actual del subyacente")
+    parser.add_argument("--volatilidad", type=float, required=True, help="Volatilidad anual (0.30 = 30%%)")
+    parser.add_argument("--dias", type=float, required=True, help="Días al vencimiento")
+    parser.add_argument("--tendencia", type=float, default=0.0,
+                        help="Rendimiento anual esperado del subyacente (por defecto 0; usar la tasa para una simulación neutral al riesgo)")
+    parser.add_argument("--saltos", type=float, nargs=3, metavar=("INTENSIDAD", "MEDIA", "DESVIO"),
+                        help="Saltos de Merton: saltos por año y media y desvío del logaritmo de cada salto")
+    parser.add_argument("--simulaciones", type=entero_positivo, default=1_000_000, help="Cantidad de trayectorias (por defecto 1.000.000)")
+    parser.add_argument("--procesos", type=entero_positivo, help="Procesos en paralelo (por defecto, todos los núcleos)")
+    parser.add_argument("--tamano-bloque", type=entero_positivo, default=TAMANO_BLOQUE,
+                        help=f"Trayectorias por bloque (por defecto {TAMANO_BLOQUE:,})")
+    parser.add_argument("--semilla", type=int, help="Semilla para reproducir la simulación")
+    parser.add_argument("--nivel", type=float, default=NIVEL_CONFIANZA, help="Nivel de confianza de VaR y CVaR (por defecto 0.95)")
+    return parser.parse_args()
+
+
+def main():
+    args = parsear_argumentos()
+    estrategia = ESTRATEGIAS[args.estrategia](args.strikes, args.primas, args.contratos)
+    saltos = Saltos(*args.saltos) if args.saltos else None
+
+    inicio = time.perf_counter()
+    resumen = simular_resultado(estrategia, args.spot, args.volatilidad, args.dias / 365, args.simulaciones,
+                                args.tendencia, saltos, args.semilla, args.procesos, args.tamano_bloque, args.nivel)
+    print(f"{estrategia.nombre}: {args.simulaciones:,} trayectorias en {time.perf_counter() - inicio:.2f} s")
+    imprimir_resumen(resumen)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# ====================================================================
+# Autor: Emiliano Carracedo
+# Título: Analista de Sistemas
+# Ubicación: Córdoba, Argentina
+# Contacto: ecarracedo@gmail.com
+# Descripción: Salidas de los scripts de opciones (gráfico, tabla en consola,
+#              Excel, CSV y Parquet) como etapas opcionales. pandas y matplotlib
+#              se importan recién cuando se usa la salida que los necesita, así
+#              el cálculo solo arranca en milisegundos.
+# ====================================================================
+
+import argparse  # Importa argparse para leer los parámetros de línea de comandos
+import os  # Importa el módulo os para interactuar con el sistema operativo
+
+
+def parsear_argumentos(descripcion):
+    """Parámetros de línea de comandos comunes a los scripts de opciones."""
+    parser = argparse.ArgumentParser(description=descripcion)
+    parser.add_argument("--sin-grafico", action="store_true", help="No genera el gráfico (no se importa matplotlib)")
+    parser.add_argument("--sin-mostrar", action="store_true", help="Guarda el gráfico sin abrir la ventana (plt.show)")
+    parser.add_argument("--sin-excel", action="store_true", help="No exporta la tabla a Excel")
+    parser.add_argument("--csv", action="store_true", help="Exporta también la tabla a CSV")
+    parser.add_argument("--parquet", action="store_true", help="Exporta también la tabla a Parquet (necesita pyarrow)")
+    parser.add_argument("--solo-calculo", action="store_true",
+                        help="Solo calcula: sin gráfico, sin tabla en consola y sin archivos salvo --csv/--parquet")
+    args = parser.parse_args()
+    if args.solo_calculo:
+        args.sin_grafico = args.sin_excel = True
+    return args
+
+
+def carpeta_resultados(script):
+    """Carpeta resultados al mismo nivel que el script (se crea si no existe)."""
+    carpeta = os.path.join(os.path.dirname(os.path.abspath(script)), "resultados")
+    os.makedirs(carpeta, exist_ok=True)
+    return carpeta
+
+
+def tabla_dataframe(tabla):
+    """Convierte la tabla (columna -> arreglo) en un DataFrame de pandas."""
+    import pandas as pd  # Importa pandas solo si se muestra o exporta la tabla
+    return pd.DataFrame(tabla)
+
+
+def mostrar_tabla(tabla):
+    """Imprime la tabla de ganancias y pérdidas en la consola."""
+    print("\nTabla de ganancias y pérdidas:")
+    print(tabla_dataframe(tabla))
+
+
+def exportar_tabla(tabla, ruta_base, excel=True, csv=False, parquet=False):
+    """Guarda la tabla en los formatos pedidos (ruta_base sin extensión) y devuelve las rutas escritas."""
+    rutas = []
+    if not (excel or csv or parquet):
+        return rutas
+    df = tabla_dataframe(tabla)
+    if excel:
+        df.to_excel(ruta_base + ".xlsx", index=False)  # Guarda el DataFrame en un archivo Excel
+        rutas.append(ruta_base + ".xlsx")
+    if csv:
+        df.to_csv(ruta_base + ".csv", index=False)
+        rutas.append(ruta_base + ".csv")
+    if parquet:
+        df.to_parquet(ruta_base + ".parquet", index=False)
+        rutas.append(ruta_base + ".parquet")
+    return rutas
+
+
+def graficar_payoff(tabla, titulo, punto_equilibrio, linea_extrema, ruta_imagen, dias_al_vencimiento=0, mostrar=True):
+    """Gráfico del payoff con las líneas guía de los scripts y lo guarda en ruta_imagen.
+
+    linea_extrema: (valor, etiqueta, color) de la línea horizontal de pérdida o ganancia máxima.
+    """
+    import matplotlib.pyplot as plt  # Importa matplotlib solo si se genera el gráfico
+    import numpy as np  # Importa numpy para los ticks del eje Y
+
+    precios, resultados = tabla['Precio Sub'], tabla['Resultado']
+    plt.figure(figsize=(10, 6))  # Define el tamaño del gráfico (más compacto)
+
+    # Líneas guía en el gráfico
+    valor_extremo, etiqueta_extremo, color_extremo = linea_extrema
+    plt.axhline(y=0, color='blue', linestyle='--')  # Línea horizontal para el punto de equilibrio
+    plt.axhline(y=valor_extremo, color=color_extremo, linestyle='--', label=etiqueta_extremo)  # Pérdida o ganancia máxima
+    plt.axvline(x=punto_equilibrio, color='blue', linestyle='--', label='Punto de equilibrio')  # Línea vertical para el punto de equilibrio
+
+    # Línea principal del gráfico
+    plt.plot(precios, resultados, marker='o', color='black', label='Payoff Opción')  # Plotea el payoff de la opción
+    if dias_al_vencimiento > 0:  # Curva del resultado antes del vencimiento
+        plt.plot(precios, tabla['Resultado Hoy'], color='orange', label=f'Resultado a {dias_al_vencimiento} días del vencimiento')
+
+    # Personalización del gráfico
+    plt.xticks(precios, rotation=60, fontsize=12)  # Rotación de las etiquetas del eje X para mejor visualización
+
+    # Eje Y: Utilizamos los resultados calculados en la tabla como ticks en el eje Y
+    yticks = np.unique(resultados)  # Obtiene los valores únicos de los resultados para los ticks del eje Y
+    plt.yticks(yticks, fontsize=12)  # Establece los valores del eje Y según los resultados
+
+    limites_y = np.concatenate((yticks, tabla['Resultado Hoy'])) if dias_al_vencimiento > 0 else yticks  # Incluye la curva antes del vencimiento
+    plt.ylim(min(limites_y) - 10, max(limites_y) + 10)  # Establece los límites del eje Y con un pequeño margen
+
+    # Etiquetas y leyenda
+    plt.xlabel('Precio Subyacente', fontsize=14)  # Etiqueta para el eje X
+    plt.ylabel('Ganancia / Pérdida', fontsize=14)  # Etiqueta para el eje Y
+    plt.title(titulo, fontsize=16)  # Título del gráfico
+    plt.grid(color='gray', linestyle='--', linewidth=0.5)  # Añade una cuadrícula ligera en el gráfico
+    plt.legend(fontsize=12)  # Muestra la leyenda con una fuente de tamaño 12
+    plt.tight_layout(pad=2)  # Ajusta el espacio en el gráfico para evitar que las etiquetas se corten
+
+    # Guardar el gráfico como imagen
+    plt.savefig(ruta_imagen, dpi=300, bbox_inches='tight')
+    if mostrar:
+        plt.show()  # Muestra el gráfico
+    plt.close()
@@ -0,0 +1,207 @@
+# ====================================================================
+# Autor: Emiliano Carracedo
+# Título: Analista de Sistemas
+# Ubicación: Córdoba, Argentina
+# Contacto: ecarracedo@gmail.com
+# Descripción: Volatilidad implícita de una cadena completa de opciones.
+#              Invierte Black-Scholes para miles de (strike, prima, plazo) a la
+#              vez con Newton-Raphson y, donde Newton no sirve, bisección dentro
+#              de un intervalo que siempre contiene la solución. Exporta la
+#              sonrisa de volatilidad a Excel y a un gráfico.
+# ====================================================================
+
+import argparse  # Importa argparse para leer los parámetros de línea de comandos
+import os  # Importa el módulo os para interactuar con el sistema operativo
+import time  # Importa time para medir la duración del cálculo
+
+import numpy as np  # Importa numpy para operaciones con arreglos y números
+
+import black_scholes  # Valuación y vega de Black-Scholes
+
+VOLATILIDAD_MINIMA = 1e-4
+VOLATILIDAD_MAXIMA = 5.0  # 500% anual
+TOLERANCIA = 1e-8  # Diferencia máxima entre la prima del modelo y la de mercado
+MAX_ITERACIONES = 100
+
+# Estado de cada opción (con devolver_estado=True). Solo las RESUELTA tienen volatilidad; el resto queda en NaN.
+RESUELTA = "resuelta"
+DATOS_INVALIDOS = "datos_invalidos"  # Prima, spot, strike o plazo faltante (NaN), o plazo no positivo
+FUERA_DE_LIMITES = "fuera_de_limites"  # Prima menor al valor intrínseco o mayor al máximo posible
+SOBRE_MAXIMO = "sobre_maximo"  # La solución es mayor que VOLATILIDAD_MAXIMA
+BAJO_MINIMO = "bajo_minimo"  # La solución es menor que VOLATILIDAD_MINIMA
+SIN_CONVERGENCIA = "sin_convergencia"  # No convergió en max_iteraciones
+ESTADOS = [RESUELTA, DATOS_INVALIDOS, FUERA_DE_LIMITES, SOBRE_MAXIMO, BAJO_MINIMO, SIN_CONVERGENCIA]
+
+
+def volatilidad_implicita(tipo, prima, spot, strike, tiempo, tasa=0.0, dividendo=0.0,
+                          tolerancia=TOLERANCIA, max_iteraciones=MAX_ITERACIONES, devolver_estado=False):
+    """Volatilidad anual que hace que Black-Scholes devuelva la prima indicada, para cada opción.
+
+    Todos los argumentos pueden ser arreglos (se combinan por broadcasting). Devuelve un arreglo con NaN en
+    las opciones sin solución: prima fuera de los límites de no arbitraje (menor al valor intrínseco o mayor al
+    máximo posible), solución fuera de [VOLATILIDAD_MINIMA, VOLATILIDAD_MAXIMA] o sin convergencia en
+    max_iteraciones. Con devolver_estado=True devuelve (volatilidades, estados), donde estados indica el motivo
+    de cada NaN (ver ESTADOS).
+
+    Cada opción itera por su cuenta: en cada paso solo se recalculan las que todavía no convergieron. Se
+    mantiene un intervalo [bajo, alto] que contiene la solución (la prima crece con la volatilidad); si el
+    paso de Newton sale del intervalo, o la vega es casi cero, se usa el punto medio (bisección).
+    """
+    tipo, prima, spot, strike, tiempo, tasa, dividendo = np.broadcast_arrays(
+        np.asarray(tipo), *(np.asarray(x, dtype=float) for x in (prima, spot, strike, tiempo, tasa, dividendo))
+    )
+    forma = prima.shape
+    tipo, prima, spot, strike, tiempo, tasa, dividendo = (x.ravel() for x in (tipo, prima, spot, strike, tiempo, tasa, dividendo))
+    call = black_scholes.es_call(tipo)
+
+    # Límites de no arbitraje de la prima
+    spot_descontado = spot * np.exp(-dividendo * tiempo)
+    strike_descontado = strike * np.exp(-tasa * tiempo)
+    minimo = np.where(call, np.maximum(spot_descontado - strike_descontado, 0), np.maximum(strike_descontado - spot_descontado, 0))
+    maximo = np.where(call, spot_descontado, strike_descontado)
+    datos_validos = ~np.isnan(prima + spot + strike + tiempo + tasa + dividendo) & (tiempo > 0)
+    en_limites = (prima > minimo) & (prima < maximo)
+    valida = datos_validos & en_limites
+
+    # La prima crece con la volatilidad: si está fuera de las primas de los extremos del intervalo, la solución también
+    estado = np.where(datos_validos, np.where(en_limites, RESUELTA, FUERA_DE_LIMITES), DATOS_INVALIDOS).astype(object)
+    for extremo, sobra, etiqueta in ((VOLATILIDAD_MAXIMA, 1, SOBRE_MAXIMO), (VOLATILIDAD_MINIMA, -1, BAJO_MINIMO)):
+        indices = np.flatnonzero(valida)
+        precio_extremo = black_scholes.precio(tipo[indices], spot[indices], strike[indices], extremo, tiempo[indices],
+                                              tasa[indices], dividendo[indices])
+        afuera = indices[sobra * (prima[indices] - precio_extremo) > 0]
+        estado[afuera] = etiqueta
+        valida[afuera] = False
+
+    resultado = np.full(prima.shape, np.nan)
+    bajo = np.full(prima.shape, VOLATILIDAD_MINIMA)
+    alto = np.full(prima.shape, VOLATILIDAD_MAXIMA)
+    # Punto de partida: aproximación de Brenner-Subrahmanyam para opciones en el dinero
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma = np.sqrt(2 * np.pi / tiempo) * prima / spot
+    sigma = np.clip(np.nan_to_num(sigma, nan=0.3), 0.05, 1.0)
+
+    activos = np.flatnonzero(valida)  # Índices de las opciones que todavía no convergieron
+    for _ in range(max_iteraciones):
+        if activos.size == 0:
+            break
+        s = sigma[activos]
+        valores = black_scholes.griegas(tipo[activos], spot[activos], strike[activos], s, tiempo[activos],
+                                        tasa[activos], dividendo[activos])
+        error = valores["precio"] - prima[activos]
+
+        convergio = np.abs(error) < tolerancia
+        resultado[activos[convergio]] = s[convergio]
+
+        # La prima crece con la volatilidad: el error indica de qué lado del intervalo está la solución
+        bajo[activos] = np.where(error < 0, s, bajo[activos])
+        alto[activos] = np.where(error > 0, s, alto[activos])
+
+        vega = valores["vega"]
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            newton = s - error / vega
+        fuera = ~((newton > bajo[activos]) & (newton < alto[activos])) | (vega < 1e-12)
+        sigma[activos] = np.where(fuera, 0.5 * (bajo[activos] + alto[activos]), newton)
+
+        # También se da por resuelta si el intervalo ya es más chico que la tolerancia
+        cerrado = ~convergio & (alto[activos] - bajo[activos] < tolerancia)
+        resultado[activos[cerrado]] = sigma[activos[cerrado]]
+        activos = activos[~(convergio | cerrado)]
+
+    estado[activos] = SIN_CONVERGENCIA  # Quedaron iterando al agotar max_iteraciones
+    if devolver_estado:
+        return resultado.reshape(forma), estado.reshape(forma)
+    return resultado.reshape(forma)
+
+
+def sonrisa_volatilidad(cadena, spot, dias, tasa=0.0, dividendo=0.0):
+    """Agrega a un DataFrame de opciones (columnas tipo, strike, prima y opcionalmente dias y spot) las
+    columnas moneyness, volatilidad_implicita y estado (ver ESTADOS). Los valores por fila de dias y spot
+    tienen prioridad."""
+    cadena = cadena.copy()
+    if "dias" not in cadena:
+        cadena["dias"] = dias
+    if "spot" not in cadena:
+        cadena["spot"] = spot
+    cadena["tipo"] = cadena["tipo"].str.strip().str.lower()
+    cadena["moneyness"] = cadena["strike"] / cadena["spot"]
+    cadena["volatilidad_implicita"], cadena["estado"] = volatilidad_implicita(
+        cadena["tipo"].to_numpy(), cadena["prima"].to_numpy(), cadena["spot"].to_numpy(),
+        cadena["strike"].to_numpy(), cadena["dias"].to_numpy() / 365, tasa, dividendo, devolver_estado=True
+    )
+    return cadena
+
+
+def graficar_sonrisa(sonrisa, ruta_imagen):
+    """Gráfico de volatilidad implícita por strike, una curva por tipo y plazo."""
+    import matplotlib.pyplot as plt  # Solo se importa si se genera el gráfico
+
+    plt.figure(figsize=(10, 6))
+    for (tipo, dias), grupo in sonrisa.dropna(subset=["volatilidad_implicita"]).groupby(["tipo", "dias"]):
+        grupo = grupo.sort_values("strike")
+        plt.plot(grupo["strike"], grupo["volatilidad_implicita"] * 100, marker="o", label=f"{tipo.upper()} {dias:g} días")
+    plt.xlabel("Strike", fontsize=14)
+    plt.ylabel("Volatilidad implícita (%)", fontsize=14)
+    plt.title("Sonrisa de volatilidad", fontsize=16)
+    plt.grid(color="gray", linestyle="--", linewidth=0.5)
+    plt.legend(fontsize=12)
+    plt.tight_layout(pad=2)
+    plt.savefig(ruta_imagen, dpi=300, bbox_inches="tight")
+    plt.close()
+
+
+def parsear_argumentos():
+    parser = argparse.ArgumentParser(description="Volatilidad implícita y sonrisa de volatilidad de una cadena de opciones.")
+    parser.add_argument("cadena", help="CSV con las columnas tipo (call/put), strike, prima y opcionalmente dias y spot")
+    parser.add_argument("--spot", type=float, help="Precio del subyacente (si el CSV no tiene la columna spot)")
+    parser.add_argument("--dias", type=float, help="Días al vencimiento (si el CSV no tiene la columna dias)")
+    parser.add_argument("--tasa", type=float, default=0.0, help="Tasa libre de riesgo anual (0.05 = 5%%)")
+    parser.add_argument("--dividendo", type=float, default=0.0, help="Rendimiento por dividendos anual")
+    parser.add_argument("--salida", help="Carpeta de salida (por defecto, resultados/ junto al CSV)")
+    parser.add_argument("--sin-grafico", action="store_true", help="No genera el gráfico de la sonrisa")
+    return parser.parse_args()
+
+
+def main():
+    import pandas as pd  # Importa pandas para leer la cadena y exportar los resultados
+
+    args = parsear_argumentos()
+    cadena = pd.read_csv(args.cadena)
+    if "spot" not in cadena and args.spot is None:
+        raise SystemExit("Falta el precio del subyacente: usá --spot o agregá la columna spot al CSV.")
+    if "dias" not in cadena and args.dias is None:
+        raise SystemExit("Faltan los días al vencimiento: usá --dias o agregá la columna dias al CSV.")
+
+    inicio = time.perf_counter()
+    sonrisa = sonrisa_volatilidad(cadena, args.spot, args.dias, args.tasa, args.dividendo)
+    segundos = time.perf_counter() - inicio
+    estados = sonrisa["estado"].value_counts()
+    print(f"📈 {estados.get(RESUELTA, 0)} de {len(sonrisa)} opciones resueltas en {segundos:.3f} s")
+    motivos = {
+        DATOS_INVALIDOS: "con datos faltantes o plazo no positivo",
+        FUERA_DE_LIMITES: "con la prima fuera de los límites de no arbitraje",
+        SOBRE_MAXIMO: f"con volatilidad mayor a {VOLATILIDAD_MAXIMA:.0%}",
+        BAJO_MINIMO: f"con volatilidad menor a {VOLATILIDAD_MINIMA:.2%}",
+        SIN_CONVERGENCIA: f"sin convergencia en {MAX_ITERACIONES} iteraciones",
+    }
+    for estado, motivo in motivos.items():
+        if estados.get(estado, 0):
+            print(f"   ⚠️ {estados[estado]} opciones {motivo} (quedan sin volatilidad)")
+
+    # Resultados en la carpeta resultados/ junto a la cadena, igual que las tablas *_tabla_PL.xlsx de los scripts
+    carpeta_resultados = args.salida or os.path.join(os.path.dirname(os.path.abspath(args.cadena)), "resultados")
+    os.makedirs(carpeta_resultados, exist_ok=True)
+    nombre = os.path.splitext(os.path.basename(args.cadena))[0]
+
+    ruta_archivo = os.path.join(carpeta_resultados, f"{nombre}_sonrisa_volatilidad.xlsx")
+    sonrisa.to_excel(ruta_archivo, index=False)
+    print(f"\n✅ La sonrisa de volatilidad se exportó a Excel como: {ruta_archivo}")
+
+    if not args.sin_grafico:
+        ruta_imagen = os.path.join(carpeta_resultados, f"{nombre}_sonrisa_volatilidad.png")
+        graficar_sonrisa(sonrisa, ruta_imagen)
+        print(f"✅ El gráfico se guardó como: {ruta_imagen}")
+
+
+if __name__ == "__main__":
+    main()
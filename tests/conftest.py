@@ -0,0 +1,32 @@
+# Configuración común de las pruebas: los módulos del repositorio se importan como scripts (cada carpeta
+# agrega las suyas al sys.path), así que acá se agregan las carpetas de cada proyecto.
+
+import importlib.util
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CARPETA_RNAV = os.path.join(RAIZ, "webscraping", "Web Scraping - RNAV")
+CARPETA_AHTRA = os.path.join(RAIZ, "webscraping", "Web Scraping - AHTRA")
+CARPETA_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+for carpeta in (
+    os.path.join(RAIZ, "opciones_financieras"),
+    os.path.join(RAIZ, "webscraping"),
+    os.path.dirname(os.path.abspath(__file__)),
+    CARPETA_RNAV,
+    CARPETA_AHTRA,
+):
+    if carpeta not in sys.path:
+        sys.path.insert(0, carpeta)
+
+
+def importar_script(nombre, ruta):
+    """Importa un script cuyo nombre de archivo no es un nombre de módulo válido (por ejemplo, con guiones)."""
+    if nombre in sys.modules:
+        return sys.modules[nombre]
+    spec = importlib.util.spec_from_file_location(nombre, ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nombre] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
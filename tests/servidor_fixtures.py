@@ -0,0 +1,89 @@
+# Servidor local de las páginas guardadas de AHTRA (tests/fixtures/ahtra), para probar el scraper sin el sitio.
+# A diferencia de "python -m http.server", tiene en cuenta la query string: las fichas se eligen por el
+# parámetro id (hoteles_hotel.php?fil=1&id=541 -> hoteles_hotel_541.html) y los listados por fil
+# (hoteles_asociados.php?fil=1 -> hoteles_asociados_1.html). Envía ETag y responde 304 a las requests
+# condicionales, como necesita el modo delta.
+#
+# Uso desde la línea de comandos:
+#   python tests/servidor_fixtures.py --puerto 8000
+#   python "webscraping/Web Scraping - AHTRA/web_scraping_ahtra.py" --filial 1 --base-url http://localhost:8000/
+
+import argparse
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CARPETA_AHTRA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "ahtra")
+
+# Página del sitio -> (parámetro de la query que elige el archivo, prefijo del archivo)
+RUTAS = {
+    "/hoteles_asociados.php": ("fil", "hoteles_asociados"),
+    "/hoteles_hotel.php": ("id", "hoteles_hotel"),
+}
+
+
+def archivo_para(ruta, carpeta=CARPETA_AHTRA):
+    """Devuelve el archivo guardado que corresponde a la ruta pedida (con su query string), o None."""
+    url = urlparse(ruta)
+    if url.path not in RUTAS:
+        return None
+    parametro, prefijo = RUTAS[url.path]
+    valor = parse_qs(url.query).get(parametro, [""])[0]
+    if not valor.isdigit():
+        return None
+    archivo = os.path.join(carpeta, f"{prefijo}_{valor}.html")
+    return archivo if os.path.exists(archivo) else None
+
+
+class ManejadorFixtures(BaseHTTPRequestHandler):
+    carpeta = CARPETA_AHTRA
+
+    def do_GET(self):
+        archivo = archivo_para(self.path, self.carpeta)
+        if archivo is None:
+            self.send_error(404)
+            return
+        with open(archivo, "rb") as f:
+            contenido = f.read()
+        etag = '"' + hashlib.sha1(contenido).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(contenido)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(contenido)
+
+    def log_message(self, formato, *args):
+        pass  # Sin una línea por request en la consola
+
+
+def iniciar(puerto=0, carpeta=CARPETA_AHTRA):
+    """Inicia el servidor en un hilo y lo devuelve; la URL base es f"http://127.0.0.1:{servidor.server_port}/"."""
+    manejador = type("Manejador", (ManejadorFixtures,), {"carpeta": carpeta})
+    servidor = ThreadingHTTPServer(("127.0.0.1", puerto), manejador)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sirve las páginas guardadas de AHTRA eligiendo cada archivo por la query string.")
+    parser.add_argument("--puerto", type=int, default=8000)
+    parser.add_argument("--carpeta", default=CARPETA_AHTRA, help="Carpeta con hoteles_asociados_<fil>.html y hoteles_hotel_<id>.html")
+    args = parser.parse_args()
+    servidor = iniciar(args.puerto, args.carpeta)
+    print(f"🌐 Sirviendo {args.carpeta} en http://127.0.0.1:{servidor.server_port}/ (Ctrl+C para terminar)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
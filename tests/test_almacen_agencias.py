@@ -0,0 +1,102 @@
+import sqlite3
+
+import pytest
+
+from almacen_agencias import SQL_APLICAR_CORRECCIONES, AlmacenAgencias, main
+from normalizacion_telefono import VERSION_REGLAS
+
+
+@pytest.fixture
+def ruta_almacen(tmp_path):
+    ruta = str(tmp_path / "agencias.sqlite")
+    with AlmacenAgencias(ruta) as almacen:
+        almacen.reemplazar_provincia("Río Negro", [
+            {"nombre": "Patagonia Viajes", "telefono": "(2944) 15 523456", "correo": "info@patagonia.com.ar",
+             "localidad": "San Carlos de Bariloche"},
+            {"nombre": "Lagos del Sur", "telefono": "(294) 442-3000", "correo": "", "localidad": "Villa La Angostura"},
+        ])
+    return ruta
+
+
+def test_los_telefonos_se_recalculan_cuando_cambian_las_reglas(ruta_almacen):
+    with sqlite3.connect(ruta_almacen) as conexion:  # Simula una base calculada con reglas anteriores
+        conexion.execute("UPDATE agencias SET telefono_e164 = '', telefono_estado = 'invalido'")
+        conexion.execute(f"PRAGMA user_version = {VERSION_REGLAS - 1}")
+
+    with AlmacenAgencias(ruta_almacen):
+        pass
+
+    with sqlite3.connect(ruta_almacen) as conexion:
+        assert conexion.execute("SELECT telefono_e164, telefono_estado FROM agencias ORDER BY nombre").fetchall() == [
+            ("+542944423000", "fijo"),
+            ("+5492944523456", "movil"),
+        ]
+        assert conexion.execute("PRAGMA user_version").fetchone()[0] == VERSION_REGLAS
+
+
+@pytest.mark.parametrize("consulta", ["DELETE FROM agencias", "SELECT * FROM no_existe", "SELEC 1"])
+def test_la_consulta_sql_invalida_termina_con_error(ruta_almacen, monkeypatch, capsys, consulta):
+    monkeypatch.setattr("sys.argv", ["almacen_agencias.py", "--almacen", ruta_almacen, "sql", consulta])
+    with pytest.raises(SystemExit) as salida:
+        main()
+    assert salida.value.code == 1
+    assert capsys.readouterr().out.startswith("❌ Error en la consulta SQL:")
+
+    with AlmacenAgencias(ruta_almacen) as almacen:  # El DELETE no llegó a modificar la base
+        assert almacen.consultar("SELECT COUNT(*) AS cantidad FROM agencias") == [{"cantidad": 2}]
+
+
+def test_la_consulta_sql_valida_imprime_las_filas(ruta_almacen, monkeypatch, capsys):
+    monkeypatch.setattr("sys.argv", ["almacen_agencias.py", "--almacen", ruta_almacen, "sql",
+                                     "SELECT nombre FROM agencias ORDER BY nombre"])
+    main()
+    salida = capsys.readouterr().out
+    assert "Lagos del Sur" in salida and "Patagonia Viajes" in salida
+
+
+AGENCIAS_CORRECCIONES = {
+    "Salta": [
+        {"nombre": "Norte Viajes", "correo": ""},
+        {"nombre": "Norte Viajes", "correo": ""},  # Nombre repetido: se corrigen las dos filas
+        {"nombre": "Cerros Tour", "correo": "ya@tiene.com"},  # Con correo: no se pisa
+        {"nombre": "Sin Corrección", "correo": ""},
+        {"nombre": "norte viajes", "correo": ""},  # El nombre distingue mayúsculas
+    ],
+    "Jujuy": [{"nombre": "Norte Viajes", "correo": ""}],  # Misma agencia en otra provincia: no se toca
+}
+CORRECCIONES = [
+    ("SALTA", "Norte Viajes", "", "norte@viajes.com"),  # La provincia no distingue mayúsculas
+    ("Salta", "Cerros Tour", "", "cerros@tour.com"),
+    ("Salta", "No Cargada", "", "otra@agencia.com"),
+]
+
+
+def aplicar_correcciones_fila_por_fila(conexion, provincia):
+    """Referencia: busca la corrección de cada agencia con correo vacío y la actualiza de a una."""
+    filas = conexion.execute("SELECT id, provincia, nombre FROM agencias WHERE provincia = ? AND correo = ''",
+                             (provincia,)).fetchall()
+    for fila in filas:
+        correccion = conexion.execute(
+            "SELECT correo_corregido FROM correcciones_correo WHERE provincia = ? AND nombre = ?",
+            (fila["provincia"], fila["nombre"])).fetchone()
+        if correccion is not None:
+            conexion.execute("UPDATE agencias SET correo = ? WHERE id = ?", (correccion[0], fila["id"]))
+
+
+def test_aplicar_correcciones_coincide_con_la_actualizacion_fila_por_fila(tmp_path):
+    resultados = []
+    for aplicar in (lambda conexion: conexion.execute(SQL_APLICAR_CORRECCIONES, ("Salta",)),
+                    lambda conexion: aplicar_correcciones_fila_por_fila(conexion, "Salta")):
+        with AlmacenAgencias(str(tmp_path / f"agencias_{len(resultados)}.sqlite")) as almacen:
+            for provincia, filas in AGENCIAS_CORRECCIONES.items():
+                almacen.reemplazar_provincia(provincia, filas)
+            with almacen.conexion:  # Sin guardar_correcciones, que ya las aplica
+                almacen.conexion.executemany(
+                    "INSERT INTO correcciones_correo (provincia, nombre, correo_original, correo_corregido, actualizado) "
+                    "VALUES (?, ?, ?, ?, '')", CORRECCIONES)
+                aplicar(almacen.conexion)
+            resultados.append(almacen.consultar("SELECT id, provincia, nombre, correo FROM agencias ORDER BY id"))
+
+    assert resultados[0] == resultados[1]
+    assert [fila["correo"] for fila in resultados[0]] == [
+        "norte@viajes.com", "norte@viajes.com", "ya@tiene.com", "", "", ""]
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from backtest import RUEDAS_POR_ANIO, _curvas, simular_ciclos, volatilidad_historica
+
+
+@pytest.fixture
+def precios():
+    generador = np.random.default_rng(3)
+    return 100 * np.exp(np.cumsum(generador.normal(0, 0.02, 120)))
+
+
+def volatilidad_con_bucle(precios, ventana):
+    """Desvío móvil de los rendimientos calculado fecha por fecha, con los precios hasta cada fecha."""
+    volatilidad = np.full(len(precios), np.nan)
+    for i in range(ventana, len(precios)):
+        rendimientos = np.diff(np.log(precios[i - ventana:i + 1]))
+        volatilidad[i] = np.std(rendimientos, ddof=1) * np.sqrt(RUEDAS_POR_ANIO)
+    return volatilidad
+
+
+@pytest.mark.parametrize("ventana", [2, 5, 20])
+def test_volatilidad_historica_coincide_con_el_calculo_fecha_por_fecha(precios, ventana):
+    np.testing.assert_allclose(volatilidad_historica(precios, ventana), volatilidad_con_bucle(precios, ventana),
+                               rtol=1e-9, atol=1e-9, equal_nan=True)  # Las sumas acumuladas redondean distinto
+
+
+def test_volatilidad_historica_no_usa_precios_posteriores(precios):
+    volatilidad = volatilidad_historica(precios, 20)
+    assert np.isnan(volatilidad[:20]).all()
+    modificados = precios.copy()
+    modificados[60:] *= 1.5  # Un salto en el futuro no cambia la volatilidad de las fechas anteriores
+    np.testing.assert_array_equal(volatilidad_historica(modificados, 20)[:60], volatilidad[:60])
+
+
+@pytest.mark.parametrize("largo, ventana", [(20, 20), (5, 20), (30, 1)])
+def test_serie_demasiado_corta_o_ventana_invalida(largo, ventana):
+    with pytest.raises(ValueError):
+        volatilidad_historica(np.linspace(100, 110, largo), ventana)
+
+
+def test_el_primer_rollo_empieza_despues_de_la_ventana(precios):
+    volatilidad = volatilidad_historica(precios, 20)
+    inicio, resultado_diario, resultado_rollo, _ = simular_ciclos(precios, volatilidad, "compra_call", 10, [0.0])
+    assert inicio == 20
+    assert resultado_rollo.shape == (1, (len(precios) - 1 - 20) // 10)
+    assert np.isfinite(resultado_diario).all()
+    curva = _curvas(precios, inicio, resultado_diario)[0]
+    assert (curva[:21] == 0).all()
+
+    with pytest.raises(ValueError, match="no alcanza"):
+        simular_ciclos(precios[:25], volatilidad_historica(precios[:25], 20), "compra_call", 10, [0.0])
@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+import benchmarks
+
+
+def medicion(por_segundo):
+    return {"por_segundo": por_segundo, "unidad": "precios", "elementos": 1000, "segundos": 1000 / por_segundo}
+
+
+def test_comparar_informa_regresiones_y_pruebas_sin_base():
+    base = {"payoff_vectorizado": medicion(1000), "griegas_cadena": medicion(1000)}
+    resultados = {"payoff_vectorizado": medicion(700), "griegas_cadena": medicion(1100), "montecarlo": medicion(50)}
+    comparacion, sin_base = benchmarks.comparar(resultados, base, umbral=0.2)
+    assert [(nombre, round(cambio, 3), regresion) for nombre, cambio, regresion in comparacion] == [
+        ("payoff_vectorizado", -0.3, True), ("griegas_cadena", 0.1, False)]
+    assert sin_base == ["montecarlo"]
+
+
+@pytest.mark.parametrize("pruebas, codigo", [
+    (["payoff_vectorizado"], None),
+    (["payoff_vectorizado", "montecarlo"], benchmarks.SALIDA_SIN_BASE),
+])
+def test_una_prueba_que_no_esta_en_la_base_no_pasa_el_control(tmp_path, monkeypatch, pruebas, codigo):
+    ruta_base = tmp_path / "base.json"
+    ruta_base.write_text(json.dumps({"escala": 1.0, "entorno": benchmarks.entorno(),
+                                     "resultados": {"payoff_vectorizado": medicion(1000)}}), encoding="utf-8")
+    monkeypatch.setattr(benchmarks, "medir", lambda nombre, repeticiones, escala: medicion(1000))
+    monkeypatch.setattr("sys.argv", ["benchmarks.py", "--base", str(ruta_base), "--pruebas", *pruebas])
+
+    if codigo is None:
+        benchmarks.main()
+    else:
+        with pytest.raises(SystemExit) as salida:
+            benchmarks.main()
+        assert salida.value.code == codigo
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+import black_scholes
+
+SPOTS = np.linspace(60, 140, 17)[:, None]
+STRIKE, VOLATILIDAD, TIEMPO, TASA, DIVIDENDO = 100.0, 0.35, 0.5, 0.04, 0.01
+
+
+def precio(tipo, spot=SPOTS, volatilidad=VOLATILIDAD, tiempo=TIEMPO, tasa=TASA):
+    return black_scholes.precio(tipo, spot, STRIKE, volatilidad, tiempo, tasa, DIVIDENDO)
+
+
+@pytest.mark.parametrize("tipo", ["call", "put"])
+def test_griegas_coinciden_con_diferencias_finitas(tipo):
+    griegas = black_scholes.griegas(tipo, SPOTS, STRIKE, VOLATILIDAD, TIEMPO, TASA, DIVIDENDO)
+    h = 1e-3
+    aproximadas = {
+        "precio": precio(tipo),
+        "delta": (precio(tipo, spot=SPOTS + h) - precio(tipo, spot=SPOTS - h)) / (2 * h),
+        "gamma": (precio(tipo, spot=SPOTS + h) - 2 * precio(tipo) + precio(tipo, spot=SPOTS - h)) / h ** 2,
+        "vega": (precio(tipo, volatilidad=VOLATILIDAD + h) - precio(tipo, volatilidad=VOLATILIDAD - h)) / (2 * h),
+        # Theta es el cambio por el paso del tiempo: el plazo restante disminuye
+        "theta": -(precio(tipo, tiempo=TIEMPO + h) - precio(tipo, tiempo=TIEMPO - h)) / (2 * h),
+        "rho": (precio(tipo, tasa=TASA + h) - precio(tipo, tasa=TASA - h)) / (2 * h),
+    }
+    for nombre, valor in aproximadas.items():
+        np.testing.assert_allclose(griegas[nombre], valor, rtol=1e-4, atol=1e-5, err_msg=nombre)
+
+
+def test_paridad_put_call():
+    diferencia = precio("call") - precio("put")
+    esperada = SPOTS * np.exp(-DIVIDENDO * TIEMPO) - STRIKE * np.exp(-TASA * TIEMPO)
+    np.testing.assert_allclose(diferencia, esperada, atol=1e-10)
+
+
+def test_al_vencimiento_vale_el_intrinseco_y_las_griegas_de_segundo_orden_son_cero():
+    griegas = black_scholes.griegas("call", SPOTS, STRIKE, VOLATILIDAD, 0.0)
+    np.testing.assert_allclose(griegas["precio"], np.maximum(SPOTS - STRIKE, 0))
+    np.testing.assert_array_equal(griegas["delta"], (SPOTS > STRIKE).astype(float))
+    assert not griegas["gamma"].any() and not griegas["vega"].any()
+
+
+def test_broadcasting_de_una_superficie():
+    tiempos = np.array([0.1, 0.5, 1.0])[None, :]
+    superficie = black_scholes.precio("put", SPOTS, STRIKE, VOLATILIDAD, tiempos)
+    assert superficie.shape == (len(SPOTS), 3)
+    for j, t in enumerate(tiempos[0]):
+        np.testing.assert_allclose(superficie[:, j], black_scholes.precio("put", SPOTS[:, 0], STRIKE, VOLATILIDAD, t))
+
+
+def test_tipo_invalido():
+    with pytest.raises(ValueError, match="Tipo de opción inválido"):
+        black_scholes.precio("compra", 100, 100, 0.3, 0.5)
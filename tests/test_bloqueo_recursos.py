@@ -0,0 +1,79 @@
+import asyncio
+
+from bloqueo_recursos import BloqueadorRecursos
+
+
+class RequestFalsa:
+    def __init__(self, url, tipo="document", encabezados=200, cuerpo=1_000):
+        self.url = url
+        self.resource_type = tipo
+        self._tamanos = {"requestBodySize": 0, "requestHeadersSize": 300,
+                         "responseHeadersSize": encabezados, "responseBodySize": cuerpo}
+
+    async def sizes(self):
+        return self._tamanos
+
+
+class RouteFalsa:
+    def __init__(self, request):
+        self.request = request
+        self.accion = None
+
+    async def abort(self):
+        self.accion = "abort"
+
+    async def continue_(self):
+        self.accion = "continue"
+
+
+class ContextoFalso:
+    def __init__(self):
+        self.eventos = {}
+        self.rutas = []
+
+    def on(self, evento, funcion):
+        self.eventos[evento] = funcion
+
+    async def route(self, patron, funcion):
+        self.rutas.append(funcion)
+
+
+def test_bloquea_por_tipo_y_por_dominio():
+    bloqueador = BloqueadorRecursos.para_sitio("ahtra", dominios_extra=["127.0.0.1"])
+    assert bloqueador.debe_bloquear("image", "https://www.ahtra.com.ar/foto.jpg")
+    assert bloqueador.debe_bloquear("script", "https://www.google-analytics.com/analytics.js")
+    assert not bloqueador.debe_bloquear("document", "https://www.ahtra.com.ar/hoteles_hotel.php?id=1")
+    assert not bloqueador.debe_bloquear("document", "http://127.0.0.1:8000/hoteles_hotel.php?id=1")
+
+
+def test_mide_los_bytes_descargados_y_estima_los_bloqueados():
+    bloqueador = BloqueadorRecursos.para_sitio("ahtra")
+    contexto = ContextoFalso()
+
+    async def correr():
+        await bloqueador.instalar(contexto)
+        permitida, imagen = RequestFalsa("https://www.ahtra.com.ar/"), RequestFalsa("https://www.ahtra.com.ar/a.jpg", "image")
+        for request in (permitida, imagen):
+            await contexto.rutas[0](RouteFalsa(request))
+        await contexto.eventos["requestfinished"](permitida)  # Solo la permitida termina de descargarse
+
+    asyncio.run(correr())
+    assert (bloqueador.permitidas, bloqueador.bloqueadas) == (1, {"image": 1})
+    assert (bloqueador.descargadas, bloqueador.bytes_descargados) == (1, 1_200)
+    resumen = bloqueador.resumen()
+    assert "Descargado (medido): 0.00 MB en 1 requests" in resumen
+    assert "se estiman" in resumen and "sin medir" in resumen
+
+
+def test_sin_bloqueo_solo_mide():
+    bloqueador = BloqueadorRecursos.sin_bloqueo()
+    contexto = ContextoFalso()
+
+    async def correr():
+        await bloqueador.instalar(contexto)
+        await contexto.eventos["requestfinished"](RequestFalsa("https://cdn.ejemplo.com/video.mp4", "media", cuerpo=2_500_000))
+
+    asyncio.run(correr())
+    assert contexto.rutas == []  # No intercepta las requests
+    assert not bloqueador.debe_bloquear("media", "https://cdn.ejemplo.com/video.mp4")
+    assert bloqueador.resumen() == "📦 Descargado (medido): 2.50 MB en 1 requests (sin bloqueo)."
@@ -0,0 +1,137 @@
+import asyncio
+import socket
+import threading
+
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+import pytest
+
+from cache_correos import CacheCorreos, ResolvedorDNS, ResolvedorEstatico, verificar_dominios
+from normalizacion_correo import NormalizadorCorreos
+
+# Zona del servidor DNS de prueba: dominio -> {tipo: registro}. Los dominios que no están no existen (NXDOMAIN);
+# a "lento.com" no se le responde, para probar el timeout.
+ZONA = {
+    "gmail.com.": {"MX": ["20 alt1.gmail-smtp-in.l.google.com.", "5 gmail-smtp-in.l.google.com."]},
+    "solo-a.com.ar.": {"A": ["192.0.2.10"]},
+    "sin-correo.com.ar.": {},
+}
+SIN_RESPUESTA = "lento.com."
+
+
+class ServidorDNSPrueba:
+    """Servidor DNS mínimo por UDP en un puerto alto de 127.0.0.1, en un hilo."""
+
+    def __init__(self):
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(("127.0.0.1", 0))
+        self.socket.settimeout(0.1)
+        self.puerto = self.socket.getsockname()[1]
+        self.consultas = []
+        self.detener = threading.Event()
+        self.hilo = threading.Thread(target=self.atender, daemon=True)
+        self.hilo.start()
+
+    def atender(self):
+        while not self.detener.is_set():
+            try:
+                datos, direccion = self.socket.recvfrom(4096)
+            except socket.timeout:
+                continue
+            consulta = dns.message.from_wire(datos)
+            pregunta = consulta.question[0]
+            nombre, tipo = pregunta.name.to_text().lower(), dns.rdatatype.to_text(pregunta.rdtype)
+            self.consultas.append((nombre, tipo))
+            if nombre == SIN_RESPUESTA:
+                continue
+            respuesta = dns.message.make_response(consulta)
+            if nombre not in ZONA:
+                respuesta.set_rcode(dns.rcode.NXDOMAIN)
+            elif tipo in ZONA[nombre]:
+                respuesta.answer.append(dns.rrset.from_text_list(nombre, 300, "IN", tipo, ZONA[nombre][tipo]))
+            self.socket.sendto(respuesta.to_wire(), direccion)
+
+    def cerrar(self):
+        self.detener.set()
+        self.hilo.join()
+        self.socket.close()
+
+
+@pytest.fixture
+def servidor_dns():
+    servidor = ServidorDNSPrueba()
+    yield servidor
+    servidor.cerrar()
+
+
+@pytest.fixture
+def resolvedor(servidor_dns):
+    return ResolvedorDNS(["127.0.0.1"], servidor_dns.puerto, timeout=0.5)
+
+
+def test_resolver_mx_devuelve_los_servidores_por_prioridad(resolvedor):
+    assert asyncio.run(resolvedor.resolver_mx("gmail.com")) == ["gmail-smtp-in.l.google.com", "alt1.gmail-smtp-in.l.google.com"]
+
+
+def test_resolver_mx_sin_mx_usa_la_direccion_del_dominio(resolvedor):
+    assert asyncio.run(resolvedor.resolver_mx("solo-a.com.ar")) == ["solo-a.com.ar"]
+
+
+@pytest.mark.parametrize("nombre", ["sin-correo.com.ar", "no-existe.com.ar"])
+def test_resolver_mx_sin_mx_ni_direccion_o_nxdomain_no_recibe_correo(resolvedor, nombre):
+    assert asyncio.run(resolvedor.resolver_mx(nombre)) == []
+
+
+def test_resolver_mx_propaga_el_timeout(resolvedor):
+    import dns.exception
+
+    with pytest.raises(dns.exception.Timeout):
+        asyncio.run(resolvedor.resolver_mx("lento.com"))
+
+
+def test_verificar_dominios_guarda_los_resultados_y_los_reutiliza(resolvedor, servidor_dns, tmp_path):
+    ruta = tmp_path / "cache_correos.sqlite"
+    dominios = ["gmail.com", "GMAIL.com", "solo-a.com.ar", "sin-correo.com.ar", "no-existe.com.ar", "lento.com"]
+
+    with CacheCorreos(str(ruta)) as cache:
+        resultados = asyncio.run(verificar_dominios(dominios, resolvedor, cache))
+    assert resultados == {
+        "gmail.com": (True, ["gmail-smtp-in.l.google.com", "alt1.gmail-smtp-in.l.google.com"]),
+        "solo-a.com.ar": (True, ["solo-a.com.ar"]),
+        "sin-correo.com.ar": (False, []),
+        "no-existe.com.ar": (False, []),
+        "lento.com": (None, []),  # Sin respuesta: no se sabe, y no se guarda
+    }
+
+    servidor_dns.consultas.clear()
+    with CacheCorreos(str(ruta)) as cache:  # Otra corrida: los resultados salen del disco
+        guardados = asyncio.run(verificar_dominios(dominios, resolvedor, cache))
+    assert guardados == resultados
+    assert {nombre for nombre, _ in servidor_dns.consultas} == {"lento.com."}  # Solo se reintenta el que no respondió
+
+
+def test_verificar_dominios_vencidos_se_vuelven_a_consultar(tmp_path):
+    ruta = str(tmp_path / "cache_correos.sqlite")
+    resolvedor = ResolvedorEstatico({"agencia.com.ar": ["mx.agencia.com.ar"]})
+    with CacheCorreos(ruta) as cache:
+        asyncio.run(verificar_dominios(["agencia.com.ar", "otra.com.ar"], resolvedor, cache))
+        asyncio.run(verificar_dominios(["agencia.com.ar", "otra.com.ar"], resolvedor, cache))
+        assert resolvedor.consultas == 2
+        asyncio.run(verificar_dominios(["agencia.com.ar"], resolvedor, cache, vigencia_dias=-1))
+        assert resolvedor.consultas == 3
+
+
+def test_los_veredictos_de_validacion_se_reutilizan_entre_corridas(tmp_path):
+    ruta = str(tmp_path / "cache_correos.sqlite")
+    correos = ["Ventas@Agencia.com.ar", "sin arroba", "ventas@agencia.com.ar"]
+
+    with CacheCorreos(ruta) as cache:
+        primera = NormalizadorCorreos(cache=cache).normalizar_lote(correos)
+        assert (cache.aciertos, cache.fallos) == (0, 2)
+
+    with CacheCorreos(ruta) as cache:
+        segunda = NormalizadorCorreos(cache=cache).normalizar_lote(correos)
+        assert (cache.aciertos, cache.fallos) == (2, 0)
+    assert primera == segunda == ["ventas@agencia.com.ar", "", "ventas@agencia.com.ar"]
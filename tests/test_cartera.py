@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import cartera
+import estrategias
+from cartera import MEDIDAS, Cartera
+
+
+@pytest.fixture
+def ruta_posiciones(tmp_path):
+    ruta = tmp_path / "posiciones.csv"
+    pd.DataFrame({
+        "subyacente": ["GGAL", "GGAL", "YPF"],
+        "id_estrategia": [1, 1, 2],
+        "tipo": ["call", "call", "put"],
+        "posicion": ["compra", "venta", "compra"],
+        "strike": [100.0, 110.0, 50.0],
+        "prima": [5.0, 2.0, 3.0],
+    }).to_csv(ruta, index=False)
+    return str(ruta)
+
+
+def correr(monkeypatch, ruta, *opciones):
+    monkeypatch.setattr("sys.argv", ["cartera.py", ruta, "--salida", str(ruta) + "_resultados", *opciones])
+    cartera.main()
+
+
+@pytest.mark.parametrize("opciones, mensaje", [
+    (["--spot", "GGLA", "105"], "subyacente desconocido 'GGLA' (la cartera tiene: GGAL, YPF)"),
+    (["--spot", "GGAL", "cien"], "el precio debe ser un número"),
+])
+def test_spot_invalido_se_informa_como_error_de_argumentos(ruta_posiciones, monkeypatch, capsys, opciones, mensaje):
+    with pytest.raises(SystemExit) as salida:
+        correr(monkeypatch, ruta_posiciones, *opciones)
+    assert salida.value.code == 2
+    assert mensaje in capsys.readouterr().err
+
+
+def test_spot_de_un_subyacente_de_la_cartera(ruta_posiciones, monkeypatch, capsys):
+    correr(monkeypatch, ruta_posiciones, "--spot", "GGAL", "105")
+    salida = capsys.readouterr().out
+    assert "GGAL a 105.00" in salida
+    assert "resultado:     2.0000" in salida  # Spread 100/110: 5 de valor intrínseco menos 3 de primas netas
+
+
+def cartera_de_prueba():
+    nueva = Cartera()
+    nueva.agregar_subyacente("GGAL", np.linspace(60, 140, 161), volatilidad=0.4, dias=30, tasa=0.05)
+    nueva.agregar_subyacente("YPF", np.linspace(20, 60, 81), volatilidad=0.3, dias=10)
+    return nueva
+
+
+POSICIONES = {
+    "a": ("GGAL", estrategias.bull_spread((95, 105), (7, 3), 2), None),
+    "b": ("GGAL", estrategias.straddle(100, 5, 4, posicion="venta"), 60),
+    "c": ("YPF", estrategias.iron_condor((30, 35, 45, 50), (0.5, 1.5, 1.5, 0.5)), None),
+    "d": ("GGAL", estrategias.compra_put(90, 2.5, 3), None),
+    "e": ("YPF", estrategias.mariposa((35, 40, 45), (6, 3, 1)), None),
+}
+
+
+def totales_por_posicion(posiciones):
+    """Totales sumando cada posición por separado con el motor de estrategias (sin netear contratos)."""
+    referencia = cartera_de_prueba()
+    totales = {nombre: {m: np.zeros_like(d.precios) for m in MEDIDAS} for nombre, d in referencia.subyacentes.items()}
+    for subyacente, estrategia, dias in posiciones.values():
+        datos = referencia.subyacentes[subyacente]
+        tiempo = (datos.dias if dias is None else dias) / 365
+        griegas = estrategia.griegas(datos.precios, datos.volatilidad, tiempo, datos.tasa)
+        totales[subyacente]["resultado"] += estrategia.payoff(datos.precios)
+        totales[subyacente]["resultado_hoy"] += estrategia.resultado_teorico(datos.precios, datos.volatilidad, tiempo,
+                                                                             datos.tasa)
+        for medida in MEDIDAS[2:]:
+            totales[subyacente][medida] += griegas[medida]
+    return totales
+
+
+def comparar_totales(una_cartera, esperados):
+    for subyacente, medidas in esperados.items():
+        for medida, valores in medidas.items():
+            np.testing.assert_allclose(una_cartera.totales(subyacente)[medida], valores, atol=1e-8,
+                                       err_msg=f"{subyacente} {medida}")
+
+
+def test_altas_bajas_y_reemplazos_incrementales_coinciden_con_el_recalculo():
+    incremental = cartera_de_prueba()
+    for id_posicion, (subyacente, estrategia, dias) in POSICIONES.items():
+        incremental.agregar(id_posicion, subyacente, estrategia, dias)
+    incremental.quitar("b")
+    incremental.agregar("d", "GGAL", estrategias.venta_call(110, 1.5), None)  # Reemplaza la posición d
+    incremental.quitar("e")
+    incremental.agregar("e", "YPF", estrategias.mariposa((35, 40, 45), (6, 3, 1)), None)
+
+    finales = {k: v for k, v in POSICIONES.items() if k != "b"}
+    finales["d"] = ("GGAL", estrategias.venta_call(110, 1.5), None)
+    comparar_totales(incremental, totales_por_posicion(finales))
+    assert incremental.subyacentes["GGAL"].posiciones == 2 and incremental.subyacentes["YPF"].posiciones == 2
+
+    completa = cartera_de_prueba()
+    completa.agregar_varias({k: cartera.Posicion(*v) for k, v in finales.items()})
+    completa.recalcular()
+    for subyacente in completa.subyacentes:
+        for medida in MEDIDAS:
+            np.testing.assert_allclose(incremental.totales(subyacente)[medida], completa.totales(subyacente)[medida],
+                                       atol=1e-8)
+
+
+def test_en_precio_interpola_en_la_grilla():
+    una_cartera = cartera_de_prueba()
+    una_cartera.agregar("a", *POSICIONES["a"])
+    assert una_cartera.en_precio("GGAL", 100.25)["resultado"] == pytest.approx(2 * (100.25 - 95 - 4))
+
+
+def test_subyacente_desconocido():
+    with pytest.raises(ValueError, match="Subyacente desconocido"):
+        cartera_de_prueba().agregar("x", "ALUA", estrategias.compra_call(10, 1), None)
@@ -0,0 +1,42 @@
+from checkpoint import DiarioCheckpoint, ruta_checkpoint
+
+
+def test_registrar_y_cargar(tmp_path):
+    diario = DiarioCheckpoint(ruta_checkpoint(str(tmp_path), "Jujuy_agencias"))
+    assert diario.cargar() == []
+    entradas = [{"pagina": 1, "filas": [{"nombre": "Ñandú Viajes"}]}, {"pagina": 2, "filas": []}]
+    for entrada in entradas:
+        diario.registrar(entrada)
+    assert DiarioCheckpoint(diario.ruta).cargar() == entradas
+    assert (tmp_path / "checkpoints" / "Jujuy_agencias.jsonl").exists()
+
+
+def test_la_linea_cortada_por_una_interrupcion_se_descarta_y_se_repara(tmp_path):
+    diario = DiarioCheckpoint(str(tmp_path / "diario.jsonl"))
+    diario.registrar({"pagina": 1})
+    with open(diario.ruta, "a", encoding="utf-8") as archivo:
+        archivo.write('{"pagina": 2, "fil')  # Corte a mitad de la escritura
+
+    assert diario.cargar() == [{"pagina": 1}]
+    diario.registrar({"pagina": 2})  # La entrada nueva no queda pegada a la línea cortada
+    assert diario.cargar() == [{"pagina": 1}, {"pagina": 2}]
+
+
+def test_reanudar_da_lo_mismo_que_una_corrida_sin_cortes(tmp_path):
+    """Procesar las páginas con cortes y reanudaciones deja en el diario lo mismo que una corrida completa."""
+    paginas = [{"pagina": i, "filas": [f"agencia {i}.{j}" for j in range(3)]} for i in range(10)]
+    continuo = DiarioCheckpoint(str(tmp_path / "continuo.jsonl"))
+    for pagina in paginas:
+        continuo.registrar(pagina)
+
+    cortado = DiarioCheckpoint(str(tmp_path / "cortado.jsonl"))
+    for corte in (3, 7, 10):  # Tres ejecuciones: cada una retoma desde lo registrado
+        hechas = {entrada["pagina"] for entrada in DiarioCheckpoint(cortado.ruta).cargar()}
+        for pagina in paginas[:corte]:
+            if pagina["pagina"] not in hechas:
+                cortado.registrar(pagina)
+    assert cortado.cargar() == continuo.cargar()
+
+    cortado.eliminar()
+    cortado.eliminar()  # Eliminar un diario que ya no existe no falla
+    assert cortado.cargar() == []
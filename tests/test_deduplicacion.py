@@ -0,0 +1,122 @@
+import pytest
+
+from deduplicacion_agencias import Deduplicador, UnionFind, palabras_distintivas, registros_canonicos, similitud_nombres
+
+
+def agencia(nombre, correo="", telefono="", localidad="", provincia=""):
+    return {"nombre": nombre, "correo": correo, "telefono": telefono, "localidad": localidad, "provincia": provincia}
+
+
+def test_union_find_une_por_transitividad():
+    grupos = UnionFind(5)
+    assert grupos.unir(0, 1)
+    assert grupos.unir(1, 2)
+    assert not grupos.unir(2, 0)  # Ya estaban en el mismo conjunto
+    assert grupos.buscar(0) == grupos.buscar(1) == grupos.buscar(2)
+    assert grupos.buscar(3) != grupos.buscar(0)
+    assert grupos.tamano[grupos.buscar(2)] == 3
+
+
+def test_union_find_comprime_los_caminos():
+    grupos = UnionFind(4)
+    grupos.padre = [0, 0, 1, 2]  # Cadena 3 -> 2 -> 1 -> 0
+    assert grupos.buscar(3) == 0
+    assert grupos.padre == [0, 0, 0, 0]
+
+
+def test_palabras_distintivas_quita_las_comunes():
+    assert palabras_distintivas("Agencia de Viajes Patagonia SRL") == ["patagonia"]
+    assert palabras_distintivas("Viajes y Turismo") == ["viajes", "y", "turismo"]  # Solo comunes: se dejan todas
+
+
+def test_bloques_por_correo_telefono_y_palabra():
+    deduplicador = Deduplicador()
+    firmas, _ = deduplicador._firmas([
+        agencia("Patagonia Viajes", "info@patagonia.com.ar"),
+        agencia("Lagos del Sur", "INFO@patagonia.com.ar", "(0294) 442-3000"),
+        agencia("Sur Andino", "", "+54 294 442 3000"),
+        agencia("Norte Andino"),
+        agencia("Mar y Sol"),
+    ])
+    bloques = sorted(sorted(b) for b in deduplicador._bloques(firmas))
+    # correo (0, 1), teléfono (1, 2), "sur" (1, 2) y "andino" (2, 3); las palabras cortas y los bloques
+    # de un solo elemento no forman bloques
+    assert bloques == [[0, 1], [1, 2], [1, 2], [2, 3]]
+
+
+def test_los_bloques_demasiado_grandes_se_omiten():
+    deduplicador = Deduplicador(max_bloque=3)
+    firmas, _ = deduplicador._firmas([agencia(f"Agencia {i}", "comun@correo.com") for i in range(4)])
+    assert deduplicador._bloques(firmas) == []
+
+
+def test_misma_agencia_con_otro_formato_en_otra_provincia():
+    filas = [
+        agencia("Viajes Patagonia S.R.L.", "INFO@patagonia.com.ar", "(0294) 442-3000", "Bariloche", "Río Negro"),
+        agencia("Patagonia Viajes", "info@patagonia.com.ar", "+54 294 442 3000", "Bariloche", "Neuquén"),
+        agencia("Mar y Sol Turismo", "ventas@marysol.com", "(0223) 491-0000", "Mar del Plata", "Buenos Aires"),
+    ]
+    assert Deduplicador().agrupar(filas) == [0, 0, 1]
+
+
+def test_homonimas_sin_contacto_en_comun_son_distintas():
+    filas = [
+        agencia("Andes Travel", "andes@mendoza.com", "(0261) 420-0000", "Mendoza", "Mendoza"),
+        agencia("Andes Travel", "andes@salta.com", "(0387) 421-0000", "Salta", "Salta"),
+    ]
+    assert Deduplicador().agrupar(filas) == [0, 1]
+
+
+def test_misma_localidad_exige_que_se_parezca_el_nombre_completo():
+    deduplicador = Deduplicador()
+    filas = [
+        agencia("Tucumán Tour Travel", "a@tucumantour.com", localidad="San Miguel de Tucumán"),
+        agencia("Turismo del Tucumán", "b@turismotucuman.com", localidad="San Miguel de Tucumán"),
+        agencia("Tucuman Tour & Travel", "c@otro.com", localidad="San Miguel de Tucumán"),
+    ]
+    assert deduplicador.agrupar(filas) == [0, 1, 0]
+
+
+@pytest.mark.parametrize("correo_b, telefono_b, esperado", [
+    ("info@andes.com", "(0261) 420-0000", True),   # Mismo correo y teléfono: alcanza aunque el nombre cambie
+    ("info@andes.com", "", False),                 # Solo el correo en común y nombres distintos
+    ("otro@andes.com", "(0261) 420-0000", False),  # Solo el teléfono en común y nombres distintos
+])
+def test_es_duplicado_con_nombres_distintos(correo_b, telefono_b, esperado):
+    deduplicador = Deduplicador()
+    firmas, _ = deduplicador._firmas([
+        agencia("Andes Travel", "info@andes.com", "(0261) 420-0000", "Mendoza"),
+        agencia("Cuyo Aventura", correo_b, telefono_b, "Godoy Cruz"),
+    ])
+    assert deduplicador.es_duplicado(*firmas) is esperado
+
+
+def test_agrupar_es_transitivo_y_las_filas_repetidas_comparten_firma():
+    filas = [
+        agencia("Iguazú Aventura", "info@iguazu.com", "", "Puerto Iguazú", "Misiones"),
+        agencia("Iguazu Aventuras", "info@iguazu.com", "(03757) 42-1000", "Puerto Iguazú", "Misiones"),
+        agencia("Aventura Iguazú", "reservas@iguazu.com", "+54 3757 421000", "Posadas", "Corrientes"),
+        agencia("Iguazú Aventura", "info@iguazu.com", "", "Puerto Iguazú", "Misiones"),  # Otra corrida
+    ]
+    deduplicador = Deduplicador()
+    grupos = deduplicador.agrupar(filas)
+    assert grupos == [0, 0, 0, 0]
+    assert deduplicador.estadisticas["firmas"] == 3
+    canonico, = registros_canonicos(filas, grupos)
+    assert canonico["correo"] == "info@iguazu.com"
+    assert canonico["provincias"] == "Corrientes | Misiones"
+    assert canonico["registros"] == 4
+
+
+def test_similitud_respeta_el_umbral_indicado():
+    assert similitud_nombres("azul costa", "azul costa norte") == 0.0  # Por debajo del umbral por defecto
+    assert similitud_nombres("azul costa", "azul costa norte", umbral=0.7) == pytest.approx(20 / 26)
+
+
+def test_un_umbral_menor_une_nombres_menos_parecidos():
+    filas = [
+        agencia("Costa Azul", "reservas@costaazul.com.ar", localidad="Villa Gesell"),
+        agencia("Costa Azul Norte", "reservas@costaazul.com.ar", localidad="Pinamar"),
+    ]
+    assert Deduplicador().agrupar(filas) == [0, 1]
+    assert Deduplicador(umbral=0.7).agrupar(filas) == [0, 0]
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from escenarios import analizar, leer_posiciones, resumen_estrategias
+from estrategias import Estrategia, Pata
+
+
+@pytest.fixture
+def posiciones():
+    """Cartera de estrategias de 1 a 4 patas (las matrices se completan con patas de 0 contratos)."""
+    generador = np.random.default_rng(11)
+    filas = []
+    for id_estrategia in range(23):
+        for _ in range(generador.integers(1, 5)):
+            filas.append({
+                "id_estrategia": f"E{id_estrategia:02d}",
+                "tipo": generador.choice(["call", "put"]),
+                "posicion": generador.choice(["compra", "venta"]),
+                "strike": float(generador.integers(80, 121)),
+                "prima": round(float(generador.uniform(0.5, 10)), 2),
+                "contratos": int(generador.integers(1, 4)),
+                "volatilidad": float(generador.choice([np.nan, 0.25, 0.5])),
+            })
+    return pd.DataFrame(filas)
+
+
+def resultados_por_estrategia(posiciones, puntos, margen, volatilidad, dias):
+    """Lo mismo que analizar, estrategia por estrategia con el motor de estrategias."""
+    tablas = []
+    for id_estrategia, grupo in posiciones.groupby("id_estrategia", sort=True):
+        estrategia = Estrategia([Pata(p.tipo, p.posicion, p.strike, p.prima, p.contratos,
+                                      None if np.isnan(p.volatilidad) else p.volatilidad)
+                                 for p in grupo.itertuples(index=False)])
+        precios = np.linspace(grupo["strike"].min() * (1 - margen), grupo["strike"].max() * (1 + margen), puntos)
+        tablas.append(pd.DataFrame({
+            "id_estrategia": id_estrategia,
+            "precio_sub": precios,
+            "resultado": estrategia.payoff(precios),
+            "resultado_hoy": estrategia.resultado_teorico(precios, volatilidad, dias / 365),
+        }))
+    return pd.concat(tablas, ignore_index=True)
+
+
+@pytest.mark.parametrize("estrategias_por_bloque", [1, 5, 2000])
+def test_analizar_coincide_con_el_calculo_por_estrategia(posiciones, estrategias_por_bloque):
+    tabla = analizar(posiciones, puntos=50, margen=0.2, volatilidad=0.3, dias=30,
+                     estrategias_por_bloque=estrategias_por_bloque)
+    esperada = resultados_por_estrategia(posiciones, 50, 0.2, 0.3, 30)
+    pd.testing.assert_frame_equal(tabla, esperada, check_exact=False, rtol=1e-9, atol=1e-9)
+
+
+def test_sin_volatilidad_no_hay_resultado_hoy(posiciones):
+    tabla = analizar(posiciones, puntos=10)
+    assert list(tabla.columns) == ["id_estrategia", "precio_sub", "resultado"]
+    assert len(tabla) == 10 * posiciones["id_estrategia"].nunique()
+
+
+def test_resumen_por_estrategia(posiciones):
+    resumen = resumen_estrategias(posiciones).set_index("id_estrategia")
+    for id_estrategia, grupo in posiciones.groupby("id_estrategia"):
+        estrategia = Estrategia([Pata(p.tipo, p.posicion, p.strike, p.prima, p.contratos)
+                                 for p in grupo.itertuples(index=False)])
+        assert (resumen.loc[id_estrategia, "perdida_maxima"], resumen.loc[id_estrategia, "ganancia_maxima"]) == \
+            estrategia.resultado_extremo()
+
+
+def test_leer_posiciones_normaliza_y_valida(tmp_path):
+    ruta = tmp_path / "posiciones.csv"
+    ruta.write_text("id_estrategia,tipo,posicion,strike,prima\n1, CALL ,Compra,100,5\n", encoding="utf-8")
+    posiciones = leer_posiciones(str(ruta))
+    assert posiciones.loc[0, ["tipo", "posicion", "contratos"]].tolist() == ["call", "compra", 1]
+    assert np.isnan(posiciones.loc[0, "volatilidad"])
+
+    ruta.write_text("id_estrategia,tipo,posicion,strike,prima\n1,call,alquiler,100,5\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Posición inválida"):
+        leer_posiciones(str(ruta))
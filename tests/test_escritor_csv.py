@@ -0,0 +1,74 @@
+import asyncio
+import csv
+import random
+
+import pytest
+
+from escritor_csv import EscritorCSV
+
+COLUMNAS = ["nombre", "telefono"]
+
+
+def leer(ruta):
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        return list(csv.DictReader(archivo))
+
+
+def test_escribir_en_orden_con_tareas_concurrentes_da_el_mismo_csv_que_en_secuencia(tmp_path):
+    filas = [{"nombre": f"Hotel {i}", "telefono": str(i)} if i % 7 else None for i in range(200)]  # None: hotel que falló
+    orden = list(range(len(filas)))
+    random.Random(5).shuffle(orden)
+    ruta = tmp_path / "hoteles.csv"
+
+    async def correr():
+        async with EscritorCSV(str(ruta), COLUMNAS) as escritor:
+            async def escribir(posicion):
+                await asyncio.sleep(random.Random(posicion).random() / 1000)
+                await escritor.escribir_en_orden(posicion, filas[posicion])
+            await asyncio.gather(*(escribir(p) for p in orden))
+        return escritor.filas_escritas
+
+    assert asyncio.run(correr()) == len([f for f in filas if f])
+    assert leer(ruta) == [f for f in filas if f]
+
+
+def test_posiciones_que_nunca_llegan_no_pierden_las_filas_siguientes(tmp_path):
+    ruta = tmp_path / "hoteles.csv"
+
+    async def correr():
+        async with EscritorCSV(str(ruta), COLUMNAS) as escritor:
+            await escritor.escribir_en_orden(2, {"nombre": "C", "telefono": "3"})
+            await escritor.escribir_en_orden(0, {"nombre": "A", "telefono": "1"})
+            # La posición 1 nunca llega: al cerrar se escribe lo pendiente en orden de posición
+
+    asyncio.run(correr())
+    assert [f["nombre"] for f in leer(ruta)] == ["A", "C"]
+
+
+def test_si_la_ejecucion_se_corta_el_csv_anterior_queda_intacto(tmp_path):
+    ruta = tmp_path / "agencias.csv"
+    ruta.write_text("nombre,telefono\nAnterior,1\n", encoding="utf-8")
+
+    async def correr():
+        async with EscritorCSV(str(ruta), COLUMNAS) as escritor:
+            await escritor.escribir([{"nombre": "Nueva", "telefono": "2", "columna_extra": "x"}])
+            raise TimeoutError("corte")
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(correr())
+    assert leer(ruta) == [{"nombre": "Anterior", "telefono": "1"}]
+    assert leer(tmp_path / "agencias.parcial.csv") == [{"nombre": "Nueva", "telefono": "2"}]
+
+
+def test_al_terminar_bien_reemplaza_el_csv(tmp_path):
+    ruta = tmp_path / "sub" / "agencias.csv"
+
+    async def correr():
+        async with EscritorCSV(str(ruta), COLUMNAS) as escritor:
+            await escritor.escribir([{"nombre": "A", "telefono": "1"}])
+            await escritor.escribir([])
+            await escritor.escribir([{"nombre": "B", "telefono": "2"}])
+
+    asyncio.run(correr())
+    assert [f["nombre"] for f in leer(ruta)] == ["A", "B"]
+    assert not (tmp_path / "sub" / "agencias.parcial.csv").exists()
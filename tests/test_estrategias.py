@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+import estrategias
+from estrategias import Estrategia, Pata
+
+ESTRATEGIAS = {
+    "compra_call": estrategias.compra_call(100, 5, 2),
+    "venta_put": estrategias.venta_put(95, 3),
+    "bull_spread": estrategias.bull_spread((95, 105), (7, 3)),
+    "bear_spread": estrategias.bear_spread((95, 105), (3, 7)),
+    "straddle_venta": estrategias.straddle(100, 5, 4, posicion="venta"),
+    "strangle": estrategias.strangle((90, 110), (2, 2.5)),
+    "mariposa": estrategias.mariposa((90, 100, 110), (12, 5, 1.5)),
+    "iron_condor": estrategias.iron_condor((80, 90, 110, 120), (1, 2.5, 2.5, 1)),
+    "ratio": Estrategia([Pata("call", "compra", 100, 5), Pata("call", "venta", 110, 2, 3), Pata("put", "compra", 90, 1)]),
+}
+
+
+def payoff_con_bucle(estrategia, precios):
+    """Payoff precio por precio y pata por pata, como lo calculaban los scripts originales."""
+    resultados = []
+    for precio in precios:
+        total = 0.0
+        for pata in estrategia.patas:
+            intrinseco = max(0.0, precio - pata.strike) if pata.tipo == "call" else max(0.0, pata.strike - precio)
+            total += (intrinseco - pata.prima) * pata.factor
+        resultados.append(total)
+    return np.array(resultados)
+
+
+def grilla_densa(estrategia):
+    """Grilla fina corrida para no caer justo en un strike ni en un punto de equilibrio."""
+    return np.linspace(0, 3 * estrategia.quiebres().max(), 300_001) + np.pi * 1e-5
+
+
+@pytest.mark.parametrize("nombre", ESTRATEGIAS)
+def test_payoff_vectorizado_coincide_con_el_bucle(nombre):
+    estrategia = ESTRATEGIAS[nombre]
+    precios = np.concatenate((np.linspace(0, 250, 1001), estrategia.quiebres()))
+    np.testing.assert_allclose(estrategia.payoff(precios), payoff_con_bucle(estrategia, precios), atol=1e-12)
+
+
+@pytest.mark.parametrize("nombre", ESTRATEGIAS)
+def test_puntos_de_equilibrio_exactos(nombre):
+    estrategia = ESTRATEGIAS[nombre]
+    raices = estrategia.puntos_equilibrio()
+    np.testing.assert_allclose(estrategia.payoff(raices), 0, atol=1e-9)
+
+    # Mismos puntos que los cambios de signo en una grilla densa (a menos de un paso de la grilla)
+    precios = grilla_densa(estrategia)
+    valores = estrategia.payoff(precios)
+    cambios = precios[1:][np.sign(valores[1:]) != np.sign(valores[:-1])]
+    assert len(raices) == len(cambios)
+    np.testing.assert_allclose(np.sort(raices), cambios, atol=precios[1] - precios[0])
+
+
+def test_puntos_de_equilibrio_conocidos():
+    np.testing.assert_allclose(ESTRATEGIAS["compra_call"].puntos_equilibrio(), [105])
+    np.testing.assert_allclose(ESTRATEGIAS["bull_spread"].puntos_equilibrio(), [99])  # Strike bajo + débito neto
+    np.testing.assert_allclose(ESTRATEGIAS["straddle_venta"].puntos_equilibrio(), [91, 109])
+    assert len(Estrategia().puntos_equilibrio()) == 0
+
+
+@pytest.mark.parametrize("nombre", ESTRATEGIAS)
+def test_resultado_extremo_coincide_con_la_grilla(nombre):
+    estrategia = ESTRATEGIAS[nombre]
+    minimo, maximo = estrategia.resultado_extremo()
+    valores = estrategia.payoff(grilla_densa(estrategia))
+    _, derecha = estrategia.pendientes_extremas()
+    if derecha < 0:
+        assert minimo == -np.inf
+    else:
+        assert minimo == pytest.approx(valores.min(), abs=1e-2)  # A menos de un paso de la grilla
+    if derecha > 0:
+        assert maximo == np.inf
+    else:
+        assert maximo == pytest.approx(valores.max(), abs=1e-2)
+
+
+def test_resultado_extremo_conocido():
+    assert ESTRATEGIAS["bull_spread"].resultado_extremo() == (-4.0, 6.0)
+    assert ESTRATEGIAS["venta_put"].resultado_extremo() == (-92.0, 3.0)  # Pérdida máxima con el subyacente en 0
+    assert ESTRATEGIAS["compra_call"].resultado_extremo() == (-10.0, np.inf)
+    assert ESTRATEGIAS["ratio"].resultado_extremo()[0] == -np.inf
+
+
+def test_quiebres_ordenados_y_sin_repetir():
+    np.testing.assert_array_equal(ESTRATEGIAS["straddle_venta"].quiebres(), [100])
+    np.testing.assert_array_equal(ESTRATEGIAS["iron_condor"].quiebres(), [80, 90, 110, 120])
+
+
+def test_resultado_teorico_al_vencimiento_es_el_payoff():
+    estrategia = ESTRATEGIAS["iron_condor"]
+    precios = np.linspace(60, 140, 81)
+    np.testing.assert_allclose(estrategia.resultado_teorico(precios, 0.3, 0.0), estrategia.payoff(precios), atol=1e-12)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+import estrategias
+from grilla_precios import SEPARACION_MINIMA, grilla_precios, puntos_clave, refinar
+
+ESTRATEGIA = estrategias.iron_condor((3700, 3850, 3950, 4100), (20, 60, 55, 18))
+
+
+def test_grilla_sin_paso_reproduce_el_payoff_exacto():
+    precios = grilla_precios(ESTRATEGIA, 3000, 5000)
+    np.testing.assert_array_equal(precios, np.unique(np.concatenate(([3000, 5000], puntos_clave(ESTRATEGIA)))))
+    densos = np.linspace(3000, 5000, 20_001)
+    np.testing.assert_allclose(np.interp(densos, precios, ESTRATEGIA.payoff(precios)), ESTRATEGIA.payoff(densos),
+                               atol=1e-9)
+
+
+def test_grilla_con_paso_incluye_los_puntos_clave_y_separa_los_regulares():
+    precios = grilla_precios(ESTRATEGIA, 3000, 5000, paso=100, origen=3010)
+    claves = puntos_clave(ESTRATEGIA, 3000, 5000)
+    assert set(claves) <= set(precios)
+    regulares = np.setdiff1d(precios, np.concatenate((claves, [3000, 5000])))
+    np.testing.assert_allclose((regulares - 3010) % 100, 0, atol=1e-6)  # Múltiplos del paso desde el origen
+    distancia = np.abs(regulares[:, None] - claves[None, :]).min(axis=1)
+    assert (distancia >= SEPARACION_MINIMA * 100).all()
+
+
+def refinar_recursivo(funcion, desde, hasta, tolerancia, paso_minimo):
+    """Bisección tramo por tramo (recursiva), sin límite de puntos: la referencia de refinar."""
+    medio = 0.5 * (desde + hasta)
+    error = abs(funcion(medio) - 0.5 * (funcion(desde) + funcion(hasta)))
+    if error <= tolerancia or hasta - desde <= 2 * paso_minimo:
+        return [desde]
+    return refinar_recursivo(funcion, desde, medio, tolerancia, paso_minimo) + \
+        refinar_recursivo(funcion, medio, hasta, tolerancia, paso_minimo)
+
+
+@pytest.mark.parametrize("tolerancia, paso_minimo", [(0.5, 0.0), (0.01, 0.0), (0.01, 5.0)])
+def test_refinar_coincide_con_la_biseccion_recursiva(tolerancia, paso_minimo):
+    def funcion(precios):
+        return ESTRATEGIA.resultado_teorico(precios, 0.3, 20 / 365)
+
+    iniciales = grilla_precios(ESTRATEGIA, 3000, 5000)
+    precios, valores = refinar(funcion, iniciales, tolerancia, paso_minimo)
+
+    esperados = [p for a, b in zip(iniciales[:-1], iniciales[1:])
+                 for p in refinar_recursivo(lambda x: float(funcion(np.array([x]))[0]), a, b, tolerancia, paso_minimo)]
+    np.testing.assert_allclose(precios, esperados + [iniciales[-1]])
+    np.testing.assert_allclose(valores, funcion(precios))
+
+
+def test_refinar_respeta_el_limite_de_puntos():
+    def funcion(precios):
+        return ESTRATEGIA.resultado_teorico(precios, 0.3, 20 / 365)
+
+    precios, valores = refinar(funcion, [3000, 5000], 1e-9, max_puntos=50)
+    assert len(precios) == 50 and len(valores) == 50
+    assert (np.diff(precios) > 0).all()
@@ -0,0 +1,154 @@
+import asyncio
+import csv
+import json
+import os
+
+import pytest
+
+import motor_http
+import servidor_fixtures
+import web_scraping_ahtra
+from conftest import CARPETA_FIXTURES
+from indice_cambios import IndiceCambios, calcular_hash, hash_hotel
+
+URL_A, URL_B, URL_C = (f"https://www.ahtra.com.ar/hoteles_hotel.php?fil=1&id={i}" for i in (1, 2, 3))
+
+
+def hotel(url, nombre):
+    return {"nombre": nombre, "direccion": "", "telefono": "", "email": "", "sitio_web": "", "url": url}
+
+
+@pytest.fixture
+def indice(tmp_path):
+    indice = IndiceCambios(str(tmp_path / "indices" / "filial.json"))
+    indice.entradas = {
+        URL_A: {"hash_tarjeta": calcular_hash("tarjeta a"), "etag": '"a1"', "last_modified": "", "hash_contenido": "x"},
+        URL_B: {"hash_tarjeta": calcular_hash("tarjeta b"), "etag": "", "last_modified": "", "hash_contenido": "y"},
+        URL_C: {"hash_tarjeta": calcular_hash("tarjeta c"), "etag": "", "last_modified": "", "hash_contenido": "z"},
+    }
+    return indice
+
+
+def test_clasificar_separa_sin_cambios_condicionales_y_nuevos(indice):
+    existentes = {URL_A: hotel(URL_A, "A"), URL_B: hotel(URL_B, "B")}
+    url_nueva = URL_A.replace("id=1", "id=9")
+    tarjetas = [(URL_A, "tarjeta a"), (URL_B, "tarjeta b"), (URL_C, "tarjeta c"), (url_nueva, "tarjeta nueva")]
+
+    sin_cambios, encabezados = indice.clasificar(tarjetas, existentes)
+    # A tiene ETag: se verifica con una request condicional. B no tiene validadores: se conserva. C no tiene fila
+    # en el CSV y la nueva no está en el índice: se descargan.
+    assert sin_cambios == [URL_B]
+    assert encabezados == {URL_A: {"If-None-Match": '"a1"'}}
+
+    sin_cambios, encabezados = indice.clasificar(tarjetas, existentes, condicional=False)
+    assert sin_cambios == [URL_A, URL_B] and encabezados == {}
+
+    sin_cambios, _ = indice.clasificar([(URL_B, "tarjeta b cambiada")], existentes)
+    assert sin_cambios == []
+
+
+def test_actualizar_cuenta_cambios_y_deja_fuera_los_que_fallaron(indice):
+    tarjetas = [(URL_A, "tarjeta a"), (URL_B, "tarjeta b"), (URL_C, "tarjeta c"), (URL_C + "0", "nueva")]
+    hashes = {URL_A: "x", URL_B: "otro", URL_C + "0": "w"}  # URL_C no se pudo leer
+    conteo = indice.actualizar(tarjetas, hashes, {URL_B: {"etag": '"b2"'}})
+
+    assert conteo == {"nuevos": 1, "modificados": 1, "sin_cambios": 1, "eliminados": 0}
+    assert set(indice.entradas) == {URL_A, URL_B, URL_C + "0"}
+    assert indice.entradas[URL_A]["etag"] == '"a1"'  # Se mantiene el ETag anterior si no hubo descarga
+    assert indice.entradas[URL_B]["etag"] == '"b2"'
+
+    conteo = indice.actualizar([(URL_A, "tarjeta a")], {URL_A: "x"}, {})
+    assert conteo["eliminados"] == 2
+
+
+def test_guardar_y_volver_a_cargar(indice):
+    indice.guardar()
+    assert IndiceCambios(indice.ruta).entradas == indice.entradas
+
+
+# Modo delta completo contra el servidor de fichas guardadas
+
+@pytest.fixture(scope="module")
+def base_url():
+    servidor = servidor_fixtures.iniciar()
+    yield f"http://127.0.0.1:{servidor.server_port}/"
+    servidor.shutdown()
+    servidor.server_close()
+
+
+@pytest.fixture
+def esperado(base_url):
+    with open(os.path.join(CARPETA_FIXTURES, "ahtra", "esperado.csv"), newline="", encoding="utf-8") as archivo:
+        filas = list(csv.DictReader(archivo))
+    for fila in filas:
+        fila["url"] = base_url + fila["url"]
+    return filas
+
+
+@pytest.fixture
+def resultados(tmp_path, monkeypatch):
+    monkeypatch.setattr(web_scraping_ahtra, "directorio_resultados", lambda: str(tmp_path))
+    return tmp_path
+
+
+def playwright_falso(esperado, falla=False, listado_vacio=False):
+    """Reemplazo de obtener_hoteles_playwright: lee la ficha que arma JavaScript desde esperado, o falla."""
+    por_url = {fila["url"]: fila for fila in esperado}
+
+    async def obtener(listado_url, base_url, links, cantidad_paginas, bloquear_recursos, hechos, al_completar,
+                      preparar=None):
+        if links is None:  # Lectura del listado con el navegador
+            return [] if listado_vacio else None
+        for link in links:
+            if not falla:
+                await al_completar(link, por_url[link])
+    return obtener
+
+
+def leer_csv(ruta):
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        return list(csv.DictReader(archivo))
+
+
+def correr(base_url, delta=True):
+    asyncio.run(web_scraping_ahtra.navegar_hoteles(1, 4, "http", base_url, bloquear_recursos=False, delta=delta))
+
+
+def test_delta_conserva_la_fila_anterior_de_los_hoteles_que_fallan(base_url, esperado, resultados, monkeypatch):
+    monkeypatch.setattr(web_scraping_ahtra, "obtener_hoteles_playwright", playwright_falso(esperado))
+    correr(base_url)
+    ruta_csv = resultados / f"{web_scraping_ahtra.nombre_base_filial(1)}.csv"
+    ruta_indice = resultados / "indices" / f"{web_scraping_ahtra.nombre_base_filial(1)}.json"
+    assert leer_csv(ruta_csv) == esperado
+
+    # La tarjeta de la ficha JavaScript cambió: hay que volver a leerla, y esta vez el navegador falla
+    url_js = esperado[3]["url"]
+    entradas = json.loads(ruta_indice.read_text(encoding="utf-8"))
+    entradas[url_js]["hash_tarjeta"] = "cambiada"
+    ruta_indice.write_text(json.dumps(entradas), encoding="utf-8")
+    monkeypatch.setattr(web_scraping_ahtra, "obtener_hoteles_playwright", playwright_falso(esperado, falla=True))
+    correr(base_url)
+
+    assert leer_csv(ruta_csv) == esperado  # La fila del hotel que falló sigue en su lugar
+    indice = json.loads(ruta_indice.read_text(encoding="utf-8"))
+    assert set(indice) == {fila["url"] for fila in esperado[:3]}  # Fuera del índice para reintentarlo
+    assert indice[esperado[0]["url"]]["hash_contenido"] == hash_hotel(esperado[0])
+
+
+def test_listado_vacio_no_reemplaza_el_csv_ni_el_indice(base_url, esperado, resultados, monkeypatch):
+    monkeypatch.setattr(web_scraping_ahtra, "obtener_hoteles_playwright", playwright_falso(esperado))
+    correr(base_url)
+    ruta_csv = resultados / f"{web_scraping_ahtra.nombre_base_filial(1)}.csv"
+    ruta_indice = resultados / "indices" / f"{web_scraping_ahtra.nombre_base_filial(1)}.json"
+    csv_anterior, indice_anterior = ruta_csv.read_bytes(), ruta_indice.read_bytes()
+
+    async def sin_tarjetas(cliente, base_url, listado_url):
+        return []
+
+    monkeypatch.setattr(motor_http, "obtener_tarjetas", sin_tarjetas)
+    monkeypatch.setattr(web_scraping_ahtra, "obtener_hoteles_playwright", playwright_falso(esperado, listado_vacio=True))
+    correr(base_url)
+
+    assert ruta_csv.read_bytes() == csv_anterior
+    assert ruta_indice.read_bytes() == indice_anterior
+    assert not os.path.exists(str(ruta_csv).replace(".csv", ".parcial.csv"))
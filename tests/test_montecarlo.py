@@ -0,0 +1,36 @@
+import argparse
+
+import numpy as np
+import pytest
+
+from estrategias import compra_call
+from montecarlo import entero_positivo, resumir, simular_resultado
+
+
+def test_simular_resultado_rechaza_cero_simulaciones():
+    with pytest.raises(ValueError, match="mayor que 0"):
+        simular_resultado(compra_call(100, 5, 1), 100, 0.3, 30 / 365, 0, procesos=1)
+
+
+def test_resumir_sin_resultados_da_un_error_claro():
+    with pytest.raises(ValueError, match="al menos una trayectoria"):
+        resumir(np.array([], dtype=np.float32))
+
+
+def test_resumir_una_sola_trayectoria():
+    resumen = resumir(np.array([-3.0], dtype=np.float32))
+    assert resumen["simulaciones"] == 1
+    assert resumen["var"] == resumen["cvar"] == 3.0
+
+
+@pytest.mark.parametrize("texto", ["0", "-5"])
+def test_entero_positivo_rechaza_cero_y_negativos(texto):
+    with pytest.raises(argparse.ArgumentTypeError):
+        entero_positivo(texto)
+
+
+def test_misma_semilla_da_el_mismo_resultado():
+    estrategia = compra_call(100, 5, 1)
+    a = simular_resultado(estrategia, 100, 0.3, 30 / 365, 5_000, semilla=7, procesos=1, tamano_bloque=1_000)
+    b = simular_resultado(estrategia, 100, 0.3, 30 / 365, 5_000, semilla=7, procesos=1, tamano_bloque=1_000)
+    assert a == b
@@ -0,0 +1,156 @@
+import asyncio
+import csv
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+import motor_http
+import servidor_fixtures
+import web_scraping_ahtra
+from conftest import CARPETA_FIXTURES
+
+CARPETA_AHTRA = os.path.join(CARPETA_FIXTURES, "ahtra")
+IDS_HTML = ["541", "552", "573"]  # Fichas con los datos en el HTML
+ID_JAVASCRIPT = "384"  # Ficha que arma JavaScript: el motor HTTP la deja para Playwright
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    servidor = servidor_fixtures.iniciar()
+    yield f"http://127.0.0.1:{servidor.server_port}/"
+    servidor.shutdown()
+    servidor.server_close()
+
+
+@pytest.fixture(scope="module")
+def esperado(base_url):
+    """id -> fila esperada (la misma que guardaba el scraper con Playwright), con la URL del servidor local."""
+    with open(os.path.join(CARPETA_AHTRA, "esperado.csv"), newline="", encoding="utf-8") as archivo:
+        filas = list(csv.DictReader(archivo))
+    for fila in filas:
+        fila["url"] = base_url + fila["url"]
+    return {fila["url"].rsplit("=", 1)[1]: fila for fila in filas}
+
+
+def leer_fixture(nombre):
+    with open(os.path.join(CARPETA_AHTRA, nombre), encoding="utf-8") as archivo:
+        return archivo.read()
+
+
+def test_servidor_elige_el_archivo_por_la_query_string():
+    assert servidor_fixtures.archivo_para("/hoteles_hotel.php?fil=1&id=541").endswith("hoteles_hotel_541.html")
+    assert servidor_fixtures.archivo_para("/hoteles_hotel.php?fil=1&id=552").endswith("hoteles_hotel_552.html")
+    assert servidor_fixtures.archivo_para("/hoteles_asociados.php?fil=1").endswith("hoteles_asociados_1.html")
+    assert servidor_fixtures.archivo_para("/hoteles_hotel.php?fil=1&id=999") is None
+    assert servidor_fixtures.archivo_para("/hoteles_hotel.php?id=../conftest") is None
+
+
+def test_parsear_tarjetas_devuelve_links_absolutos_en_orden(base_url):
+    tarjetas = motor_http.parsear_tarjetas(leer_fixture("hoteles_asociados_1.html"), base_url)
+    assert [link for link, _ in tarjetas] == [
+        f"{base_url}hoteles_hotel.php?fil=1&id={id_hotel}" for id_hotel in ["541", "552", "573", "384"]
+    ]
+    assert tarjetas[0][1] == "hoteles_hotel.php?fil=1&id=541|ÁGUILA MORA SUITES & SPA|imagenes/hoteles/541.jpg"
+
+
+@pytest.mark.parametrize("id_hotel", IDS_HTML)
+def test_parsear_hotel_da_los_mismos_campos_que_playwright(id_hotel, esperado):
+    url = esperado[id_hotel]["url"]
+    assert motor_http.parsear_hotel(leer_fixture(f"hoteles_hotel_{id_hotel}.html"), url) == esperado[id_hotel]
+
+
+def test_parsear_hotel_sin_el_nombre_en_el_html_devuelve_none():
+    assert motor_http.parsear_hotel(leer_fixture(f"hoteles_hotel_{ID_JAVASCRIPT}.html"), "url") is None
+
+
+@pytest.mark.parametrize("html, oculto", [
+    ('<p id="x">dato</p>', False),
+    ('<p id="x" style="display: none">dato</p>', True),
+    ('<p id="x" style="VISIBILITY:hidden">dato</p>', True),
+    ('<div style="display:none"><span><p id="x">dato</p></span></div>', True),
+    ('<div hidden><p id="x">dato</p></div>', True),
+    ('<div class="d-none"><p id="x">dato</p></div>', True),
+    ('<p id="x" class="texto invisible">dato</p>', True),
+    ('<div class="d-none d-md-block"><p id="x">dato</p></div>', False),
+    ('<div class="d-none d-md-none"><p id="x">dato</p></div>', True),
+])
+def test_oculto_reconoce_atributos_estilos_y_clases(html, oculto):
+    soup = BeautifulSoup(html, "html.parser")
+    assert motor_http.oculto(soup.find(id="x")) is oculto
+    assert (motor_http.texto_opcional(soup, "x") == motor_http.NO_DISPONIBLE) is oculto
+
+
+def test_obtener_hoteles_por_http_deja_para_playwright_la_ficha_sin_datos(base_url, esperado):
+    links = [esperado[id_hotel]["url"] for id_hotel in IDS_HTML + [ID_JAVASCRIPT]]
+
+    async def correr():
+        async with motor_http.crear_cliente(4) as cliente:
+            return await motor_http.obtener_hoteles(cliente, links, 4)
+
+    resultados = asyncio.run(correr())
+    assert resultados == [esperado[id_hotel] for id_hotel in IDS_HTML] + [None]
+
+
+def test_obtener_hotel_con_etag_conocido_devuelve_no_modificado(esperado):
+    url = esperado["541"]["url"]
+
+    async def correr():
+        async with motor_http.crear_cliente(1) as cliente:
+            _, metadatos = await motor_http.obtener_hotel(cliente, url)
+            return metadatos, await motor_http.obtener_hotel(cliente, url, {"If-None-Match": metadatos["etag"]})
+
+    metadatos, (hotel, _) = asyncio.run(correr())
+    assert metadatos["etag"]
+    assert hotel is motor_http.NO_MODIFICADO
+
+
+class EscritorEnMemoria:
+    def __init__(self):
+        self.filas = {}
+
+    async def escribir_en_orden(self, posicion, fila):
+        self.filas[posicion] = fila
+
+
+def test_scraper_usa_playwright_solo_para_las_fichas_que_fallan_por_http(base_url, esperado, monkeypatch):
+    enviados = []
+
+    async def playwright_falso(listado_url, base_url, links, cantidad_paginas, bloquear_recursos, hechos, al_completar,
+                               preparar=None):
+        enviados.extend(links)
+        for link in links:
+            await al_completar(link, esperado[link.rsplit("=", 1)[1]])
+
+    monkeypatch.setattr(web_scraping_ahtra, "obtener_hoteles_playwright", playwright_falso)
+    escritor = EscritorEnMemoria()
+    hechos, completo, tarjetas, _ = asyncio.run(
+        web_scraping_ahtra.obtener_hoteles(1, escritor, 4, "http", base_url, bloquear_recursos=False)
+    )
+
+    assert enviados == [esperado[ID_JAVASCRIPT]["url"]]
+    assert completo and len(hechos) == 4
+    assert [escritor.filas[i] for i in range(4)] == [esperado[i] for i in ["541", "552", "573", "384"]]
+
+
+def test_procesar_hotel_con_playwright_coincide_con_el_motor_http(base_url, esperado):
+    """Compara los dos motores sobre las mismas páginas (se saltea si Chromium no está instalado)."""
+    from playwright.async_api import async_playwright
+
+    async def correr():
+        async with async_playwright() as p:
+            try:
+                browser = await p.chromium.launch(headless=True)
+            except Exception as e:
+                pytest.skip(f"Chromium no disponible: {e}")
+            page = await browser.new_page()
+            try:
+                return {id_hotel: await web_scraping_ahtra.procesar_hotel(page, fila["url"]) for id_hotel, fila in esperado.items()}
+            finally:
+                await browser.close()
+
+    resultados = asyncio.run(correr())
+    assert resultados == esperado
+    for id_hotel in IDS_HTML:
+        html = leer_fixture(f"hoteles_hotel_{id_hotel}.html")
+        assert motor_http.parsear_hotel(html, esperado[id_hotel]["url"]) == resultados[id_hotel]
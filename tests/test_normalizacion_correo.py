@@ -0,0 +1,47 @@
+import csv
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import CARPETA_RNAV
+from normalizacion_correo import NormalizadorCorreos, normalizar_version_anterior
+
+CORREOS = [
+    "info@agencia.com.ar", " INFO@Agencia.com.ar ", "ventas(at)turismo.com", "reservas[arroba]viajes.com.ar",
+    "contactogmail.com", "contacto@gmail", "juan@hotmail", "pedroyahoo.com", "ana(arroba)yahoo",
+    "mail con espacios@dominio.com", "ñandú@viajes.com.ar", "sin arroba", "doble@@arroba.com", "@dominio.com",
+    "usuario@", "a@b", "gmail.com", "hotmail.comgmail.com", "x@gmail.com.ar", "", "info@agencia.com.ar",
+]
+
+
+def correos_de_resultados():
+    correos = []
+    for ruta in glob.glob(os.path.join(CARPETA_RNAV, "resultados", "*_agencias_viaje.csv")):
+        with open(ruta, newline="", encoding="utf-8") as archivo:
+            correos.extend(fila.get("correo") or "" for fila in csv.DictReader(archivo))
+    return correos
+
+
+@pytest.mark.parametrize("correos", [CORREOS, correos_de_resultados()], ids=["casos", "resultados"])
+def test_normalizar_lote_coincide_con_la_version_original(correos):
+    if not correos:
+        pytest.skip("No hay CSV de resultados")
+    normalizador = NormalizadorCorreos()
+    assert normalizador.normalizar_lote(correos) == [normalizar_version_anterior(c) for c in correos]
+    assert normalizador.cache_info().misses <= len(set(correos))
+
+
+def test_normalizar_lote_con_series_conserva_el_indice_y_los_vacios():
+    serie = pd.Series(["ventas(at)turismo.com", None, "contactogmail.com", "ventas(at)turismo.com"], index=[10, 11, 12, 13])
+    resultado = NormalizadorCorreos().normalizar_lote(serie)
+    pd.testing.assert_series_equal(
+        resultado, pd.Series(["ventas@turismo.com", "", "contacto@gmail.com", "ventas@turismo.com"], index=[10, 11, 12, 13]))
+
+
+def test_cada_valor_distinto_se_valida_una_sola_vez():
+    normalizador = NormalizadorCorreos()
+    normalizador.normalizar_lote(["a@agencia.com", "A@Agencia.com", "a@agencia.com"] * 100)
+    info = normalizador.cache_info()
+    assert info.misses == 1  # Las dos formas quedan iguales después de limpiar
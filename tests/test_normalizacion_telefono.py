@@ -0,0 +1,52 @@
+import pytest
+
+from normalizacion_telefono import FIJO, INVALIDO, MOVIL, VACIO, NormalizadorTelefonos, normalizar_telefono
+
+
+@pytest.mark.parametrize("telefono, esperado", [
+    # Formatos habituales del sitio
+    ("(011) 26187000", ("+541126187000", FIJO)),
+    ("(351) 15-388-4241", ("+5493513884241", MOVIL)),
+    ("(03518) 181677 / 181662", ("+543518181677", FIJO)),
+    ("(+549) 3435 136624", ("+5493435136624", MOVIL)),
+    ("(5411) 5075-0066", ("+541150750066", FIJO)),
+    ("(54) 01134888482", ("+541134888482", FIJO)),
+    ("+54 9 351 388-4241", ("+5493513884241", MOVIL)),
+    ("(15) 1159541376", ("+5491159541376", MOVIL)),
+    ("(11) 15-6515-8672", ("+5491165158672", MOVIL)),
+    # Áreas de 4 dígitos cuyo comienzo es un área de 3 (antes se tomaba la de 3 y el número quedaba inválido)
+    ("(2944) 15 123456", ("+5492944123456", MOVIL)),
+    ("(3489) 15-63-2011", ("+5493489632011", MOVIL)),
+    ("(03537) 15511146", ("+5493537511146", MOVIL)),
+    ("(2941) 46-3505", ("+542941463505", FIJO)),
+    # Número completo después del paréntesis: fijo con el 0 de larga distancia, celular sin el 0
+    ("(2901) 02901488787", ("+542901488787", FIJO)),
+    ("(0351) 03512273822", ("+543512273822", FIJO)),
+    ("(297) 02976251526", ("+542976251526", FIJO)),
+    ("(11) 1155286408", ("+5491155286408", MOVIL)),
+    ("(223) 223 6916505", ("+5492236916505", MOVIL)),
+    # Inválidos y vacíos
+    ("(353) 4615-5363", ("", INVALIDO)),
+    ("(11) 15 0123 4567", ("", INVALIDO)),
+    ("123", ("", INVALIDO)),
+    ("", ("", VACIO)),
+    ("sin teléfono", ("", VACIO)),
+])
+def test_normalizar_telefono(telefono, esperado):
+    assert normalizar_telefono(telefono) == esperado
+
+
+def test_normalizar_lote_procesa_cada_valor_distinto_una_vez():
+    normalizador = NormalizadorTelefonos()
+    numeros, estados = normalizador.normalizar_lote(["(011) 26187000", "(011) 26187000", "", None])
+    assert numeros == ["+541126187000", "+541126187000", "", ""]
+    assert estados == [FIJO, FIJO, VACIO, VACIO]
+    assert normalizador.cache_info().misses == 2
+
+
+def test_normalizar_lote_con_series_conserva_el_indice():
+    pd = pytest.importorskip("pandas")
+    serie = pd.Series(["(351) 15-388-4241", None], index=[10, 20])
+    numeros, estados = NormalizadorTelefonos().normalizar_lote(serie)
+    assert numeros.to_dict() == {10: "+5493513884241", 20: ""}
+    assert estados.to_dict() == {10: MOVIL, 20: VACIO}
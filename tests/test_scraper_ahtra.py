@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+import web_scraping_ahtra
+
+
+class PaginaFalsa:
+    """Página de Playwright mínima: la navegación falla para las URLs con "falla"; cerrada=True simula una página caída."""
+
+    def __init__(self, cerrada=False):
+        self.cerrada = cerrada
+        self.actual = None
+
+    async def goto(self, url, timeout=None):
+        if self.cerrada:
+            raise RuntimeError("Target page, context or browser has been closed")
+        if "falla" in url:
+            if "cierra" in url:
+                self.cerrada = True
+            raise TimeoutError(f"Timeout en {url}")
+        self.actual = url
+
+    async def content(self):
+        if self.cerrada:
+            raise RuntimeError("Target page, context or browser has been closed")
+        return f"<html>{self.actual}</html>"
+
+    def locator(self, selector):
+        return LocatorFalso(selector)
+
+    def is_closed(self):
+        return self.cerrada
+
+    async def close(self):
+        self.cerrada = True
+
+
+class LocatorFalso:
+    def __init__(self, selector):
+        self.selector = selector
+
+    async def is_visible(self):
+        return True
+
+    async def text_content(self):
+        return f" {self.selector} "
+
+
+class ContextoFalso:
+    def __init__(self):
+        self.paginas = []
+
+    async def new_page(self):
+        self.paginas.append(PaginaFalsa())
+        return self.paginas[-1]
+
+
+@pytest.fixture
+def resultados(tmp_path, monkeypatch):
+    monkeypatch.setattr(web_scraping_ahtra, "directorio_resultados", lambda: str(tmp_path))
+    return tmp_path
+
+
+def test_cada_hotel_que_falla_guarda_su_propio_html(resultados):
+    async def correr():
+        return await asyncio.gather(
+            web_scraping_ahtra.procesar_hotel(PaginaFalsa(), "https://x/hoteles_hotel.php?fil=1&id=541&falla"),
+            web_scraping_ahtra.procesar_hotel(PaginaFalsa(), "https://x/hoteles_hotel.php?fil=1&id=552&falla"),
+        )
+
+    assert asyncio.run(correr()) == [None, None]
+    assert sorted(p.name for p in (resultados / "depuracion").iterdir()) == [
+        "error_fil_1_id_541_falla.html", "error_fil_1_id_552_falla.html"]
+
+
+def test_una_pagina_caida_no_corta_la_filial(resultados):
+    links = [f"https://x/hoteles_hotel.php?fil=1&id={i}" for i in range(6)]
+    links[1] += "&falla&cierra"  # La página se cae: content() también falla
+    contexto = ContextoFalso()
+
+    hoteles = asyncio.run(web_scraping_ahtra.procesar_hoteles_en_paralelo(contexto, links, cantidad_paginas=2))
+
+    assert [h["url"] for h in hoteles] == links[:1] + links[2:]
+    assert len(contexto.paginas) == 3  # La página caída se reemplazó por una nueva
+    assert not (resultados / "depuracion").exists()  # Sin HTML para guardar, solo se informa el error
@@ -0,0 +1,136 @@
+import asyncio
+import os
+
+import pytest
+
+from conftest import CARPETA_RNAV, importar_script
+from normalizacion_correo import NormalizadorCorreos
+
+rnav = importar_script("web_scraping_rnav", os.path.join(CARPETA_RNAV, "web_scraping-rnav.py"))
+
+
+class LocalizadorVacio:
+    async def count(self):
+        return 0
+
+
+class PaginaFalsa:
+    """Página con una sola hoja de resultados y sin modal ni botón 'Siguiente'."""
+
+    def __init__(self, bloques):
+        self.bloques = bloques
+
+    async def evaluate(self, script):
+        return False
+
+    def locator(self, selector):
+        return LocalizadorVacio()
+
+
+class EscritorFalso:
+    def __init__(self):
+        self.filas = []
+
+    @property
+    def filas_escritas(self):
+        return len(self.filas)
+
+    async def escribir(self, filas):
+        self.filas.extend(filas)
+
+
+class DiarioFalso:
+    def __init__(self, entradas=()):
+        self.entradas = list(entradas)
+
+    def cargar(self):
+        return list(self.entradas)
+
+    def registrar(self, entrada):
+        self.entradas.append(entrada)
+
+
+def bloque(nombre, correo):
+    return {"nombre": nombre, "parrafos": ["Teléfono: (011) 4000-0000", f"Correo electrónico: {correo}", "Localidad: X"]}
+
+
+@pytest.fixture(autouse=True)
+def sin_busqueda(monkeypatch):
+    async def buscar_provincia(page, provincia):
+        return 0.0
+
+    async def extraer_pagina(page):
+        await asyncio.sleep(0)  # Cede el control como la evaluación real: la otra provincia avanza en el medio
+        return page.bloques
+
+    monkeypatch.setattr(rnav, "buscar_provincia", buscar_provincia)
+    monkeypatch.setattr(rnav, "extraer_pagina", extraer_pagina)
+    monkeypatch.setattr(rnav, "normalizador_correos", NormalizadorCorreos())
+
+
+def test_parsear_agencia_junta_el_correo_invalido_en_la_lista_recibida():
+    invalidos = []
+    agencia = rnav.parsear_agencia("Viajes Sur", bloque("Viajes Sur", "ventas arroba")["parrafos"], "Chubut", invalidos)
+    assert agencia["correo"] == ""
+    assert invalidos == [{"nombre_agencia": "Viajes Sur", "correo": "ventas arroba", "provincia": "Chubut"}]
+
+    valida = rnav.parsear_agencia("Norte", bloque("Norte", "INFO@Norte.com")["parrafos"], "Salta", invalidos)
+    assert valida["correo"] == "info@norte.com"
+    assert len(invalidos) == 1
+
+
+def test_diario_de_cada_provincia_guarda_solo_sus_correos_invalidos_en_paralelo():
+    paginas = {
+        "Chubut": PaginaFalsa([bloque("Viajes Sur", "sin correo"), bloque("Patagonia", "hola@patagonia.com")]),
+        "Salta": PaginaFalsa([bloque("Norte Andino", "norte(at)"), bloque("Cafayate", "mal correo")]),
+    }
+    diarios = {provincia: DiarioFalso() for provincia in paginas}
+
+    async def correr():
+        return await asyncio.gather(*(
+            rnav.extraer_agencias(pagina, provincia, EscritorFalso(), diarios[provincia])
+            for provincia, pagina in paginas.items()
+        ))
+
+    (cantidad_chubut, completa_chubut, invalidos_chubut), (_, _, invalidos_salta) = asyncio.run(correr())
+
+    assert cantidad_chubut == 2 and completa_chubut
+    assert [c["nombre_agencia"] for c in invalidos_chubut] == ["Viajes Sur"]
+    assert [c["nombre_agencia"] for c in invalidos_salta] == ["Norte Andino", "Cafayate"]
+    for provincia, diario in diarios.items():
+        registrados = diario.entradas[0]["correos_invalidos"]
+        assert {c["provincia"] for c in registrados} == {provincia}
+
+
+def test_reanudar_recupera_los_correos_invalidos_del_diario_sin_duplicarlos():
+    anterior = {
+        "pagina": 1,
+        "agencias": [{"nombre": "Viajes Sur", "telefono": "", "correo": "", "localidad": "", "provincia": "Chubut"}],
+        "correos_invalidos": [{"nombre_agencia": "Viajes Sur", "correo": "sin correo", "provincia": "Chubut"}],
+    }
+    diario = DiarioFalso([anterior])
+    escritor = EscritorFalso()
+
+    cantidad, completa, invalidos = asyncio.run(rnav.extraer_agencias(PaginaFalsa([]), "Chubut", escritor, diario))
+
+    assert (cantidad, completa) == (1, True)  # No hay página siguiente después del checkpoint
+    assert invalidos == anterior["correos_invalidos"]
+
+
+def test_verificar_entrega_trata_como_invalidos_los_dominios_sin_correo(monkeypatch):
+    from cache_correos import ResolvedorEstatico
+
+    monkeypatch.setattr(rnav, "resolvedor_entrega", ResolvedorEstatico({"agencia.com.ar": ["mx.agencia.com.ar"]}))
+    pagina = PaginaFalsa([bloque("Con MX", "ventas@agencia.com.ar"), bloque("Sin MX", "info@caido.com.ar")])
+
+    escritor = EscritorFalso()
+    _, _, invalidos = asyncio.run(rnav.extraer_agencias(pagina, "Jujuy", escritor, None))
+
+    assert [fila["correo"] for fila in escritor.filas] == ["ventas@agencia.com.ar", ""]
+    assert invalidos == [{"nombre_agencia": "Sin MX", "correo": "info@caido.com.ar", "provincia": "Jujuy"}]
+
+
+def test_sin_verificar_entrega_no_se_consultan_dominios(monkeypatch):
+    pagina = PaginaFalsa([bloque("Sin MX", "info@caido.com.ar")])
+    _, _, invalidos = asyncio.run(rnav.extraer_agencias(pagina, "Jujuy", EscritorFalso(), None))
+    assert rnav.resolvedor_entrega is None and invalidos == []
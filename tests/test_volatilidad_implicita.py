@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import black_scholes
+import volatilidad_implicita as vi
+from volatilidad_implicita import TOLERANCIA, sonrisa_volatilidad, volatilidad_implicita
+
+
+@pytest.mark.parametrize("tipo", ["call", "put"])
+@pytest.mark.parametrize("tasa, dividendo", [(0.0, 0.0), (0.05, 0.02)])
+def test_recupera_la_volatilidad_de_black_scholes(tipo, tasa, dividendo):
+    spot = 100.0
+    strikes = np.linspace(70, 130, 13)[:, None, None]
+    tiempos = np.array([7, 30, 90, 365])[None, :, None] / 365
+    volatilidades = np.array([0.1, 0.25, 0.5, 1.2])[None, None, :]
+    primas = black_scholes.precio(tipo, spot, strikes, volatilidades, tiempos, tasa, dividendo)
+
+    resultado = volatilidad_implicita(tipo, primas, spot, strikes, tiempos, tasa, dividendo)
+
+    assert resultado.shape == primas.shape
+    # Las opciones muy fuera del dinero tienen una prima casi nula que no identifica la volatilidad: se controla
+    # que la prima se reproduzca en todas y que el error de volatilidad no supere el que permite la tolerancia
+    # sobre la prima (tolerancia / vega)
+    vega = np.broadcast_to(black_scholes.griegas(tipo, spot, strikes, volatilidades, tiempos, tasa, dividendo)["vega"],
+                           primas.shape)
+    identificable = vega > 1e-4
+    assert identificable.sum() > primas.size // 2
+    np.testing.assert_allclose(
+        black_scholes.precio(tipo, spot, strikes, np.nan_to_num(resultado), tiempos, tasa, dividendo)[identificable],
+        primas[identificable], atol=1e-7)
+    error = np.abs(resultado - volatilidades)[identificable]
+    assert (error <= 2 * TOLERANCIA / vega[identificable] + 1e-9).all()
+
+
+def test_cadena_mezclada_de_calls_y_puts():
+    tipos = np.array(["call", "put", "call", "put"])
+    strikes = np.array([90.0, 95.0, 105.0, 110.0])
+    volatilidades = np.array([0.35, 0.3, 0.25, 0.4])
+    primas = black_scholes.precio(tipos, 100, strikes, volatilidades, 0.25, 0.03)
+    np.testing.assert_allclose(volatilidad_implicita(tipos, primas, 100, strikes, 0.25, 0.03), volatilidades, rtol=1e-6)
+
+
+@pytest.mark.parametrize("tipo, prima, tiempo", [
+    ("call", 9.0, 0.5),     # Menor que el valor intrínseco (spot 110, strike 100)
+    ("call", 111.0, 0.5),   # Mayor que el spot
+    ("put", 101.0, 0.5),    # Mayor que el strike
+    ("call", 12.0, 0.0),    # Opción vencida
+    ("call", np.nan, 0.5),  # Prima faltante
+])
+def test_primas_sin_solucion_devuelven_nan(tipo, prima, tiempo):
+    assert np.isnan(volatilidad_implicita(tipo, prima, 110, 100, tiempo))
+
+
+def test_tipo_de_opcion_invalido():
+    with pytest.raises(ValueError, match="Tipo de opción inválido"):
+        volatilidad_implicita("compra", 5.0, 100, 100, 0.5)
+
+
+def test_sonrisa_usa_los_dias_y_el_spot_de_cada_fila():
+    cadena = pd.DataFrame({"tipo": [" CALL", "put"], "strike": [100.0, 95.0], "dias": [30, 60], "spot": [100.0, 98.0]})
+    cadena["prima"] = black_scholes.precio(["call", "put"], cadena["spot"], cadena["strike"], [0.3, 0.45],
+                                           cadena["dias"] / 365)
+    sonrisa = sonrisa_volatilidad(cadena, spot=50, dias=1)
+    np.testing.assert_allclose(sonrisa["volatilidad_implicita"], [0.3, 0.45], rtol=1e-6)
+    np.testing.assert_allclose(sonrisa["moneyness"], [1.0, 95 / 98])
+    assert list(sonrisa["estado"]) == [vi.RESUELTA, vi.RESUELTA]
+
+
+def test_estado_de_cada_opcion():
+    tipos = ["call", "call", "call", "call", "put", "call"]
+    primas = [5.0, 9.0, 99.0, 4e-4, np.nan, 12.0]
+    tiempos = [0.5, 0.5, 1.0, 1.0, 0.5, 0.0]
+    spots = [100, 110, 100, 100, 100, 110]
+    volatilidades, estados = volatilidad_implicita(tipos, primas, spots, 100, tiempos, devolver_estado=True)
+    assert list(estados) == [vi.RESUELTA, vi.FUERA_DE_LIMITES, vi.SOBRE_MAXIMO, vi.BAJO_MINIMO, vi.DATOS_INVALIDOS,
+                             vi.DATOS_INVALIDOS]
+    assert volatilidades[0] > 0 and np.isnan(volatilidades[1:]).all()
+
+
+def test_solucion_mayor_al_maximo_no_se_informa_como_el_maximo():
+    # La prima de esta opción con volatilidad del 500% es 98.76: ninguna volatilidad del intervalo llega a 99
+    assert black_scholes.precio("call", 100, 100, vi.VOLATILIDAD_MAXIMA, 1.0) < 99
+    volatilidad, estado = volatilidad_implicita("call", 99.0, 100, 100, 1.0, devolver_estado=True)
+    assert np.isnan(volatilidad) and estado == vi.SOBRE_MAXIMO
+
+    # Justo debajo del máximo se sigue resolviendo
+    prima = black_scholes.precio("call", 100, 100, 4.9, 1.0)
+    volatilidad, estado = volatilidad_implicita("call", prima, 100, 100, 1.0, devolver_estado=True)
+    assert estado == vi.RESUELTA and volatilidad == pytest.approx(4.9, rel=1e-6)
+
+
+def test_sin_convergencia_se_distingue_de_fuera_de_limites():
+    prima = black_scholes.precio("put", 100, 90, 0.8, 0.1)
+    volatilidad, estado = volatilidad_implicita("put", prima, 100, 90, 0.1, max_iteraciones=1, devolver_estado=True)
+    assert np.isnan(volatilidad) and estado == vi.SIN_CONVERGENCIA
+
+    volatilidad, estado = volatilidad_implicita("put", prima, 100, 90, 0.1, devolver_estado=True)
+    assert estado == vi.RESUELTA and volatilidad == pytest.approx(0.8, rel=1e-6)
@@ -0,0 +1,93 @@
+# Índice de cambios para el modo delta del scraper de AHTRA.
+# Por cada hotel guarda un hash de su tarjeta en el listado, los encabezados ETag / Last-Modified
+# de su ficha y un hash de los datos extraídos. Con eso, en la siguiente corrida solo se descargan
+# los hoteles nuevos o cuya tarjeta cambió (y, si el servidor lo permite, se consulta la ficha con
+# una request condicional que responde 304 cuando no hubo cambios).
+
+import hashlib
+import json
+import os
+
+
+def calcular_hash(texto):
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:16]
+
+
+def hash_hotel(hotel):
+    """Hash de los datos extraídos de un hotel (independiente del orden de las columnas)."""
+    return calcular_hash(json.dumps(hotel, sort_keys=True, ensure_ascii=False))
+
+
+class IndiceCambios:
+    """Índice url -> {hash_tarjeta, etag, last_modified, hash_contenido} guardado en un archivo JSON."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.entradas = {}
+        if os.path.exists(ruta):
+            with open(ruta, encoding="utf-8") as f:
+                self.entradas = json.load(f)
+
+    def clasificar(self, tarjetas, existentes, condicional=True):
+        """Decide qué hoteles del listado hay que descargar.
+
+        tarjetas: lista de (url, firma_tarjeta). existentes: url -> fila del CSV actual.
+        Devuelve (sin_cambios, encabezados): las urls que se pueden tomar del CSV sin descargar, y los
+        encabezados condicionales (If-None-Match / If-Modified-Since) para las que conviene verificar.
+        """
+        sin_cambios = []
+        encabezados = {}
+        for url, firma in tarjetas:
+            entrada = self.entradas.get(url)
+            if entrada is None or url not in existentes:  # Hotel nuevo o sin fila en el CSV
+                continue
+            if entrada["hash_tarjeta"] != calcular_hash(firma):  # La tarjeta del listado cambió
+                continue
+            validadores = {}
+            if entrada.get("etag"):
+                validadores["If-None-Match"] = entrada["etag"]
+            if entrada.get("last_modified"):
+                validadores["If-Modified-Since"] = entrada["last_modified"]
+            if condicional and validadores:
+                encabezados[url] = validadores  # Se descarga solo si el servidor dice que cambió
+            else:
+                sin_cambios.append(url)
+        return sin_cambios, encabezados
+
+    def actualizar(self, tarjetas, hashes, metadatos):
+        """Actualiza el índice con el listado actual y devuelve la cantidad de hoteles nuevos, modificados y sin cambios.
+
+        hashes: url -> hash_hotel de los datos guardados. metadatos: url -> {etag, last_modified} de las fichas descargadas.
+        Los hoteles que ya no están en el listado se quitan del índice.
+        """
+        conteo = {"nuevos": 0, "modificados": 0, "sin_cambios": 0, "eliminados": 0}
+        nuevas_entradas = {}
+        for url, firma in tarjetas:
+            if url not in hashes:  # No se pudo leer: queda fuera del índice para reintentarlo
+                continue
+            anterior = self.entradas.get(url, {})
+            meta = metadatos.get(url, {})
+            entrada = {
+                "hash_tarjeta": calcular_hash(firma),
+                "etag": meta.get("etag") or anterior.get("etag", ""),
+                "last_modified": meta.get("last_modified") or anterior.get("last_modified", ""),
+                "hash_contenido": hashes[url],
+            }
+            if not anterior:
+                conteo["nuevos"] += 1
+            elif anterior.get("hash_contenido") != entrada["hash_contenido"]:
+                conteo["modificados"] += 1
+            else:
+                conteo["sin_cambios"] += 1
+            nuevas_entradas[url] = entrada
+        conteo["eliminados"] = len(set(self.entradas) - {url for url, _ in tarjetas})
+        self.entradas = nuevas_entradas
+        return conteo
+
+    def guardar(self):
+        """Escribe el índice de forma atómica (archivo temporal + rename)."""
+        os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+        temporal = self.ruta + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(self.entradas, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(temporal, self.ruta)
@@ -0,0 +1,171 @@
+# Motor HTTP para el scraper de AHTRA: descarga las páginas con un cliente HTTP asíncrono
+# (httpx, con conexiones reutilizables) y las lee con BeautifulSoup, sin abrir un navegador.
+# Las páginas que no tienen los datos en el HTML (porque los arma JavaScript) se devuelven
+# como None para que el scraper las procese con Playwright.
+
+import asyncio
+import re
+from urllib.parse import urljoin
+
+import httpx
+from bs4 import BeautifulSoup
+from tqdm import tqdm
+
+# Selector de las tarjetas de hoteles en el listado de una filial
+SELECTOR_TARJETAS = ".row.app-brief #hoteles-foto a"
+
+# Campo del CSV -> id del elemento en la página del hotel
+CAMPOS_HOTEL = {
+    "nombre": "hotel-interno-nombre-hotel",
+    "direccion": "hotel-interno-direccion",
+    "telefono": "hotel-interno-teléfono",
+    "email": "hotel-interno-mail",
+    "sitio_web": "hotel-interno-web",
+}
+
+NO_DISPONIBLE = "No disponible"
+
+# Clases de Bootstrap que ocultan un elemento (el sitio no usa otras hojas de estilo para ocultar campos)
+CLASES_OCULTAS = {"d-none", "invisible", "hidden"}
+
+# Clases responsivas que vuelven a mostrar un d-none en pantallas anchas ("d-none d-md-block"). Playwright usa
+# una ventana de 1280 px, así que los cortes sm, md, lg y xl ya están activos.
+PATRON_DISPLAY_RESPONSIVO = re.compile(r"d-(sm|md|lg|xl)-(?!none)")
+
+# Estilos en línea que ocultan un elemento
+ESTILOS_OCULTOS = ("display:none", "visibility:hidden")
+
+# Resultado de una request condicional cuando el servidor responde 304 (la ficha no cambió)
+NO_MODIFICADO = object()
+
+
+def crear_cliente(max_conexiones):
+    """Crea el cliente HTTP con un pool de conexiones keep-alive de hasta max_conexiones."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=max_conexiones, max_keepalive_connections=max_conexiones),
+        timeout=10,
+        follow_redirects=True,
+        headers={"User-Agent": "Mozilla/5.0 (X11; Linux x86_64)"},
+    )
+
+
+def oculto(elemento):
+    """True si el elemento o alguno de sus contenedores está oculto (como locator.is_visible() en Playwright).
+
+    Sin un navegador no se calculan los estilos: se reconocen el atributo hidden, los estilos en línea
+    display:none y visibility:hidden, y las clases de Bootstrap que ocultan (d-none, invisible, hidden).
+    """
+    for actual in [elemento, *elemento.parents]:
+        if actual.name in ("[document]", None):
+            break
+        if actual.has_attr("hidden"):
+            return True
+        estilo = (actual.get("style") or "").replace(" ", "").lower()
+        if any(oculto in estilo for oculto in ESTILOS_OCULTOS):
+            return True
+        clases = actual.get("class") or []
+        ocultas = CLASES_OCULTAS.intersection(clases)
+        if any(PATRON_DISPLAY_RESPONSIVO.match(clase) for clase in clases):
+            ocultas.discard("d-none")  # "d-none d-md-block": visible en la ventana del navegador
+        if ocultas:
+            return True
+    return False
+
+
+def texto_opcional(soup, id_elemento, etiqueta=None):
+    """Equivalente a get_optional_text: texto del elemento (o de su etiqueta hija) o 'No disponible'."""
+    elemento = soup.find(id=id_elemento)
+    if elemento is not None and etiqueta:
+        elemento = elemento.find(etiqueta)  # Igual que el selector "#hotel-interno-web a"
+    if elemento is None or oculto(elemento):
+        return NO_DISPONIBLE
+    texto = elemento.get_text().strip()
+    return texto if texto else NO_DISPONIBLE
+
+
+def firma_tarjeta(a):
+    """Resumen de la tarjeta de un hotel en el listado: href, texto y fuentes de las imágenes.
+
+    Se calcula igual que JS_FIRMA_TARJETA del scraper, para que el índice de cambios sirva con ambos motores.
+    """
+    contenedor = a.parent
+    texto = " ".join(contenedor.get_text().split())
+    imagenes = ",".join(img.get("src", "") for img in contenedor.find_all("img"))
+    return "|".join([a.get("href", ""), texto, imagenes])
+
+
+def parsear_tarjetas(html, base_url):
+    """Devuelve (link absoluto, firma de la tarjeta) por cada hotel del listado (vacía si no hay tarjetas en el HTML)."""
+    soup = BeautifulSoup(html, "html.parser")
+    return [(urljoin(base_url, a["href"]), firma_tarjeta(a)) for a in soup.select(SELECTOR_TARJETAS) if a.get("href")]
+
+
+def parsear_hotel(html, url):
+    """Devuelve los datos del hotel, o None si el HTML no trae la ficha (hace falta JavaScript)."""
+    soup = BeautifulSoup(html, "html.parser")
+    if soup.find(id=CAMPOS_HOTEL["nombre"]) is None:
+        return None
+
+    hotel = {}
+    for campo, id_elemento in CAMPOS_HOTEL.items():
+        hotel[campo] = texto_opcional(soup, id_elemento, "a" if campo == "sitio_web" else None)
+    hotel["url"] = url
+    return hotel
+
+
+async def obtener_tarjetas(cliente, base_url, listado_url):
+    """Descarga el listado de una filial y devuelve (link, firma de la tarjeta) de sus hoteles."""
+    try:
+        respuesta = await cliente.get(listado_url)
+        respuesta.raise_for_status()
+    except httpx.HTTPError as e:
+        print(f"⚠️ No se pudo descargar el listado por HTTP: {e}")
+        return []
+    return parsear_tarjetas(respuesta.content, base_url)
+
+
+async def obtener_hotel(cliente, url, encabezados=None):
+    """Descarga y lee la página de un hotel.
+
+    Devuelve (hotel, metadatos): hotel es None si falla o si necesita JavaScript, y NO_MODIFICADO si la
+    request era condicional y el servidor respondió 304. metadatos tiene el ETag y Last-Modified de la ficha.
+    """
+    try:
+        respuesta = await cliente.get(url, headers=encabezados)
+        if respuesta.status_code != 304:  # httpx trata el 304 como error, pero acá significa "sin cambios"
+            respuesta.raise_for_status()
+    except httpx.HTTPError as e:
+        print(f"⚠️ Error HTTP en {url}: {e} (se reintenta con el navegador)")
+        return None, {}
+    metadatos = {
+        "etag": respuesta.headers.get("etag", ""),
+        "last_modified": respuesta.headers.get("last-modified", ""),
+    }
+    if respuesta.status_code == 304:
+        return NO_MODIFICADO, metadatos
+    return parsear_hotel(respuesta.content, url), metadatos
+
+
+async def obtener_hoteles(cliente, links, concurrencia, al_completar=None, encabezados=None):
+    """Descarga los hoteles en paralelo; devuelve una lista alineada con links (None = usar Playwright).
+
+    al_completar(url, hotel, metadatos) es una corrutina que se espera apenas se lee cada hotel (por ejemplo, para registrarlo en
+    el checkpoint). encabezados: url -> encabezados condicionales para las fichas que ya se conocen.
+    """
+    encabezados = encabezados or {}
+    semaforo = asyncio.Semaphore(concurrencia)  # Limita las descargas simultáneas
+    resultados = [None] * len(links)
+    barra = tqdm(total=len(links), desc="Procesando hoteles (HTTP)", unit="hotel")
+
+    async def procesar(indice, url):
+        async with semaforo:
+            resultados[indice], metadatos = await obtener_hotel(cliente, url, encabezados.get(url))
+        if resultados[indice] is not None and al_completar:
+            await al_completar(url, resultados[indice], metadatos)
+        barra.update(1)
+
+    try:
+        await asyncio.gather(*(procesar(i, url) for i, url in enumerate(links)))
+    finally:
+        barra.close()
+    return resultados
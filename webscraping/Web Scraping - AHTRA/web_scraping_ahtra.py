@@ -1,8 +1,24 @@
 from playwright.async_api import async_playwright
 import pandas as pd
 from tqdm import tqdm
+import argparse
 import asyncio
 import os
+import re
+import sys
+from urllib.parse import urlparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Carpeta webscraping (módulos compartidos)
+from bloqueo_recursos import BloqueadorRecursos
+from checkpoint import DiarioCheckpoint, ruta_checkpoint
+from escritor_csv import EscritorCSV
+from indice_cambios import IndiceCambios, hash_hotel
+
+# Motor HTTP opcional (httpx + BeautifulSoup); si no está instalado se usa solo Playwright
+try:
+    import motor_http
+except ImportError:
+    motor_http = None
 
 # Diccionario de filiales
 filiales = {
@@ -24,10 +40,20 @@ filiales = {
     99: "Más Hoteles Asociados"
 }
 
+# Cantidad de páginas del navegador (o descargas HTTP) que procesan hoteles al mismo tiempo
+PAGINAS_POR_DEFECTO = 6
+
+# Columnas del CSV de resultados
+COLUMNAS_CSV = ["nombre", "direccion", "telefono", "email", "sitio_web", "url"]
+
+# Sitio de AHTRA (se puede cambiar con --base-url, por ejemplo para probar contra HTML guardado en un servidor local)
+BASE_URL = "https://www.ahtra.com.ar/"
+
 # Mostrar las opciones de filiales ordenadas por ID
-print("Elige una filial ingresando el número correspondiente:")
-for id_ in sorted(filiales.keys()):  # Ordenar las claves de menor a mayor
-    print(f"{id_}: {filiales[id_]}")
+def mostrar_filiales():
+    print("Elige una filial ingresando el número correspondiente:")
+    for id_ in sorted(filiales.keys()):  # Ordenar las claves de menor a mayor
+        print(f"{id_}: {filiales[id_]}")
 
 # Función para solicitar al usuario la selección de la filial
 def seleccionar_filial():
@@ -53,73 +79,308 @@ async def get_optional_text(page, selector):
     except:
         return "No disponible"
 
-# Función para navegar por los hoteles de una filial
-async def navegar_hoteles(filial_id):
-    base_url = "https://www.ahtra.com.ar/"
-    listado_url = f"{base_url}hoteles_asociados.php?fil={filial_id}"
+# Función para leer los datos de un hotel usando una página ya abierta
+async def procesar_hotel(page, full_link):
+    try:
+        await page.goto(full_link, timeout=10000)
+
+        nombre = await get_optional_text(page, "#hotel-interno-nombre-hotel")
+        direccion = await get_optional_text(page, "#hotel-interno-direccion")
+        telefono = await get_optional_text(page, "#hotel-interno-teléfono")
+        email = await get_optional_text(page, "#hotel-interno-mail")
+        sitio_web = await get_optional_text(page, "#hotel-interno-web a")
+
+        return {
+            "nombre": nombre,
+            "direccion": direccion,
+            "telefono": telefono,
+            "email": email,
+            "sitio_web": sitio_web,
+            "url": full_link
+        }
+
+    except Exception as e:
+        print(f"❌ Error al procesar {full_link}: {e}")
+        await guardar_html_error(full_link, page)
+        return None
+
+# Nombre del archivo de depuración de un hotel: "fil=1&id=541" -> "error_fil_1_id_541.html"
+def ruta_html_error(full_link):
+    consulta = urlparse(full_link).query or urlparse(full_link).path
+    nombre = re.sub(r"\W+", "_", consulta).strip("_") or "hotel"
+    carpeta = os.path.join(directorio_resultados(), "depuracion")
+    os.makedirs(carpeta, exist_ok=True)
+    return os.path.join(carpeta, f"error_{nombre}.html")
 
+# Guarda el HTML de la página que falló, un archivo por hotel (las tareas en paralelo no se pisan).
+# Si la página se cerró o se colgó no hay HTML para guardar: el error no debe cortar al resto de los hoteles.
+async def guardar_html_error(full_link, page):
+    try:
+        html = await page.content()
+        ruta = ruta_html_error(full_link)
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"   HTML guardado en '{ruta}'.")
+    except Exception as e:
+        print(f"   No se pudo guardar el HTML de {full_link}: {e}")
+
+# Función para procesar los hoteles en paralelo con un pool de páginas reutilizables
+async def procesar_hoteles_en_paralelo(context, links, cantidad_paginas=PAGINAS_POR_DEFECTO, al_completar=None):
+    cantidad_paginas = max(1, min(cantidad_paginas, len(links)))  # No abrir más páginas que hoteles
+
+    # El pool es una cola de páginas: cada tarea toma una libre y la devuelve al terminar,
+    # así nunca hay más de cantidad_paginas hoteles cargándose al mismo tiempo
+    pool = asyncio.Queue()
+    for _ in range(cantidad_paginas):
+        pool.put_nowait(await context.new_page())
+
+    resultados = [None] * len(links)  # Se guarda cada hotel en su posición para mantener el orden original
+    barra = tqdm(total=len(links), desc="Procesando hoteles", unit="hotel")
+
+    async def procesar(indice, full_link):
+        page = await pool.get()  # Espera una página libre
+        try:
+            resultados[indice] = await procesar_hotel(page, full_link)
+            if resultados[indice] is not None and al_completar:
+                await al_completar(full_link, resultados[indice])  # Por ejemplo, registrar el hotel en el checkpoint y el CSV
+        finally:
+            if page.is_closed():  # La página se cerró o se colgó: se reemplaza para no achicar el pool
+                try:
+                    page = await context.new_page()
+                except Exception as e:  # Se devuelve la cerrada: las tareas que esperan página no se quedan trabadas
+                    print(f"⚠️ No se pudo abrir una página nueva: {e}")
+            pool.put_nowait(page)  # Devuelve la página al pool
+            barra.update(1)
+
+    try:
+        await asyncio.gather(*(procesar(i, link) for i, link in enumerate(links)))
+    finally:
+        barra.close()
+        while not pool.empty():
+            await pool.get_nowait().close()
+
+    return [hotel for hotel in resultados if hotel is not None]  # Descarta los hoteles que fallaron
+
+# Firma de la tarjeta de un hotel en el listado (misma fórmula que motor_http.firma_tarjeta)
+JS_FIRMA_TARJETA = """
+    a => {
+        const c = a.parentElement;
+        const texto = c.textContent.split(/\\s+/).filter(Boolean).join(' ');
+        const imagenes = Array.from(c.querySelectorAll('img')).map(i => i.getAttribute('src') || '').join(',');
+        return [a.getAttribute('href') || '', texto, imagenes].join('|');
+    }
+"""
+
+# Función para obtener con Playwright los hoteles que todavía no están en hechos.
+# Si links es None, también lee el listado y llama a preparar(tarjetas) antes de procesar.
+async def obtener_hoteles_playwright(listado_url, base_url, links, cantidad_paginas, bloquear_recursos, hechos, al_completar,
+                                     preparar=None):
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)  # Cambiá a False si querés ver el navegador
         context = await browser.new_context()
-        page = await context.new_page()
-        await page.goto(listado_url)
-
-        hotel_cards = await page.query_selector_all(".row.app-brief #hoteles-foto a")
-        total_hoteles = len(hotel_cards)
-        print(f"\n🔗 Se encontraron {total_hoteles} hoteles en la filial {filial_id}:\n")
-
-        hoteles_data = []
-        for card in tqdm(hotel_cards, desc="Procesando hoteles", unit="hotel"):
-            href = await card.get_attribute("href")
-            full_link = base_url + href
-
-            new_page = await context.new_page()
-            try:
-                await new_page.goto(full_link, timeout=10000)
-
-                nombre = await get_optional_text(new_page, "#hotel-interno-nombre-hotel")
-                direccion = await get_optional_text(new_page, "#hotel-interno-direccion")
-                telefono = await get_optional_text(new_page, "#hotel-interno-teléfono")
-                email = await get_optional_text(new_page, "#hotel-interno-mail")
-                sitio_web = await get_optional_text(new_page, "#hotel-interno-web a")
-
-                hoteles_data.append({
-                    "nombre": nombre,
-                    "direccion": direccion,
-                    "telefono": telefono,
-                    "email": email,
-                    "sitio_web": sitio_web,
-                    "url": full_link
-                })
-
-            except Exception as e:
-                print(f"❌ Error al procesar {full_link}: {e}")
-                html = await new_page.content()
-                with open("error_debug.html", "w", encoding="utf-8") as f:
-                    f.write(html)
-
-            await new_page.close()
-
-        df = pd.DataFrame(hoteles_data)
-        
-        # Obtener el directorio actual del script
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        # Crear carpeta resultados en el mismo directorio que el script
-        resultados_dir = os.path.join(script_dir, "resultados")
-        os.makedirs(resultados_dir, exist_ok=True)
-        
-        # Obtener el nombre de la filial y crear un nombre de archivo válido
-        nombre_filial = filiales[filial_id]
-        nombre_archivo = f"{nombre_filial.replace(' ', '_').replace('&', 'y')}_AHTRA_hoteles_detalle.csv"
-        
-        # Guardar el archivo en la carpeta resultados
-        output_path = os.path.join(resultados_dir, nombre_archivo)
-        df.to_csv(output_path, index=False)
-        print(f"\n✅ Datos guardados en '{output_path}'.")
 
+        if bloquear_recursos:  # No descarga imágenes, fuentes, videos ni recursos de otros dominios
+            bloqueador = BloqueadorRecursos.para_sitio("ahtra", dominios_extra=[urlparse(base_url).hostname or ""])
+        else:  # Solo mide los bytes descargados, para comparar con una corrida con bloqueo
+            bloqueador = BloqueadorRecursos.sin_bloqueo()
+        await bloqueador.instalar(context)
+
+        tarjetas = None
+        if links is None:  # El listado no se pudo leer por HTTP: se lee con el navegador
+            page = await context.new_page()
+            await page.goto(listado_url)
+
+            hotel_cards = await page.query_selector_all(".row.app-brief #hoteles-foto a")
+            tarjetas = [(base_url + await card.get_attribute("href"), await card.evaluate(JS_FIRMA_TARJETA))
+                        for card in hotel_cards]
+            links = [link for link, _ in tarjetas]
+            await page.close()
+            print(f"\n🔗 Se encontraron {len(links)} hoteles en el listado.\n")
+            if preparar:
+                await preparar(tarjetas, condicional=False)  # Con el navegador no hay requests condicionales
+
+        pendientes = [link for link in links if link not in hechos]
+        if pendientes:
+            await procesar_hoteles_en_paralelo(context, pendientes, cantidad_paginas, al_completar)
         await browser.close()
+        print(bloqueador.resumen())
+        return tarjetas
+
+# Función para obtener los hoteles de una filial, primero por HTTP y con Playwright como respaldo.
+# Cada hotel se escribe en el escritor CSV apenas se lee, respetando el orden del listado.
+# Devuelve (hechos, completo, tarjetas, metadatos): hechos es url -> hash de los datos de cada hotel guardado
+# y completo es False si algún hotel no se pudo leer.
+# En modo delta (indice y existentes), los hoteles sin cambios se toman de existentes sin descargarlos, y los que
+# no se pudieron leer conservan su fila anterior.
+async def obtener_hoteles(filial_id, escritor, cantidad_paginas=PAGINAS_POR_DEFECTO, motor="http", base_url=BASE_URL,
+                          bloquear_recursos=True, diario=None, indice=None, existentes=None):
+    listado_url = f"{base_url}hoteles_asociados.php?fil={filial_id}"
+    existentes = existentes or {}
+
+    # Hoteles ya terminados en una corrida anterior: se escriben en el CSV cuando se conoce el orden del listado
+    recuperados = diario.cargar() if diario else []
+    if recuperados:
+        print(f"♻️ {len(recuperados)} hoteles recuperados del checkpoint, no se vuelven a descargar.")
+    hechos = {}  # url -> hash de los datos de los hoteles ya guardados en el CSV
+    posiciones = {}  # url -> posiciones del hotel en el listado
+    metadatos = {}  # url -> ETag / Last-Modified de las fichas descargadas por HTTP
+    encabezados = {}  # url -> encabezados de la request condicional (modo delta)
+
+    async def emitir(url, hotel):
+        if url in hechos:
+            return
+        hechos[url] = hash_hotel(hotel)
+        for posicion in posiciones.get(url, []):
+            await escritor.escribir_en_orden(posicion, hotel)
+
+    async def registrar(url, hotel, meta=None):
+        if motor_http is not None and hotel is motor_http.NO_MODIFICADO:  # 304: la ficha no cambió, se conserva la fila del CSV
+            hotel = existentes[url]
+        if meta:
+            metadatos[url] = meta
+        if diario:
+            diario.registrar({"url": url, "hotel": hotel})  # Queda en disco aunque la ejecución se corte
+        await emitir(url, hotel)
+
+    async def preparar(tarjetas, condicional=True):
+        for posicion, (url, _) in enumerate(tarjetas):
+            posiciones.setdefault(url, []).append(posicion)
+        for entrada in recuperados:
+            if entrada["url"] in posiciones:  # Los que ya no están en el listado se descartan
+                await emitir(entrada["url"], entrada["hotel"])
+        recuperados.clear()
+        if indice is None:
+            return
+        sin_cambios, condicionales = indice.clasificar(tarjetas, existentes, condicional)
+        for url in sin_cambios:
+            await emitir(url, existentes[url])
+        encabezados.update(condicionales)
+        print(f"🔍 Modo delta: {len(sin_cambios)} hoteles sin cambios en el listado, "
+              f"{len(condicionales)} a verificar con request condicional, "
+              f"{len(tarjetas) - len(sin_cambios) - len(condicionales)} nuevos o modificados.")
+
+    if motor == "http" and motor_http is None:
+        print("⚠️ Faltan httpx o beautifulsoup4 para el motor HTTP, se usa Playwright.")
+        motor = "playwright"
+
+    if motor == "playwright":
+        tarjetas = await obtener_hoteles_playwright(listado_url, base_url, None, cantidad_paginas, bloquear_recursos, hechos,
+                                                    registrar, preparar)
+    else:
+        async with motor_http.crear_cliente(cantidad_paginas) as cliente:
+            tarjetas = await motor_http.obtener_tarjetas(cliente, base_url, listado_url)
+            if tarjetas:
+                print(f"\n🔗 Se encontraron {len(tarjetas)} hoteles en la filial {filial_id}:\n")
+                await preparar(tarjetas)
+                pendientes = [link for link, _ in tarjetas if link not in hechos]
+                await motor_http.obtener_hoteles(cliente, pendientes, cantidad_paginas, registrar, encabezados)
+
+        if not tarjetas:  # El listado no trae las tarjetas en el HTML: todo se hace con el navegador
+            print("⚠️ El listado necesita JavaScript, se usa Playwright.")
+            tarjetas = await obtener_hoteles_playwright(listado_url, base_url, None, cantidad_paginas, bloquear_recursos, hechos,
+                                                        registrar, preparar)
+        else:
+            # Los hoteles que no se pudieron leer por HTTP se procesan con el navegador
+            faltantes = [link for link, _ in tarjetas if link not in hechos]
+            if faltantes:
+                print(f"\n🌐 {len(faltantes)} hoteles necesitan el navegador, procesando con Playwright...")
+                await obtener_hoteles_playwright(listado_url, base_url, faltantes, cantidad_paginas, bloquear_recursos, hechos,
+                                                 registrar)
+
+    # Los hoteles que no se pudieron leer conservan la fila del CSV anterior (modo delta) o se saltean, para que el
+    # resto se termine de escribir. No se agregan a hechos: quedan fuera del índice y se reintentan.
+    faltantes = [link for link, _ in tarjetas if link not in hechos]
+    conservados = [link for link in faltantes if link in existentes]
+    if conservados:
+        print(f"♻️ {len(conservados)} hoteles que no se pudieron leer conservan la fila del CSV anterior.")
+    for link in faltantes:
+        for posicion in posiciones.get(link, []):
+            await escritor.escribir_en_orden(posicion, existentes.get(link))
+    return hechos, not faltantes, tarjetas, metadatos
+
+# Carpeta resultados junto al script (se crea si no existe)
+def directorio_resultados():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    resultados_dir = os.path.join(script_dir, "resultados")
+    os.makedirs(resultados_dir, exist_ok=True)
+    return resultados_dir
+
+# Nombre de archivo (sin extensión) de los resultados de una filial
+def nombre_base_filial(filial_id):
+    nombre_filial = filiales[filial_id]
+    return f"{nombre_filial.replace(' ', '_').replace('&', 'y')}_AHTRA_hoteles_detalle"
+
+# Función para navegar por los hoteles de una filial
+async def navegar_hoteles(filial_id, cantidad_paginas=PAGINAS_POR_DEFECTO, motor="http", base_url=BASE_URL,
+                          bloquear_recursos=True, reanudar=True, delta=False):
+    resultados_dir = directorio_resultados()
+    output_path = os.path.join(resultados_dir, f"{nombre_base_filial(filial_id)}.csv")
+
+    # Checkpoint con los hoteles ya terminados, para poder reanudar si la ejecución se corta
+    diario = DiarioCheckpoint(ruta_checkpoint(resultados_dir, nombre_base_filial(filial_id)))
+    if not reanudar:
+        diario.eliminar()
+
+    # Modo delta: índice de la corrida anterior y filas del CSV existente (url -> fila)
+    indice = None
+    existentes = {}
+    if delta:
+        indice = IndiceCambios(os.path.join(resultados_dir, "indices", f"{nombre_base_filial(filial_id)}.json"))
+        if os.path.exists(output_path):
+            df_existente = pd.read_csv(output_path, dtype=str, keep_default_na=False)
+            existentes = {fila["url"]: fila for fila in df_existente.to_dict("records")}
+
+    # Los hoteles se guardan en la carpeta resultados a medida que se leen; el CSV final reemplaza al anterior
+    # recién cuando termina la filial (mientras tanto se escribe en <nombre>.parcial.csv)
+    async with EscritorCSV(output_path, COLUMNAS_CSV) as escritor:
+        hechos, completo, tarjetas, metadatos = await obtener_hoteles(
+            filial_id, escritor, cantidad_paginas, motor, base_url, bloquear_recursos, diario, indice, existentes
+        )
+        if not tarjetas:  # Un listado vacío suele ser un cambio en el sitio o un bloqueo, no una filial sin hoteles
+            escritor.descartar()
+    if not tarjetas:
+        print(f"\n❌ El listado no trajo hoteles: se conserva '{output_path}' y el índice delta sin cambios.")
+        return
+    print(f"\n✅ {escritor.filas_escritas} hoteles guardados en '{output_path}'.")
+
+    if indice is not None:
+        conteo = indice.actualizar(tarjetas, hechos, metadatos)
+        indice.guardar()
+        print(f"🔍 Delta: {conteo['nuevos']} nuevos, {conteo['modificados']} modificados, "
+              f"{conteo['sin_cambios']} sin cambios, {conteo['eliminados']} eliminados del listado.")
+
+    if completo:
+        diario.eliminar()  # Todos los hoteles terminaron: ya no hace falta el checkpoint
+    else:
+        print("⚠️ Algunos hoteles no se pudieron leer; volvé a ejecutar para reintentar solo esos.")
+
+# Parámetros de línea de comandos
+def parsear_argumentos():
+    parser = argparse.ArgumentParser(description="Scraper de hoteles asociados a AHTRA por filial.")
+    parser.add_argument("--filial", type=int, choices=sorted(filiales.keys()),
+                        help="ID de la filial a scrapear (si no se indica, se muestra el menú)")
+    parser.add_argument("--paginas", type=int, default=PAGINAS_POR_DEFECTO,
+                        help=f"Cantidad de hoteles que se cargan en paralelo (por defecto {PAGINAS_POR_DEFECTO})")
+    parser.add_argument("--motor", choices=["http", "playwright"], default="http",
+                        help="http: descarga directa con respaldo en Playwright (por defecto); playwright: solo navegador")
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="URL base del sitio (útil para probar contra un servidor local con HTML guardado)")
+    parser.add_argument("--sin-bloqueo", action="store_true",
+                        help="Con Playwright, descarga todos los recursos (no bloquea imágenes, fuentes, videos ni dominios externos)")
+    parser.add_argument("--sin-reanudar", action="store_true",
+                        help="Ignora el checkpoint de una corrida anterior y descarga todos los hoteles")
+    parser.add_argument("--delta", action="store_true",
+                        help="Solo descarga los hoteles nuevos o modificados y los combina con el CSV existente")
+    return parser.parse_args()
 
 # Ejecutar
-filial_id = seleccionar_filial()  # Pedir al usuario que seleccione una filial
-asyncio.run(navegar_hoteles(filial_id))
+if __name__ == "__main__":
+    args = parsear_argumentos()
+    if args.filial is not None:
+        filial_id = args.filial
+    else:
+        mostrar_filiales()
+        filial_id = seleccionar_filial()  # Pedir al usuario que seleccione una filial
+    base_url = args.base_url if args.base_url.endswith("/") else args.base_url + "/"
+    asyncio.run(navegar_hoteles(filial_id, args.paginas, args.motor, base_url, not args.sin_bloqueo, not args.sin_reanudar,
+                                args.delta))
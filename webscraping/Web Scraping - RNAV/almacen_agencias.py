@@ -0,0 +1,295 @@
+# Almacén consolidado de las agencias del RNAV en una base SQLite (resultados/agencias.sqlite).
+# Los CSV por provincia siguen siendo la salida del scraper; además, cada provincia que termina bien
+# reemplaza sus filas en el almacén dentro de una transacción. Con índices por correo, provincia y
+# localidad, las búsquedas y los totales entre provincias se resuelven en milisegundos sin leer los
+# 23 CSV con pandas.
+#
+# Uso desde la línea de comandos:
+#   python almacen_agencias.py importar                   # Carga todos los CSV de resultados/
+#   python almacen_agencias.py buscar --correo info@x.com
+#   python almacen_agencias.py buscar --localidad "Mar del Plata" --nombre viajes
+#   python almacen_agencias.py buscar --telefono "(0351) 15-388-4241"
+#   python almacen_agencias.py resumen [--por localidad]
+#   python almacen_agencias.py correcciones [--provincia Salta]
+#   python almacen_agencias.py sql "SELECT provincia, COUNT(*) FROM agencias GROUP BY provincia"
+
+import argparse
+import csv
+import glob
+import os
+import sqlite3
+import sys
+import time
+
+from normalizacion_telefono import COLUMNAS_TELEFONO, VERSION_REGLAS, NormalizadorTelefonos
+
+NOMBRE_ALMACEN = "agencias.sqlite"
+
+# Columnas de la tabla agencias: las del CSV más el teléfono normalizado, que se calcula al insertar. Si se
+# agregan columnas, las bases existentes se actualizan solas al abrirlas (ALTER TABLE ADD COLUMN).
+COLUMNAS_CSV = ["nombre", "telefono", "correo", "localidad", "provincia"]
+COLUMNAS = COLUMNAS_CSV + COLUMNAS_TELEFONO
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS agencias (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    telefono TEXT,
+    correo TEXT,
+    localidad TEXT COLLATE NOCASE,
+    provincia TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS idx_agencias_correo ON agencias (correo);
+CREATE INDEX IF NOT EXISTS idx_agencias_provincia ON agencias (provincia);
+CREATE INDEX IF NOT EXISTS idx_agencias_localidad ON agencias (localidad);
+CREATE TABLE IF NOT EXISTS provincias (
+    provincia TEXT PRIMARY KEY COLLATE NOCASE,
+    agencias INTEGER NOT NULL,
+    actualizado TEXT NOT NULL,
+    origen TEXT
+);
+CREATE TABLE IF NOT EXISTS correcciones_correo (
+    provincia TEXT NOT NULL COLLATE NOCASE,
+    nombre TEXT NOT NULL,
+    correo_original TEXT,
+    correo_corregido TEXT NOT NULL,
+    actualizado TEXT NOT NULL,
+    PRIMARY KEY (provincia, nombre)
+);
+"""
+
+# Completa en una sola sentencia el correo vacío (inválido en el sitio) de las agencias con una corrección guardada
+SQL_APLICAR_CORRECCIONES = """
+UPDATE agencias
+SET correo = (SELECT c.correo_corregido FROM correcciones_correo c
+              WHERE c.provincia = agencias.provincia AND c.nombre = agencias.nombre)
+WHERE provincia = ? AND correo = ''
+  AND EXISTS (SELECT 1 FROM correcciones_correo c WHERE c.provincia = agencias.provincia AND c.nombre = agencias.nombre)
+"""
+
+# Columnas por las que se puede agrupar en el resumen
+COLUMNAS_RESUMEN = ("provincia", "localidad", "correo", "telefono", "telefono_e164", "telefono_estado")
+
+
+def ruta_almacen_por_defecto():
+    """resultados/agencias.sqlite junto al script."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados", NOMBRE_ALMACEN)
+
+
+class AlmacenAgencias:
+    """Conexión al almacén SQLite de agencias. Se puede usar con `with` (cierra la conexión al salir)."""
+
+    def __init__(self, ruta=None):
+        self.ruta = ruta or ruta_almacen_por_defecto()
+        os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)
+        self.conexion = sqlite3.connect(self.ruta, timeout=30)  # Espera si otra provincia está escribiendo
+        self.conexion.row_factory = sqlite3.Row
+        self.conexion.execute("PRAGMA journal_mode=WAL")  # Las lecturas no se bloquean mientras se escribe
+        self.conexion.executescript(ESQUEMA)
+        self.telefonos = NormalizadorTelefonos()
+        self._migrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        self.conexion.close()
+
+    def _migrar(self):
+        """Agrega a la tabla las columnas de COLUMNAS que todavía no tenga (bases creadas por versiones anteriores)
+        y completa el teléfono normalizado de las filas que ya estaban. Si las reglas de normalización cambiaron
+        (PRAGMA user_version guarda la versión con la que se calcularon), los teléfonos se recalculan."""
+        existentes = {fila["name"] for fila in self.conexion.execute("PRAGMA table_info(agencias)")}
+        version = self.conexion.execute("PRAGMA user_version").fetchone()[0]
+        with self.conexion:
+            for columna in COLUMNAS:
+                if columna not in existentes:
+                    self.conexion.execute(f"ALTER TABLE agencias ADD COLUMN {columna} TEXT")
+            if "telefono_e164" not in existentes or version < VERSION_REGLAS:
+                self.actualizar_telefonos()
+                self.conexion.execute(f"PRAGMA user_version = {VERSION_REGLAS}")
+            self.conexion.execute("CREATE INDEX IF NOT EXISTS idx_agencias_telefono ON agencias (telefono_e164)")
+
+    def actualizar_telefonos(self):
+        """Recalcula telefono_e164 y telefono_estado de todas las filas (una vez por cada teléfono distinto)."""
+        filas = self.conexion.execute("SELECT id, telefono FROM agencias").fetchall()
+        numeros, estados = self.telefonos.normalizar_lote([fila["telefono"] or "" for fila in filas])
+        self.conexion.executemany("UPDATE agencias SET telefono_e164 = ?, telefono_estado = ? WHERE id = ?",
+                                  zip(numeros, estados, (fila["id"] for fila in filas)))
+
+    def reemplazar_provincia(self, provincia, filas, origen=""):
+        """Reemplaza todas las agencias de la provincia por las filas indicadas (dicts con COLUMNAS_CSV).
+
+        El teléfono se normaliza al insertar (columnas telefono_e164 y telefono_estado). Borrado e inserción van en
+        una sola transacción: una consulta concurrente ve la provincia anterior o la nueva, nunca una mezcla.
+        Las correcciones de correo guardadas para la provincia se aplican en la misma transacción. Devuelve la
+        cantidad de filas insertadas.
+        """
+        filas = list(filas)
+        numeros, estados = self.telefonos.normalizar_lote([fila.get("telefono") or "" for fila in filas])
+        marcadores = ", ".join("?" for _ in COLUMNAS)
+        valores = ([fila.get(columna) or "" for columna in COLUMNAS_CSV[:-1]] + [provincia, numero, estado]
+                   for fila, numero, estado in zip(filas, numeros, estados))
+        with self.conexion:  # Transacción: commit al salir, rollback si hay una excepción
+            self.conexion.execute("DELETE FROM agencias WHERE provincia = ?", (provincia,))
+            cursor = self.conexion.executemany(
+                f"INSERT INTO agencias ({', '.join(COLUMNAS)}) VALUES ({marcadores})", valores)
+            cantidad = cursor.rowcount
+            self.conexion.execute(SQL_APLICAR_CORRECCIONES, (provincia,))
+            self.conexion.execute(
+                "INSERT OR REPLACE INTO provincias (provincia, agencias, actualizado, origen) VALUES (?, ?, ?, ?)",
+                (provincia, cantidad, time.strftime("%Y-%m-%d %H:%M:%S"), origen))
+        return cantidad
+
+    def importar_csv(self, ruta_csv, provincia=None):
+        """Carga un CSV de resultados (una provincia por archivo) reemplazando esa provincia. Devuelve (provincia, filas).
+
+        Sin provincia se toma de la columna provincia del CSV; indicarla permite cargar una provincia sin agencias.
+        """
+        with open(ruta_csv, newline="", encoding="utf-8") as archivo:
+            filas = list(csv.DictReader(archivo))
+        if provincia is None:
+            provincias = {fila["provincia"] for fila in filas if fila.get("provincia")}
+            if len(provincias) != 1:
+                raise ValueError(f"{ruta_csv}: se esperaba una sola provincia y hay {len(provincias)}")
+            provincia = provincias.pop()
+        return provincia, self.reemplazar_provincia(provincia, filas, os.path.basename(ruta_csv))
+
+    def importar_resultados(self, carpeta):
+        """Carga todos los *_agencias_viaje.csv de la carpeta. Devuelve una lista de (provincia, filas)."""
+        return [self.importar_csv(ruta) for ruta in sorted(glob.glob(os.path.join(carpeta, "*_agencias_viaje.csv")))]
+
+    def guardar_correcciones(self, provincia, correcciones):
+        """Guarda (o reemplaza) correcciones de correo de la provincia: iterable de (nombre, correo original, corregido).
+
+        Se aplican solas cada vez que la provincia se vuelve a cargar, así que no hay que volver a ingresarlas.
+        """
+        actualizado = time.strftime("%Y-%m-%d %H:%M:%S")
+        with self.conexion:
+            self.conexion.executemany(
+                "INSERT OR REPLACE INTO correcciones_correo "
+                "(provincia, nombre, correo_original, correo_corregido, actualizado) VALUES (?, ?, ?, ?, ?)",
+                ((provincia, nombre, original, corregido, actualizado) for nombre, original, corregido in correcciones))
+            self.conexion.execute(SQL_APLICAR_CORRECCIONES, (provincia,))
+
+    def correcciones(self, provincia):
+        """Correcciones de correo guardadas para la provincia: nombre de la agencia -> correo corregido."""
+        return {fila["nombre"]: fila["correo_corregido"] for fila in self.conexion.execute(
+            "SELECT nombre, correo_corregido FROM correcciones_correo WHERE provincia = ?", (provincia,))}
+
+    def buscar(self, correo=None, provincia=None, localidad=None, nombre=None, limite=100, telefono=None):
+        """Agencias que cumplen todos los filtros indicados. correo, provincia, localidad y telefono usan los índices
+        (provincia y localidad sin distinguir mayúsculas, telefono en cualquier formato: se compara normalizado);
+        nombre busca el texto en cualquier parte del nombre."""
+        condiciones, parametros = [], []
+        if telefono:
+            telefono = self.telefonos.normalizar(telefono)[0] or telefono.strip()
+        for columna, valor in (("correo", correo), ("provincia", provincia), ("localidad", localidad),
+                               ("telefono_e164", telefono)):
+            if valor:
+                condiciones.append(f"{columna} = ?")
+                parametros.append(valor.strip().lower() if columna == "correo" else valor.strip())
+        if nombre:
+            condiciones.append("nombre LIKE ?")
+            parametros.append(f"%{nombre.strip()}%")
+        donde = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        return self.consultar(f"SELECT {', '.join(COLUMNAS)} FROM agencias {donde} ORDER BY provincia, nombre LIMIT ?",
+                              parametros + [limite])
+
+    def resumen(self, por="provincia", limite=50):
+        """Cantidad de agencias por provincia (o por otra columna de COLUMNAS_RESUMEN), de mayor a menor."""
+        if por not in COLUMNAS_RESUMEN:
+            raise ValueError(f"Columna inválida: {por!r} (opciones: {', '.join(COLUMNAS_RESUMEN)})")
+        return self.consultar(f"SELECT {por}, COUNT(*) AS agencias FROM agencias GROUP BY {por} "
+                              f"ORDER BY agencias DESC, {por} LIMIT ?", [limite])
+
+    def consultar(self, sql, parametros=()):
+        """Ejecuta una consulta y devuelve las filas como diccionarios."""
+        return [dict(fila) for fila in self.conexion.execute(sql, parametros)]
+
+
+def actualizar_desde_csv(ruta_csv, provincia=None, ruta_almacen=None):
+    """Reemplaza en el almacén la provincia del CSV recién escrito por el scraper. Devuelve (provincia, filas)."""
+    with AlmacenAgencias(ruta_almacen) as almacen:
+        return almacen.importar_csv(ruta_csv, provincia)
+
+
+def imprimir_filas(filas):
+    """Muestra filas (diccionarios) como una tabla de texto."""
+    if not filas:
+        print("(sin resultados)")
+        return
+    columnas = list(filas[0])
+    anchos = {c: min(max(len(c), *(len(str(f[c] or "")) for f in filas)), 50) for c in columnas}
+    print("  ".join(c.ljust(anchos[c]) for c in columnas))
+    print("  ".join("-" * anchos[c] for c in columnas))
+    for fila in filas:
+        print("  ".join(str(fila[c] if fila[c] is not None else "")[:anchos[c]].ljust(anchos[c]) for c in columnas))
+
+
+def parsear_argumentos():
+    parser = argparse.ArgumentParser(description="Almacén SQLite consolidado de las agencias del RNAV.")
+    parser.add_argument("--almacen", help=f"Ruta de la base (por defecto resultados/{NOMBRE_ALMACEN})")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    importar = comandos.add_parser("importar", help="Carga los CSV de resultados/ (reemplaza cada provincia)")
+    importar.add_argument("csv", nargs="*", help="CSV a cargar (por defecto, todos los *_agencias_viaje.csv de resultados/)")
+
+    buscar = comandos.add_parser("buscar", help="Busca agencias por correo, provincia, localidad o nombre")
+    buscar.add_argument("--correo")
+    buscar.add_argument("--provincia")
+    buscar.add_argument("--localidad")
+    buscar.add_argument("--nombre", help="Texto contenido en el nombre")
+    buscar.add_argument("--telefono", help="Teléfono en cualquier formato (se compara en E.164)")
+    buscar.add_argument("--limite", type=int, default=100)
+
+    resumen = comandos.add_parser("resumen", help="Cantidad de agencias agrupadas por una columna")
+    resumen.add_argument("--por", choices=COLUMNAS_RESUMEN, default="provincia")
+    resumen.add_argument("--limite", type=int, default=50)
+
+    correcciones = comandos.add_parser("correcciones", help="Lista las correcciones de correo guardadas")
+    correcciones.add_argument("--provincia")
+
+    sql = comandos.add_parser("sql", help="Ejecuta una consulta SQL de solo lectura")
+    sql.add_argument("consulta")
+    return parser.parse_args()
+
+
+def main():
+    args = parsear_argumentos()
+    inicio = time.perf_counter()
+    with AlmacenAgencias(args.almacen) as almacen:
+        if args.comando == "importar":
+            if args.csv:
+                cargadas = [almacen.importar_csv(ruta) for ruta in args.csv]
+            else:
+                cargadas = almacen.importar_resultados(os.path.dirname(ruta_almacen_por_defecto()))
+            for provincia, cantidad in cargadas:
+                print(f"{provincia:<22} {cantidad:>6} agencias")
+            print(f"\n✅ {sum(c for _, c in cargadas)} agencias de {len(cargadas)} provincias en {almacen.ruta}")
+        elif args.comando == "buscar":
+            imprimir_filas(almacen.buscar(args.correo, args.provincia, args.localidad, args.nombre, args.limite,
+                                          args.telefono))
+        elif args.comando == "resumen":
+            imprimir_filas(almacen.resumen(args.por, args.limite))
+        elif args.comando == "correcciones":
+            donde = "WHERE provincia = ?" if args.provincia else ""
+            imprimir_filas(almacen.consultar(
+                f"SELECT provincia, nombre, correo_original, correo_corregido, actualizado FROM correcciones_correo "
+                f"{donde} ORDER BY provincia, nombre", [args.provincia] if args.provincia else []))
+        else:
+            almacen.conexion.execute("PRAGMA query_only = ON")  # La consulta libre no puede modificar la base
+            try:
+                filas = almacen.consultar(args.consulta)
+            except sqlite3.Error as error:  # Sintaxis inválida, tabla inexistente o intento de escritura
+                print(f"❌ Error en la consulta SQL: {error}")
+                sys.exit(1)
+            imprimir_filas(filas)
+    print(f"\n⏱️ {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
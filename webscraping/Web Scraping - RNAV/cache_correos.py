@@ -0,0 +1,290 @@
+# Caché persistente (SQLite) de la validación de correos del RNAV y verificación opcional de entrega (MX).
+# La caché LRU de NormalizadorCorreos dura lo que dura el proceso; con esta caché en disco
+# (resultados/cache_correos.sqlite) cada dirección se valida una sola vez entre corridas. Se guarda el
+# veredicto por dirección (ya limpia) y, si se pide, si el dominio puede recibir correo: la consulta de
+# registros MX se hace con un resolvedor intercambiable (dnspython por defecto, o uno estático para
+# trabajar sin red) y con un máximo de consultas simultáneas. El resultado por dominio también se guarda,
+# con una vigencia en días.
+#
+# Uso desde la línea de comandos:
+#   python cache_correos.py                                   # Valida los correos de resultados/ con la caché
+#   python cache_correos.py --verificar-entrega               # Además consulta los MX de cada dominio
+#   python cache_correos.py --verificar-entrega --dns-servidor 127.0.0.1 --dns-puerto 5353
+#   python cache_correos.py --verificar-entrega --resolvedor-estatico dominios.json   # Sin red
+
+import argparse
+import asyncio
+import csv
+import glob
+import json
+import os
+import sqlite3
+import time
+
+NOMBRE_CACHE = "cache_correos.sqlite"
+VIGENCIA_DOMINIOS_DIAS = 30  # Después de este tiempo se vuelve a consultar el MX de un dominio
+CONCURRENCIA_DNS = 20  # Consultas DNS simultáneas como máximo
+TIMEOUT_DNS = 5.0  # Segundos por consulta
+GUARDAR_CADA = 500  # Veredictos nuevos que se acumulan en memoria antes de escribirlos
+MOSTRAR_AFECTADOS = 20  # Correos sin servidor de correo que se listan al verificar la entrega
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS correos (
+    correo TEXT PRIMARY KEY,
+    normalizado TEXT NOT NULL,
+    actualizado TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dominios (
+    dominio TEXT PRIMARY KEY,
+    entregable INTEGER NOT NULL,
+    mx TEXT NOT NULL,
+    consultado REAL NOT NULL
+);
+"""
+
+
+def ruta_cache_por_defecto():
+    """resultados/cache_correos.sqlite junto al script."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados", NOMBRE_CACHE)
+
+
+class CacheCorreos:
+    """Veredictos de validación por dirección y de entrega por dominio, guardados en SQLite.
+
+    Los veredictos se cargan en memoria la primera vez que se usan (una sola consulta) y los nuevos se escriben en
+    bloques; guardar() escribe los pendientes. La conexión se abre recién cuando hace falta.
+    """
+
+    def __init__(self, ruta=None):
+        self.ruta = ruta or ruta_cache_por_defecto()
+        self._conexion = None
+        self._validaciones = None  # Dirección limpia -> forma normalizada ("" si no es válida)
+        self._pendientes = {}
+        self.aciertos = 0
+        self.fallos = 0
+
+    @property
+    def conexion(self):
+        if self._conexion is None:
+            os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)
+            self._conexion = sqlite3.connect(self.ruta, timeout=30)
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.executescript(ESQUEMA)
+        return self._conexion
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        self.guardar()
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
+
+    def validacion(self, correo):
+        """Forma normalizada guardada para la dirección ("" si no es válida) o None si no está en la caché."""
+        if self._validaciones is None:
+            self._validaciones = dict(self.conexion.execute("SELECT correo, normalizado FROM correos"))
+        resultado = self._validaciones.get(correo)
+        if resultado is None:
+            self.fallos += 1
+        else:
+            self.aciertos += 1
+        return resultado
+
+    def guardar_validacion(self, correo, normalizado):
+        """Registra un veredicto nuevo (normalizado = "" si la dirección no es válida)."""
+        if self._validaciones is None:
+            self.validacion(correo)
+        self._validaciones[correo] = normalizado
+        self._pendientes[correo] = normalizado
+        if len(self._pendientes) >= GUARDAR_CADA:
+            self.guardar()
+
+    def guardar(self):
+        """Escribe en disco los veredictos pendientes (en una transacción)."""
+        if not self._pendientes:
+            return
+        actualizado = time.strftime("%Y-%m-%d %H:%M:%S")
+        with self.conexion:
+            self.conexion.executemany("INSERT OR REPLACE INTO correos (correo, normalizado, actualizado) VALUES (?, ?, ?)",
+                                      ((c, n, actualizado) for c, n in self._pendientes.items()))
+        self._pendientes.clear()
+
+    def dominios(self, dominios, vigencia_dias=VIGENCIA_DOMINIOS_DIAS):
+        """Resultados de entrega vigentes de los dominios indicados: dominio -> (entregable, lista de MX)."""
+        limite = time.time() - vigencia_dias * 86400
+        dominios = list(dict.fromkeys(dominios))
+        resultados = {}
+        for inicio in range(0, len(dominios), 500):  # SQLite limita la cantidad de parámetros por consulta
+            bloque = dominios[inicio:inicio + 500]
+            marcadores = ", ".join("?" for _ in bloque)
+            for dominio, entregable, mx in self.conexion.execute(
+                    f"SELECT dominio, entregable, mx FROM dominios WHERE consultado >= ? AND dominio IN ({marcadores})",
+                    [limite] + bloque):
+                resultados[dominio] = (bool(entregable), mx.split() if mx else [])
+        return resultados
+
+    def guardar_dominios(self, resultados):
+        """Guarda dominio -> (entregable, lista de MX)."""
+        consultado = time.time()
+        with self.conexion:
+            self.conexion.executemany("INSERT OR REPLACE INTO dominios (dominio, entregable, mx, consultado) VALUES (?, ?, ?, ?)",
+                                      ((d, int(e), " ".join(mx), consultado) for d, (e, mx) in resultados.items()))
+
+
+class ResolvedorDNS:
+    """Resolvedor de registros MX con dnspython (asíncrono). Sin servidores usa los del sistema.
+
+    Si el dominio no tiene MX pero sí una dirección (A o AAAA), el correo se entrega a esa dirección (MX implícito).
+    """
+
+    def __init__(self, servidores=None, puerto=53, timeout=TIMEOUT_DNS):
+        import dns.asyncresolver  # Importación diferida: solo hace falta al verificar la entrega
+
+        self.resolvedor = dns.asyncresolver.Resolver(configure=not servidores)
+        if servidores:
+            self.resolvedor.nameservers = list(servidores)
+        self.resolvedor.port = puerto
+        self.resolvedor.lifetime = timeout
+
+    async def resolver_mx(self, dominio):
+        """Servidores de correo del dominio, de mayor a menor prioridad ([] si el dominio no recibe correo)."""
+        import dns.resolver
+
+        try:
+            respuesta = await self.resolvedor.resolve(dominio, "MX")
+            registros = sorted(respuesta, key=lambda r: r.preference)
+            return [r.exchange.to_text(omit_final_dot=True) for r in registros if r.exchange.to_text() != "."]
+        except dns.resolver.NXDOMAIN:
+            return []  # El dominio no existe
+        except dns.resolver.NoAnswer:
+            pass  # Existe pero no tiene MX (los errores del servidor, como los timeouts, se propagan)
+        for tipo in ("A", "AAAA"):
+            try:
+                await self.resolvedor.resolve(dominio, tipo)
+                return [dominio]
+            except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
+                continue
+        return []
+
+
+class ResolvedorEstatico:
+    """Resolvedor sin red: los MX salen de un diccionario dominio -> lista de servidores (para pruebas o trabajo
+    sin conexión). Los dominios que no están en el diccionario no reciben correo."""
+
+    def __init__(self, registros):
+        self.registros = {dominio.lower(): list(mx) for dominio, mx in registros.items()}
+        self.consultas = 0
+
+    @classmethod
+    def desde_json(cls, ruta):
+        with open(ruta, encoding="utf-8") as archivo:
+            return cls(json.load(archivo))
+
+    async def resolver_mx(self, dominio):
+        self.consultas += 1
+        return self.registros.get(dominio.lower(), [])
+
+
+async def verificar_dominios(dominios, resolvedor, cache=None, concurrencia=CONCURRENCIA_DNS,
+                             vigencia_dias=VIGENCIA_DOMINIOS_DIAS):
+    """Devuelve dominio -> (entregable, lista de MX) para cada dominio distinto.
+
+    Los dominios vigentes en la caché no se consultan; el resto se resuelve con resolvedor.resolver_mx, con a lo
+    sumo `concurrencia` consultas a la vez. Los errores de red (timeouts) no se guardan, para reintentarlos en la
+    próxima corrida; esos dominios quedan con entregable None.
+    """
+    dominios = list(dict.fromkeys(d.lower() for d in dominios if d))
+    resultados = cache.dominios(dominios, vigencia_dias) if cache else {}
+    faltantes = [d for d in dominios if d not in resultados]
+    semaforo = asyncio.Semaphore(concurrencia)
+
+    async def consultar(dominio):
+        async with semaforo:
+            try:
+                mx = await resolvedor.resolver_mx(dominio)
+                return dominio, (bool(mx), mx)
+            except Exception:  # Timeout o servidor inaccesible: no se sabe si el dominio recibe correo
+                return dominio, (None, [])
+
+    nuevos = dict(await asyncio.gather(*(consultar(d) for d in faltantes)))
+    if cache:
+        cache.guardar_dominios({d: r for d, r in nuevos.items() if r[0] is not None})
+    resultados.update(nuevos)
+    return resultados
+
+
+def dominio(correo):
+    """Dominio de una dirección ("" si no tiene @)."""
+    return correo.rpartition("@")[2].lower() if "@" in correo else ""
+
+
+def parsear_argumentos():
+    carpeta = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+    parser = argparse.ArgumentParser(description="Valida los correos de los CSV del RNAV con una caché persistente y, "
+                                                 "opcionalmente, verifica que cada dominio tenga servidores de correo.")
+    parser.add_argument("csv", nargs="*", help="CSV a procesar (por defecto, todos los *_agencias_viaje.csv de resultados/)")
+    parser.add_argument("--cache", help=f"Ruta de la caché (por defecto resultados/{NOMBRE_CACHE})")
+    parser.add_argument("--verificar-entrega", action="store_true", help="Consulta los registros MX de cada dominio")
+    parser.add_argument("--dns-servidor", nargs="+", metavar="IP", help="Servidores DNS a usar (por defecto, los del sistema)")
+    parser.add_argument("--dns-puerto", type=int, default=53, help="Puerto de los servidores DNS (por defecto 53)")
+    parser.add_argument("--resolvedor-estatico", metavar="JSON",
+                        help="Resuelve los MX con un archivo {dominio: [servidores]} en lugar de consultar DNS")
+    parser.add_argument("--concurrencia", type=int, default=CONCURRENCIA_DNS,
+                        help=f"Consultas DNS simultáneas (por defecto {CONCURRENCIA_DNS})")
+    parser.add_argument("--vigencia-dias", type=float, default=VIGENCIA_DOMINIOS_DIAS,
+                        help=f"Días que vale un resultado de entrega guardado (por defecto {VIGENCIA_DOMINIOS_DIAS})")
+    args = parser.parse_args()
+    args.csv = args.csv or sorted(glob.glob(os.path.join(carpeta, "*_agencias_viaje.csv")))
+    return args
+
+
+def main():
+    from normalizacion_correo import NormalizadorCorreos  # Importa email-validator solo al usar la línea de comandos
+
+    args = parsear_argumentos()
+    correos = []
+    for ruta in args.csv:
+        with open(ruta, newline="", encoding="utf-8") as archivo:
+            correos.extend(fila["correo"] for fila in csv.DictReader(archivo) if fila.get("correo"))
+
+    with CacheCorreos(args.cache) as cache:
+        normalizador = NormalizadorCorreos(cache=cache)
+        inicio = time.perf_counter()
+        normalizados = normalizador.normalizar_lote(correos)
+        cache.guardar()
+        segundos = time.perf_counter() - inicio
+        validos = [c for c in normalizados if c]
+        print(f"📬 {len(correos)} correos ({len(set(correos))} distintos), {len(validos)} válidos, "
+              f"en {segundos * 1000:.1f} ms ({len(correos) / max(segundos, 1e-9):,.0f} por segundo)")
+        print(f"🗃️ Caché en disco: {cache.aciertos} aciertos, {cache.fallos} validaciones nuevas ({cache.ruta})")
+
+        if not args.verificar_entrega:
+            return
+        if args.resolvedor_estatico:
+            resolvedor = ResolvedorEstatico.desde_json(args.resolvedor_estatico)
+        else:
+            resolvedor = ResolvedorDNS(args.dns_servidor, args.dns_puerto)
+        dominios = {dominio(c) for c in validos} - {""}
+        inicio = time.perf_counter()
+        entrega = asyncio.run(verificar_dominios(dominios, resolvedor, cache, args.concurrencia, args.vigencia_dias))
+        segundos = time.perf_counter() - inicio
+
+    sin_correo = sorted(d for d, (entregable, _) in entrega.items() if entregable is False)
+    sin_respuesta = sorted(d for d, (entregable, _) in entrega.items() if entregable is None)
+    sin_correo_set = set(sin_correo)
+    afectados = [c for c in dict.fromkeys(validos) if dominio(c) in sin_correo_set]
+    print(f"\n📡 {len(entrega)} dominios verificados en {segundos:.2f} s: {len(sin_correo)} sin servidores de correo, "
+          f"{len(sin_respuesta)} sin respuesta")
+    for correo in afectados[:MOSTRAR_AFECTADOS]:
+        print(f"   ❌ {correo}")
+    if len(afectados) > MOSTRAR_AFECTADOS:
+        print(f"   ... y {len(afectados) - MOSTRAR_AFECTADOS} más")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+# Deduplicación de agencias entre provincias (resolución de entidades) para los resultados del RNAV.
+# La misma agencia aparece en varias provincias, o varias veces en una, con el nombre escrito distinto,
+# el teléfono con otro formato o el correo en mayúsculas. En lugar de comparar todos los pares, las
+# agencias se agrupan en bloques por correo normalizado, por el teléfono en formato E.164 y por cada palabra
+# distintiva del nombre; solo se comparan los pares que comparten un bloque, así que el costo crece casi
+# linealmente con la cantidad de agencias. Los pares que coinciden se unen en grupos (union-find) y cada
+# grupo se resume en un registro canónico.
+#
+# La similitud de nombres usa rapidfuzz si está instalado (pip install rapidfuzz) y difflib si no.
+#
+# Uso desde la línea de comandos:
+#   python deduplicacion_agencias.py                      # Todos los CSV de resultados/
+#   python deduplicacion_agencias.py --almacen            # Lee del almacén resultados/agencias.sqlite
+#   python deduplicacion_agencias.py corrida1/*.csv corrida2/*.csv --miembros grupos.csv
+
+import argparse
+import csv
+import difflib
+import glob
+import itertools
+import os
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+
+from normalizacion_telefono import NormalizadorTelefonos
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+
+COLUMNAS = ["nombre", "telefono", "correo", "localidad", "provincia"]
+
+UMBRAL_SIMILITUD = 0.88  # Similitud mínima de nombres (0 a 1) para considerar dos agencias la misma
+MAX_BLOQUE = 50  # Los bloques más grandes (palabras o contactos muy repetidos) no distinguen agencias y se omiten
+
+# Palabras que no distinguen una agencia de otra: no forman bloques ni cuentan en la similitud
+PALABRAS_COMUNES = {
+    "a", "agencia", "cia", "de", "del", "e", "el", "empresa", "evt", "la", "las", "los", "s", "sa", "servicios",
+    "srl", "tour", "tours", "travel", "tur", "turismo", "turistica", "turisticas", "turistico", "turisticos",
+    "viaje", "viajes", "y",
+}
+
+PATRON_NO_ALFANUMERICO = re.compile(r"[^a-z0-9]+")
+
+
+def normalizar_texto(texto):
+    """Minúsculas sin tildes ni signos, con las palabras separadas por un espacio."""
+    texto = unicodedata.normalize("NFKD", texto or "").encode("ascii", "ignore").decode().lower()
+    return PATRON_NO_ALFANUMERICO.sub(" ", texto).strip()
+
+
+def palabras_distintivas(nombre):
+    """Palabras del nombre normalizado sin las de PALABRAS_COMUNES (todas, si el nombre solo tiene palabras comunes)."""
+    palabras = normalizar_texto(nombre).split()
+    return [p for p in palabras if p not in PALABRAS_COMUNES] or palabras
+
+
+def similitud_nombres(a, b, umbral=UMBRAL_SIMILITUD):
+    """Similitud de 0 a 1 entre dos nombres ya reducidos a sus palabras distintivas ordenadas.
+
+    Las similitudes menores que umbral pueden devolverse como 0: así se descartan rápido los pares que no
+    llegan (con difflib, sin calcular la similitud exacta).
+    """
+    if a == b:
+        return 1.0
+    if fuzz is not None:
+        return fuzz.ratio(a, b, score_cutoff=umbral * 100) / 100
+    comparador = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    return comparador.ratio() if comparador.real_quick_ratio() >= umbral else 0.0
+
+
+class UnionFind:
+    """Conjuntos disjuntos sobre los índices 0..n-1, con compresión de caminos y unión por tamaño."""
+
+    def __init__(self, n):
+        self.padre = list(range(n))
+        self.tamano = [1] * n
+
+    def buscar(self, i):
+        raiz = i
+        while self.padre[raiz] != raiz:
+            raiz = self.padre[raiz]
+        while self.padre[i] != raiz:  # Compresión: todo el camino apunta directo a la raíz
+            self.padre[i], i = raiz, self.padre[i]
+        return raiz
+
+    def unir(self, i, j):
+        i, j = self.buscar(i), self.buscar(j)
+        if i == j:
+            return False
+        if self.tamano[i] < self.tamano[j]:
+            i, j = j, i
+        self.padre[j] = i
+        self.tamano[i] += self.tamano[j]
+        return True
+
+
+class Deduplicador:
+    """Agrupa agencias duplicadas. Las filas son diccionarios con COLUMNAS.
+
+    Las filas con el mismo nombre, correo, teléfono y localidad (por ejemplo, la misma provincia en dos
+    corridas) se reducen a una sola "firma" antes de formar los bloques, así que repetir corridas casi no agrega trabajo.
+    """
+
+    def __init__(self, umbral=UMBRAL_SIMILITUD, max_bloque=MAX_BLOQUE):
+        self.umbral = umbral
+        self.max_bloque = max_bloque
+        self.telefonos = NormalizadorTelefonos()  # "(0351) 15-388-4241" y "+54 9 351 388 4241" quedan iguales
+        self.estadisticas = {}
+
+    def _firmas(self, filas):
+        """Claves normalizadas distintas y, para cada fila, el índice de su firma."""
+        indices, firmas, fila_a_firma = {}, [], []
+        for fila in filas:
+            firma = (
+                " ".join(sorted(palabras_distintivas(fila.get("nombre")))),
+                (fila.get("correo") or "").strip().lower(),
+                self.telefonos.normalizar(fila.get("telefono"))[0],
+                normalizar_texto(fila.get("localidad")),
+                " ".join(sorted(normalizar_texto(fila.get("nombre")).split())),
+            )
+            if firma not in indices:
+                indices[firma] = len(firmas)
+                firmas.append(firma)
+            fila_a_firma.append(indices[firma])
+        return firmas, fila_a_firma
+
+    def _bloques(self, firmas):
+        """Bloques de candidatos: correo, teléfono y cada palabra distintiva del nombre -> índices de firmas."""
+        bloques = defaultdict(list)
+        for i, (nombre, correo, telefono, _, _) in enumerate(firmas):
+            if correo:
+                bloques["c:" + correo].append(i)
+            if telefono:
+                bloques["t:" + telefono].append(i)
+            for palabra in set(nombre.split()):
+                if len(palabra) >= 3:  # Las palabras muy cortas (iniciales, números) generan bloques sin sentido
+                    bloques["n:" + palabra].append(i)
+        return [b for b in bloques.values() if 2 <= len(b) <= self.max_bloque]
+
+    def es_duplicado(self, a, b):
+        """Decide si dos firmas son la misma agencia.
+
+        Con el mismo correo y el mismo teléfono alcanza. Si no, los nombres tienen que parecerse al menos umbral y
+        coincidir además el correo o el teléfono. Con solo la localidad en común, el nombre completo (con las
+        palabras comunes) también tiene que parecerse: "Tucumán Tour Travel" y "Turismo del Tucumán" comparten la
+        palabra distintiva pero son agencias distintas. Dos homónimas de ciudades distintas y sin contacto en
+        común se consideran distintas.
+        """
+        nombre_a, correo_a, telefono_a, localidad_a, completo_a = a
+        nombre_b, correo_b, telefono_b, localidad_b, completo_b = b
+        mismo_correo = bool(correo_a) and correo_a == correo_b
+        mismo_telefono = bool(telefono_a) and telefono_a == telefono_b
+        if mismo_correo and mismo_telefono:
+            return True
+        if not (mismo_correo or mismo_telefono or (localidad_a and localidad_a == localidad_b)):
+            return False
+        if similitud_nombres(nombre_a, nombre_b, self.umbral) < self.umbral:
+            return False
+        if mismo_correo or mismo_telefono:
+            return True
+        return similitud_nombres(completo_a, completo_b, self.umbral) >= self.umbral
+
+    def agrupar(self, filas):
+        """Devuelve, para cada fila, el número de grupo (0, 1, 2... en orden de primera aparición)."""
+        inicio = time.perf_counter()
+        firmas, fila_a_firma = self._firmas(filas)
+        grupos = UnionFind(len(firmas))
+        comparados = set()
+        for bloque in self._bloques(firmas):
+            for i, j in itertools.combinations(bloque, 2):
+                if (i, j) in comparados or grupos.buscar(i) == grupos.buscar(j):
+                    continue  # Par ya evaluado en otro bloque, o ya unidos por transitividad
+                comparados.add((i, j))
+                if self.es_duplicado(firmas[i], firmas[j]):
+                    grupos.unir(i, j)
+
+        numeros = {}
+        resultado = [numeros.setdefault(grupos.buscar(f), len(numeros)) for f in fila_a_firma]
+        self.estadisticas = {
+            "filas": len(filas),
+            "firmas": len(firmas),
+            "pares_comparados": len(comparados),
+            "pares_totales": len(filas) * (len(filas) - 1) // 2,
+            "grupos": len(numeros),
+            "segundos": time.perf_counter() - inicio,
+        }
+        return resultado
+
+
+def _mas_frecuente(valores):
+    """Valor no vacío más repetido (entre empatados, el más largo: suele ser el más completo)."""
+    conteo = Counter(v for v in valores if v)
+    return max(conteo, key=lambda v: (conteo[v], len(v))) if conteo else ""
+
+
+def registros_canonicos(filas, grupos):
+    """Un registro por grupo con el valor más frecuente de cada columna, las provincias en las que aparece y la
+    cantidad de filas que reúne."""
+    miembros = defaultdict(list)
+    for fila, grupo in zip(filas, grupos):
+        miembros[grupo].append(fila)
+    canonicos = []
+    for grupo, integrantes in sorted(miembros.items()):
+        registro = {"grupo": grupo}
+        for columna in COLUMNAS[:-1]:
+            registro[columna] = _mas_frecuente(f.get(columna) for f in integrantes)
+        registro["provincias"] = " | ".join(sorted({f.get("provincia") or "" for f in integrantes} - {""}))
+        registro["registros"] = len(integrantes)
+        canonicos.append(registro)
+    return canonicos
+
+
+def leer_csv(rutas):
+    """Filas de los CSV de resultados indicados."""
+    filas = []
+    for ruta in rutas:
+        with open(ruta, newline="", encoding="utf-8") as archivo:
+            filas.extend(csv.DictReader(archivo))
+    return filas
+
+
+def leer_almacen(ruta=None):
+    """Filas del almacén consolidado (resultados/agencias.sqlite)."""
+    from almacen_agencias import AlmacenAgencias  # Importación diferida: solo hace falta con --almacen
+    with AlmacenAgencias(ruta) as almacen:
+        return almacen.consultar(f"SELECT {', '.join(COLUMNAS)} FROM agencias ORDER BY id")
+
+
+def guardar_csv(filas, ruta):
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=list(filas[0]) if filas else COLUMNAS)
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+
+def parsear_argumentos():
+    carpeta = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+    parser = argparse.ArgumentParser(description="Agrupa las agencias duplicadas entre provincias y genera registros canónicos.")
+    parser.add_argument("csv", nargs="*", help="CSV a deduplicar (por defecto, todos los *_agencias_viaje.csv de resultados/)")
+    parser.add_argument("--almacen", nargs="?", const="", metavar="RUTA",
+                        help="Lee las agencias del almacén SQLite (por defecto resultados/agencias.sqlite) en lugar de los CSV")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_SIMILITUD,
+                        help=f"Similitud mínima de nombres entre 0 y 1 (por defecto {UMBRAL_SIMILITUD})")
+    parser.add_argument("--max-bloque", type=int, default=MAX_BLOQUE,
+                        help=f"Tamaño máximo de un bloque de candidatos (por defecto {MAX_BLOQUE})")
+    parser.add_argument("--salida", default=os.path.join(carpeta, "agencias_deduplicadas.csv"),
+                        help="CSV de registros canónicos (por defecto resultados/agencias_deduplicadas.csv)")
+    parser.add_argument("--miembros", help="CSV con cada fila original y su número de grupo")
+    args = parser.parse_args()
+    if not args.csv and args.almacen is None:
+        args.csv = sorted(glob.glob(os.path.join(carpeta, "*_agencias_viaje.csv")))
+    return args
+
+
+def main():
+    args = parsear_argumentos()
+    filas = leer_almacen(args.almacen or None) if args.almacen is not None else leer_csv(args.csv)
+    deduplicador = Deduplicador(args.umbral, args.max_bloque)
+    grupos = deduplicador.agrupar(filas)
+    canonicos = registros_canonicos(filas, grupos)
+
+    guardar_csv(canonicos, args.salida)
+    if args.miembros:
+        guardar_csv([{"grupo": g, **f} for f, g in zip(filas, grupos)], args.miembros)
+
+    e = deduplicador.estadisticas
+    print(f"📄 {e['filas']} filas ({e['firmas']} distintas) -> {e['grupos']} agencias")
+    print(f"🔎 {e['pares_comparados']:,} pares comparados de {e['pares_totales']:,} posibles "
+          f"({'rapidfuzz' if fuzz is not None else 'difflib'}) en {e['segundos'] * 1000:.0f} ms")
+    multiples = sorted((c for c in canonicos if c["registros"] > 1), key=lambda c: -c["registros"])
+    print(f"🔁 {len(multiples)} agencias con más de una fila; las más repetidas:")
+    for c in multiples[:5]:
+        print(f"   {c['registros']:>3}  {c['nombre']}  ({c['provincias']})")
+    print(f"✅ Registros canónicos guardados en: {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
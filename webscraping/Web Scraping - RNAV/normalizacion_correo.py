@@ -0,0 +1,131 @@
+# Motor de normalización de correos electrónicos del scraper del RNAV.
+# Aplica las mismas reglas que la versión original de normalizar_correo, pero con las expresiones
+# regulares compiladas una sola vez, las correcciones de dominio en una tabla (en lugar de cadenas de
+# if/elif) y una caché LRU de validaciones: las direcciones que se repiten entre agencias o provincias
+# se validan con email-validator una sola vez. Con una CacheCorreos (cache_correos.py) los veredictos se
+# guardan además en disco y las corridas siguientes no vuelven a validar las direcciones conocidas.
+
+import functools
+import re
+
+from email_validator import validate_email, EmailNotValidError
+
+# Símbolos que se usan en lugar de @ (se reemplazan todos en una sola pasada)
+PATRON_ARROBA = re.compile(r"\(at\)|\[at\]|\(arroba\)|\[arroba\]")
+
+# Caracteres que se eliminan (todo excepto letras, números, @ y .)
+PATRON_CARACTERES_INVALIDOS = re.compile(r"[^a-zA-Z0-9@.]")
+
+# Proveedores comunes -> dominio completo. Se usa para agregar el @ o el .com que falten.
+# El orden importa: se aplica la primera regla que coincide, igual que en la versión original.
+DOMINIOS_COMUNES = {
+    "gmail": "gmail.com",
+    "hotmail": "hotmail.com",
+    "yahoo": "yahoo.com",
+}
+
+# Cantidad de validaciones que se guardan en la caché
+TAMANO_CACHE_POR_DEFECTO = 65536
+
+
+def limpiar_correo(correo):
+    """Aplica las correcciones de texto (sin validar): @ escritos con palabras, @ o .com faltantes,
+    caracteres especiales y mayúsculas."""
+    correo = PATRON_ARROBA.sub("@", correo.strip())
+
+    if "@" not in correo:  # Falta el @: se agrega antes del dominio del primer proveedor que aparezca
+        for dominio in DOMINIOS_COMUNES.values():
+            if dominio in correo:
+                correo = correo.replace(dominio, "@" + dominio)
+                break
+
+    if not correo.endswith(".com") and any("@" + proveedor in correo for proveedor in DOMINIOS_COMUNES):
+        correo += ".com"  # Falta el .com en un proveedor común
+
+    return PATRON_CARACTERES_INVALIDOS.sub("", correo).lower()
+
+
+def validar_correo(correo):
+    """Valida un correo ya limpio con email-validator. Devuelve la forma normalizada o None si no es válido."""
+    try:
+        return validate_email(correo, check_deliverability=False).normalized
+    except EmailNotValidError:
+        return None
+
+
+class NormalizadorCorreos:
+    """Normaliza y valida correos con una caché LRU de validaciones.
+
+    Cada instancia tiene su propia caché; cache_info() devuelve aciertos y fallos. Si se pasa una CacheCorreos, la
+    LRU consulta primero los veredictos guardados en disco y guarda ahí los nuevos (ver guardar_cache).
+    """
+
+    def __init__(self, tamano_cache=TAMANO_CACHE_POR_DEFECTO, cache=None):
+        self.cache = cache
+        validar = validar_correo if cache is None else self._validar_con_cache
+        self._validar = functools.lru_cache(maxsize=tamano_cache)(validar)
+
+    def _validar_con_cache(self, correo):
+        normalizado = self.cache.validacion(correo)
+        if normalizado is None:
+            normalizado = validar_correo(correo) or ""
+            self.cache.guardar_validacion(correo, normalizado)
+        return normalizado or None
+
+    def normalizar(self, correo):
+        """Devuelve el correo normalizado, o "" si está vacío o no es válido."""
+        if not isinstance(correo, str) or not correo:
+            return ""
+        return self._validar(limpiar_correo(correo)) or ""
+
+    def normalizar_lote(self, correos):
+        """Normaliza una columna completa (lista o Series de pandas) procesando cada valor distinto una sola vez.
+
+        Devuelve una lista, o una Series con el mismo índice si se pasó una Series.
+        """
+        if hasattr(correos, "fillna"):  # Series de pandas: los vacíos (NaN) quedan como ""
+            correos = correos.fillna("")
+        resultados = {correo: self.normalizar(correo) for correo in dict.fromkeys(correos)}
+        if hasattr(correos, "map"):
+            return correos.map(resultados)
+        return [resultados[correo] for correo in correos]
+
+    def cache_info(self):
+        return self._validar.cache_info()
+
+    def limpiar_cache(self):
+        self._validar.cache_clear()
+
+    def guardar_cache(self):
+        """Escribe en disco los veredictos nuevos de la caché persistente (si hay una)."""
+        if self.cache is not None:
+            self.cache.guardar()
+
+
+def normalizar_version_anterior(correo):
+    """Versión original de normalizar_correo, sin caché ni reglas compiladas (se usa en el benchmark)."""
+    if not correo:
+        return ""
+    correo = correo.strip()
+    correo = correo.replace('(at)', '@')
+    correo = correo.replace('[at]', '@')
+    correo = correo.replace('(arroba)', '@')
+    correo = correo.replace('[arroba]', '@')
+    if 'gmail.com' in correo and '@' not in correo:
+        correo = correo.replace('gmail.com', '@gmail.com')
+    elif 'hotmail.com' in correo and '@' not in correo:
+        correo = correo.replace('hotmail.com', '@hotmail.com')
+    elif 'yahoo.com' in correo and '@' not in correo:
+        correo = correo.replace('yahoo.com', '@yahoo.com')
+    if '@gmail' in correo and not correo.endswith('.com'):
+        correo += '.com'
+    elif '@hotmail' in correo and not correo.endswith('.com'):
+        correo += '.com'
+    elif '@yahoo' in correo and not correo.endswith('.com'):
+        correo += '.com'
+    correo = re.sub(r'[^a-zA-Z0-9@.]', '', correo)
+    correo = correo.lower()
+    try:
+        return validate_email(correo, check_deliverability=False).normalized
+    except EmailNotValidError:
+        return ""
@@ -0,0 +1,215 @@
+# Normalización de los teléfonos del RNAV al formato internacional E.164 (+54...).
+# Los teléfonos se guardan tal como aparecen en el sitio: "(011) 26187000", "(54) 01134888482",
+# "(351) 15-388-4241", "(03518) 181677 / 181662"... Este módulo detecta el código de área con la tabla
+# de áreas argentinas (probando primero el código más largo posible), quita el 0 de larga distancia,
+# reconoce los celulares (el 15 local o el 9 internacional) y marca como inválidos los números que no
+# tienen la cantidad de dígitos de un número argentino. No es un cálculo vectorizado: cada valor se
+# analiza con una llamada de Python, pero una columna completa procesa cada valor distinto una sola vez,
+# con una caché LRU compartida entre provincias (igual que el motor de correos).
+#
+# Uso desde la línea de comandos:
+#   python normalizacion_telefono.py                        # Resumen sobre todos los CSV de resultados/
+#   python normalizacion_telefono.py --invalidos 20         # Muestra los teléfonos que no se pudieron normalizar
+#   python normalizacion_telefono.py --salida telefonos.csv # Guarda las filas con telefono_e164 y telefono_estado
+
+import argparse
+import csv
+import functools
+import glob
+import os
+import re
+import time
+from collections import Counter
+
+PREFIJO_PAIS = "54"
+DIGITOS_NACIONALES = 10  # Código de área + número de abonado, sin el 0 ni el 15
+
+# Códigos de área de 3 dígitos. El 11 (AMBA) es el único de 2; el resto de los que empiezan con 2 o 3 son de 4.
+AREAS_3_DIGITOS = frozenset({
+    "220", "221", "223", "230", "236", "237", "249", "260", "261", "263", "264", "266", "280", "291", "294", "297",
+    "298", "299", "336", "341", "342", "343", "345", "348", "351", "353", "358", "362", "364", "370", "376", "379",
+    "380", "381", "383", "385", "387", "388",
+})
+
+# Valores de la columna telefono_estado
+FIJO, MOVIL, INVALIDO, VACIO = "fijo", "movil", "invalido", "vacio"
+
+# Columnas que agrega la normalización (en normalizar_filas y en el almacén consolidado)
+COLUMNAS_TELEFONO = ["telefono_e164", "telefono_estado"]
+
+TAMANO_CACHE_POR_DEFECTO = 65536
+
+# Versión de las reglas: cuando cambia, el almacén consolidado recalcula los teléfonos que ya tenía guardados
+VERSION_REGLAS = 2
+
+PATRON_NO_DIGITO = re.compile(r"\D")
+PATRON_PARENTESIS = re.compile(r"\s*\(([^)]*)\)(.*)")
+
+
+def area_valida(area):
+    """True si area puede ser un código de área argentino: el 11, uno de la tabla de 3 dígitos o uno de 4
+    que empiece con 2 o 3 (incluidos los viejos de 4 dígitos, como el 2944, que hoy son de 3)."""
+    if len(area) == 2:
+        return area == "11"
+    if len(area) == 3:
+        return area in AREAS_3_DIGITOS
+    return len(area) == 4 and area[0] in "23"
+
+
+def _separar_con_area(numero, largo_area, movil):
+    """(área, abonado, celular) si el número se puede leer con un área de largo_area dígitos, o None."""
+    area, abonado = numero[:largo_area], numero[largo_area:]
+    if not area_valida(area):
+        return None
+    largo_abonado = DIGITOS_NACIONALES - largo_area
+    if len(abonado) == largo_abonado + 2 and abonado.startswith("15") and abonado[2] != "0":
+        return area, abonado[2:], True  # Después del 15 el número puede empezar con 1
+    if len(abonado) != largo_abonado or abonado[0] in "01":  # Los números de abonado no empiezan con 0 ni con 1
+        return None
+    return area, abonado, movil
+
+
+def _separar_nacional(numero, movil=False):
+    """(área, abonado, celular) de un número nacional sin prefijo de país, o None si no es válido.
+
+    Prueba el código de área más largo primero (4, 3 y 2 dígitos) y se queda con el primero que deja un número
+    de abonado de la longitud correcta: así "(2944) 15 123456" se lee como área 2944 + 15 + 123456 y no como
+    área 294 seguida de un número inválido. Acepta el 0 de larga distancia, el 15 de los celulares (después del
+    área o delante del número completo).
+    """
+    numero = numero.lstrip("0")
+    for largo_area in (4, 3, 2):
+        partes = _separar_con_area(numero, largo_area, movil)
+        if partes is not None:
+            return partes
+    if numero.startswith("15") and len(numero) == DIGITOS_NACIONALES + 2:  # "(15) 1159541376"
+        return _separar_nacional(numero[2:], True)
+    return None
+
+
+def normalizar_telefono(telefono):
+    """Devuelve (número E.164, estado) de un teléfono tal como se extrajo del sitio.
+
+    Si el campo tiene varios números separados por "/" se usa el primero. El estado es FIJO, MOVIL, INVALIDO
+    o VACIO; el número E.164 es "" si el estado es INVALIDO o VACIO.
+    """
+    primero = (telefono or "").split("/")[0]
+    digitos = PATRON_NO_DIGITO.sub("", primero)
+    if not digitos:
+        return "", VACIO
+
+    movil = False
+    parentesis = PATRON_PARENTESIS.match(primero)
+    entre, despues = (PATRON_NO_DIGITO.sub("", grupo) for grupo in parentesis.groups()) if parentesis else ("", "")
+    if entre.startswith(PREFIJO_PAIS):
+        # "(54) ...", "(+549) ...", "(+54 9) ...", "(5411) ...": el paréntesis empieza con el prefijo de país
+        resto = entre[len(PREFIJO_PAIS):]
+        if resto.startswith("9"):
+            resto, movil = resto[1:], True
+        digitos = resto + despues
+    elif digitos.startswith(PREFIJO_PAIS) and len(digitos) >= DIGITOS_NACIONALES + 2:
+        digitos = digitos[len(PREFIJO_PAIS):]  # Prefijo de país sin paréntesis: "+54 9 351 ..."
+    if digitos.startswith("9") and len(digitos) == DIGITOS_NACIONALES + 1:
+        digitos, movil = digitos[1:], True  # El 9 de los celulares en formato internacional
+
+    partes = _separar_nacional(digitos, movil)
+    if partes is None and not entre.startswith(PREFIJO_PAIS) \
+            and len(despues.lstrip("0")) == DIGITOS_NACIONALES and len(despues) <= DIGITOS_NACIONALES + 1:
+        # Lo que sigue al paréntesis ya es el número completo: "(11) 1155286408" o "(2901) 02901488787". Con el
+        # 0 de larga distancia es la forma de marcar un fijo; sin el 0 es la de los celulares en formato
+        # internacional o de WhatsApp (+54 9 11 5528-6408, sin el 9).
+        partes = _separar_nacional(despues, not despues.startswith("0"))
+    if partes is None:
+        return "", INVALIDO
+    area, abonado, movil = partes
+    return f"+{PREFIJO_PAIS}{'9' if movil else ''}{area}{abonado}", MOVIL if movil else FIJO
+
+
+class NormalizadorTelefonos:
+    """Normaliza teléfonos con una caché LRU de resultados.
+
+    Cada instancia tiene su propia caché; cache_info() devuelve aciertos y fallos.
+    """
+
+    def __init__(self, tamano_cache=TAMANO_CACHE_POR_DEFECTO):
+        self._normalizar = functools.lru_cache(maxsize=tamano_cache)(normalizar_telefono)
+
+    def normalizar(self, telefono):
+        """Devuelve (número E.164, estado); ver normalizar_telefono."""
+        if not isinstance(telefono, str):
+            telefono = ""
+        return self._normalizar(telefono)
+
+    def normalizar_lote(self, telefonos):
+        """Normaliza una columna completa (lista o Series de pandas) procesando cada valor distinto una sola vez.
+
+        No es vectorizado: cada valor distinto es una llamada a normalizar (con la caché LRU) y el resultado se
+        reparte a las filas con un diccionario. Devuelve dos listas (números E.164 y estados), o dos Series con el mismo índice si se pasó una Series.
+        """
+        if hasattr(telefonos, "fillna"):  # Series de pandas: los vacíos (NaN) quedan como ""
+            telefonos = telefonos.fillna("")
+        resultados = {telefono: self.normalizar(telefono) for telefono in dict.fromkeys(telefonos)}
+        if hasattr(telefonos, "map"):
+            return telefonos.map(lambda t: resultados[t][0]), telefonos.map(lambda t: resultados[t][1])
+        return [resultados[t][0] for t in telefonos], [resultados[t][1] for t in telefonos]
+
+    def normalizar_filas(self, filas):
+        """Agrega telefono_e164 y telefono_estado a cada fila (diccionarios con la columna telefono). Devuelve las filas."""
+        numeros, estados = self.normalizar_lote([fila.get("telefono") or "" for fila in filas])
+        for fila, numero, estado in zip(filas, numeros, estados):
+            fila["telefono_e164"], fila["telefono_estado"] = numero, estado
+        return filas
+
+    def cache_info(self):
+        return self._normalizar.cache_info()
+
+    def limpiar_cache(self):
+        self._normalizar.cache_clear()
+
+
+def parsear_argumentos():
+    carpeta = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+    parser = argparse.ArgumentParser(description="Normaliza los teléfonos de los CSV del RNAV al formato E.164.")
+    parser.add_argument("csv", nargs="*", help="CSV a procesar (por defecto, todos los *_agencias_viaje.csv de resultados/)")
+    parser.add_argument("--invalidos", type=int, default=0, metavar="N", help="Muestra hasta N teléfonos inválidos distintos")
+    parser.add_argument("--salida", help="Guarda todas las filas con las columnas telefono_e164 y telefono_estado en este CSV")
+    args = parser.parse_args()
+    args.csv = args.csv or sorted(glob.glob(os.path.join(carpeta, "*_agencias_viaje.csv")))
+    return args
+
+
+def main():
+    args = parsear_argumentos()
+    filas = []
+    for ruta in args.csv:
+        with open(ruta, newline="", encoding="utf-8") as archivo:
+            filas.extend(csv.DictReader(archivo))
+
+    normalizador = NormalizadorTelefonos()
+    inicio = time.perf_counter()
+    normalizador.normalizar_filas(filas)
+    segundos = time.perf_counter() - inicio
+
+    estados = Counter(fila["telefono_estado"] for fila in filas)
+    distintos = normalizador.cache_info().currsize
+    print(f"📞 {len(filas)} teléfonos ({distintos} distintos) en {segundos * 1000:.1f} ms "
+          f"({len(filas) / max(segundos, 1e-9):,.0f} por segundo)")
+    for estado in (FIJO, MOVIL, INVALIDO, VACIO):
+        print(f"   {estado:<9}{estados[estado]:>6}")
+
+    if args.invalidos:
+        invalidos = Counter(fila["telefono"] for fila in filas if fila["telefono_estado"] == INVALIDO)
+        print("\nTeléfonos inválidos más frecuentes:")
+        for telefono, cantidad in invalidos.most_common(args.invalidos):
+            print(f"   {cantidad:>3}  {telefono}")
+
+    if args.salida:
+        with open(args.salida, "w", newline="", encoding="utf-8") as archivo:
+            escritor = csv.DictWriter(archivo, fieldnames=list(filas[0]) if filas else COLUMNAS_TELEFONO)
+            escritor.writeheader()
+            escritor.writerows(filas)
+        print(f"\n✅ Guardado en: {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,19 @@
+import argparse  # Importa argparse para leer los parámetros de línea de comandos
 import asyncio  # Importa la biblioteca para programación asíncrona
-import csv  # Importa la biblioteca para manejar archivos CSV
 import pandas as pd  # Importa pandas para análisis de datos
 import os  # Importa el módulo de sistema operativo para operaciones de archivos
-import re  # Importa el módulo re para operaciones de expresiones regulares
+import sys  # Importa sys para poder importar los módulos compartidos de la carpeta webscraping
+import time  # Importa time para medir la duración de cada provincia
 #from google.colab import drive  # Importación de Google Drive (comentada)
 from playwright.async_api import async_playwright, TimeoutError  # Importa playwright para web scraping
-from email_validator import validate_email, EmailNotValidError
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Carpeta webscraping (módulos compartidos)
+from bloqueo_recursos import BloqueadorRecursos  # Bloqueo de imágenes, fuentes, videos y dominios externos
+from checkpoint import DiarioCheckpoint, ruta_checkpoint  # Diario de páginas terminadas para poder reanudar
+from escritor_csv import EscritorCSV  # Escritura del CSV página por página, con reemplazo atómico al terminar
+from almacen_agencias import AlmacenAgencias, actualizar_desde_csv  # Almacén SQLite consolidado y correcciones de correo
+from normalizacion_correo import NormalizadorCorreos, normalizar_version_anterior  # Reglas compiladas + caché de validaciones
+from cache_correos import CacheCorreos, ResolvedorDNS, dominio, verificar_dominios  # Caché en disco y verificación MX
 
 # Montar Google Drive
 #drive.mount('/content/drive')  # Monta Google Drive en el entorno (comentado)
@@ -37,20 +45,108 @@ PROVINCIAS = [
     "Tucumán"
 ]
 
-# Lista para almacenar correos inválidos
+# Columnas del CSV de resultados
+COLUMNAS_CSV = ["nombre", "telefono", "correo", "localidad", "provincia"]
+
+# Cantidad de provincias que se scrapean en paralelo en el modo "todas las provincias"
+CONCURRENCIA_POR_DEFECTO = 4
+
+# Esperas fijas que usaba la versión anterior (solo se usan para informar cuánto tiempo se ahorra)
+ESPERA_FIJA_BUSQUEDA_MS = 2000
+ESPERA_FIJA_MODAL_MS = 1000
+ESPERA_FIJA_SIGUIENTE_MS = 2500
+
+# Tiempo máximo para que cambie la lista de resultados luego de buscar o pasar de página
+TIMEOUT_CAMBIO_RESULTADOS_MS = 20000
+
+# Firma de la página de resultados: indicador de página actual + nombres de las agencias listadas
+JS_FIRMA_RESULTADOS = """
+    () => {
+        const actual = document.querySelector('[aria-current=page]');
+        const nombres = Array.from(document.querySelectorAll('h3.text-lg')).map(h => h.innerText.trim());
+        return (actual ? actual.innerText.trim() : '') + '|' + nombres.join('|');
+    }
+"""
+
+# Condición que se cumple cuando Livewire terminó de renderizar una lista de resultados distinta a la anterior
+JS_RESULTADOS_CAMBIARON = """
+    (anterior) => {
+        const actual = document.querySelector('[aria-current=page]');
+        const nombres = Array.from(document.querySelectorAll('h3.text-lg')).map(h => h.innerText.trim());
+        const firma = (actual ? actual.innerText.trim() : '') + '|' + nombres.join('|');
+        return nombres.length > 0 && firma !== anterior;
+    }
+"""
+
+# Extrae en una sola evaluación el nombre y los párrafos de datos de cada agencia de la página
+JS_EXTRAER_PAGINA = """
+    (titulos) => titulos.map(h3 => {
+        const contenedor = h3.parentElement ? h3.parentElement.parentElement : null;
+        const parrafos = contenedor
+            ? Array.from(contenedor.querySelectorAll('p.leading-relaxed.text-sm')).map(p => p.innerText)
+            : [];
+        return { nombre: h3.innerText, parrafos: parrafos };
+    })
+"""
+
+# Lista para almacenar correos inválidos de la corrida (cada provincia junta los suyos y los agrega al terminar)
 correos_invalidos = []
-nombre_agencia_actual = ""
 
-def corregir_correos_invalidos():
+# Normalizador de correos compartido por todas las provincias (la caché de validaciones sirve entre provincias).
+# Los veredictos se guardan en resultados/cache_correos.sqlite: las corridas siguientes no revalidan los conocidos.
+normalizador_correos = NormalizadorCorreos(cache=CacheCorreos())
+
+# Resolvedor de registros MX para verificar que el dominio de cada correo reciba correo (--verificar-entrega).
+# Con None (por defecto) solo se valida el formato de los correos.
+resolvedor_entrega = None
+
+def aplicar_correcciones_csv(ruta_csv, correcciones):
+    """Aplica correcciones (nombre de la agencia -> correo) al CSV de la provincia en una sola pasada vectorizada.
+
+    Solo se completan los correos vacíos (los que el sitio tenía inválidos): si la agencia ya publica un correo
+    válido, ese tiene prioridad sobre una corrección vieja. Devuelve la cantidad de filas corregidas.
+    """
+    if not correcciones or not os.path.exists(ruta_csv):
+        return 0
+    df = pd.read_csv(ruta_csv, dtype=str, keep_default_na=False)  # Todo como texto: no altera teléfonos ni vacíos
+    corregir = df["correo"].eq("") & df["nombre"].isin(correcciones.keys())
+    cambios = int(corregir.sum())
+    if cambios:
+        df.loc[corregir, "correo"] = df.loc[corregir, "nombre"].map(correcciones)
+        df.to_csv(ruta_csv, index=False)
+    return cambios
+
+
+def aplicar_correcciones_guardadas(provincia, ruta_csv):
+    """Aplica al CSV recién terminado las correcciones de correo guardadas en corridas anteriores y quita esas
+    agencias de la lista de correos inválidos (no hace falta volver a ingresarlas)."""
     global correos_invalidos
+    try:
+        with AlmacenAgencias() as almacen:
+            correcciones = almacen.correcciones(provincia)
+    except Exception as e:
+        print(f"⚠️ No se pudieron leer las correcciones guardadas de {provincia}: {e}")
+        return
+    cambios = aplicar_correcciones_csv(ruta_csv, correcciones)
+    if cambios:
+        print(f"✏️ [{provincia}] {cambios} correos completados con correcciones guardadas")
+    correos_invalidos = [c for c in correos_invalidos
+                         if not (c["provincia"] == provincia and c["nombre_agencia"] in correcciones)]
+
 
-    if not correos_invalidos:
+def corregir_correos_invalidos(provincia, ruta_csv=None):
+    """Pide la corrección de cada correo inválido de la provincia, la guarda en el almacén (para aplicarla sola en
+    las próximas corridas) y la aplica al CSV de la provincia si se indica ruta_csv."""
+    global correos_invalidos
+
+    pendientes = [c for c in correos_invalidos if c["provincia"] == provincia]
+    if not pendientes:
         print("\n✅ No hay correos inválidos para corregir.")
         return
 
-    correcciones = {}
+    correcciones = {}  # Nombre de la agencia -> (correo original, correo corregido)
 
-    for i, item in enumerate(correos_invalidos, 1):
+    for i, item in enumerate(pendientes, 1):
         nombre_agencia = item["nombre_agencia"]
         correo_invalido = item["correo"]
 
@@ -59,35 +155,30 @@ def corregir_correos_invalidos():
         nuevo_correo = input("Ingrese el correo corregido (o Enter para dejarlo en blanco): ").strip()
 
         if nuevo_correo:
-            correcciones[nombre_agencia] = nuevo_correo
-
-    # Actualizar el archivo CSV
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    results_dir = os.path.join(script_dir, "resultados")
-    csv_files = [f for f in os.listdir(results_dir) if f.endswith('.csv')]
+            correo_normalizado = normalizador_correos.normalizar(nuevo_correo)
+            if not correo_normalizado:
+                print("⚠️ El correo ingresado tampoco es válido; se guarda tal como se escribió.")
+            correcciones[nombre_agencia] = (correo_invalido, correo_normalizado or nuevo_correo)
 
-    if not csv_files:
-        print("❌ No se encontró archivo CSV para actualizar.")
+    if not correcciones:
+        print("\n⚠️ No se realizaron cambios en el archivo.")
         return
 
-    csv_file = os.path.join(results_dir, csv_files[-1])
-    df = pd.read_csv(csv_file)
-
-    cambios = 0
-    for i, row in df.iterrows():
-        nombre = row["nombre"]
-        if nombre in correcciones:
-            df.at[i, "correo"] = correcciones[nombre]
-            cambios += 1
+    # Guarda las correcciones para las próximas corridas
+    with AlmacenAgencias() as almacen:
+        almacen.guardar_correcciones(provincia, ((nombre, original, corregido)
+                                                 for nombre, (original, corregido) in correcciones.items()))
 
-    if cambios:
-        df.to_csv(csv_file, index=False)
-        print(f"\n✅ Se corrigieron {cambios} correos en: {csv_file}")
+    # Actualiza el CSV de la provincia en una sola pasada
+    if ruta_csv:
+        cambios = aplicar_correcciones_csv(ruta_csv, {nombre: corregido for nombre, (_, corregido) in correcciones.items()})
+        print(f"\n✅ Se corrigieron {cambios} correos en: {ruta_csv}")
     else:
-        print("\n⚠️ No se realizaron cambios en el archivo.")
+        print("\n💾 Correcciones guardadas: se aplicarán cuando la provincia se complete.")
 
     # Limpiar correos corregidos
-    correos_invalidos = [c for c in correos_invalidos if c["nombre_agencia"] not in correcciones]
+    correos_invalidos = [c for c in correos_invalidos
+                         if not (c["provincia"] == provincia and c["nombre_agencia"] in correcciones)]
 
 def mostrar_correos_invalidos():
     global correos_invalidos
@@ -96,7 +187,8 @@ def mostrar_correos_invalidos():
         for i, item in enumerate(correos_invalidos, 1):
             nombre = item.get("nombre_agencia", "(Sin nombre)")
             correo = item.get("correo", "")
-            print(f"{i}. 🏢 Agencia: {nombre}\n   📧 Correo: {correo}\n")
+            provincia = item.get("provincia", "")
+            print(f"{i}. 🏢 Agencia: {nombre} ({provincia})\n   📧 Correo: {correo}\n")
     else:
         print("\n✅ No se encontraron correos electrónicos inválidos en esta búsqueda.")
 
@@ -105,205 +197,535 @@ def mostrar_menu():
     print("\n=== MENÚ DE PROVINCIAS ===")
     for i, provincia in enumerate(PROVINCIAS, 1):
         print(f"{i}. {provincia}")
+    print("T. Todas las provincias (en paralelo)")
     print("0. Salir")
     return input("\nSeleccione una provincia (número): ")
 
 
 def normalizar_correo(correo):
-    global correos_invalidos
-    """Normaliza y valida un correo electrónico."""
+    """Normaliza y valida un correo electrónico (ver normalizacion_correo.py). Devuelve "" si no es válido."""
     if not correo:
         return ""
-    
-    correo_original = correo  # Guardamos el correo original para el registro
-    
-    # Elimina espacios en blanco
-    correo = correo.strip()
-    
-    # Reemplaza símbolos comunes que se usan en lugar de @
-    correo = correo.replace('(at)', '@')
-    correo = correo.replace('[at]', '@')
-    correo = correo.replace('(arroba)', '@')
-    correo = correo.replace('[arroba]', '@')
-    
-    # Verifica si falta el @ y lo agrega en casos comunes
-    if 'gmail.com' in correo and '@' not in correo:
-        correo = correo.replace('gmail.com', '@gmail.com')
-    elif 'hotmail.com' in correo and '@' not in correo:
-        correo = correo.replace('hotmail.com', '@hotmail.com')
-    elif 'yahoo.com' in correo and '@' not in correo:
-        correo = correo.replace('yahoo.com', '@yahoo.com')
-    
-    # Verifica si falta el .com en dominios comunes
-    if '@gmail' in correo and not correo.endswith('.com'):
-        correo += '.com'
-    elif '@hotmail' in correo and not correo.endswith('.com'):
-        correo += '.com'
-    elif '@yahoo' in correo and not correo.endswith('.com'):
-        correo += '.com'
-    
-    # Elimina caracteres especiales excepto @ y .
-    correo = re.sub(r'[^a-zA-Z0-9@.]', '', correo)
-    
-    # Convierte a minúsculas
-    correo = correo.lower()
-    
-    # Validación final con email-validator
+    return normalizador_correos.normalizar(correo)
+
+async def firma_resultados(page):
+    """Devuelve la firma de la página de resultados que se está mostrando."""
+    return await page.evaluate(JS_FIRMA_RESULTADOS)
+
+
+async def esperar_cambio_resultados(page, firma_anterior, timeout=TIMEOUT_CAMBIO_RESULTADOS_MS):
+    """Espera a que la lista de agencias o el indicador de página cambien respecto de firma_anterior."""
+    await page.wait_for_function(JS_RESULTADOS_CAMBIARON, arg=firma_anterior, timeout=timeout)
+
+
+async def buscar_provincia(page, provincia):
+    """Abre el buscador, escribe la provincia y espera los resultados. Devuelve los segundos esperados."""
+    print(f"[{provincia}] 🌐 Cargando página...")
+    await page.goto("https://www.agenciasdeviajes.ar/#buscador", timeout=30000)  # Navega a la página de agencias de viaje
+
+    print(f"[{provincia}] ⌨️ Buscando '{provincia}'...")
+    await page.wait_for_selector("input[placeholder*='Ciudad o Provincia']", timeout=20000)  # Espera a que aparezca el campo de búsqueda
+    firma_anterior = await firma_resultados(page)  # Lista que se muestra antes de buscar (puede estar vacía)
+    await page.fill("input[placeholder*='Ciudad o Provincia']", provincia)  # Completa el campo de búsqueda con la provincia
+
+    print(f"[{provincia}] ⌛ Esperando resultados...")
+    inicio_espera = time.perf_counter()
     try:
-        # Validar el correo
-        emailinfo = validate_email(correo, check_deliverability=False)
-        # Normalizar el correo (por ejemplo, convierte 'Gmail.com' a 'gmail.com')
-        correo = emailinfo.normalized
-    except EmailNotValidError:
-        # Si el correo no es válido, lo agregamos a la lista de inválidos
-        if correo_original:
-            correos_invalidos.append({"nombre_agencia": nombre_agencia_actual, "correo": correo_original})
-            
-        return ""
-    
-    return correo
+        await esperar_cambio_resultados(page, firma_anterior)  # Espera a que Livewire muestre los resultados filtrados
+    except TimeoutError:
+        pass  # La lista no cambió (por ejemplo, ya mostraba esa provincia); se confirma con el selector de abajo
+    await page.wait_for_selector("h3.text-lg", timeout=20000)  # Espera a que aparezcan los resultados
+
+    return time.perf_counter() - inicio_espera
+
+
+async def extraer_pagina(page):
+    """Devuelve nombre y párrafos de cada agencia de la página actual con una sola llamada a Playwright."""
+    return await page.eval_on_selector_all("h3.text-lg", JS_EXTRAER_PAGINA)
+
+
+async def extraer_pagina_por_elemento(page):
+    """Versión anterior de extraer_pagina: varias idas y vueltas a Playwright por agencia (se usa en el benchmark)."""
+    bloques = []
+    h3_agencias = await page.query_selector_all("h3.text-lg")  # Obtiene todos los nombres de agencias
+    for h3 in h3_agencias:  # Recorre cada agencia encontrada
+        nombre = await h3.inner_text()  # Obtiene el nombre de la agencia
+        textos = []
+
+        contenedor = await h3.evaluate_handle("node => node.parentElement.parentElement")  # Obtiene el contenedor padre que tiene toda la info
+        contenedor_element = contenedor.as_element()  # Convierte a elemento para poder interactuar
+
+        if contenedor_element:  # Si se encontró el contenedor
+            parrafos = await contenedor_element.query_selector_all("p.leading-relaxed.text-sm")  # Obtiene todos los párrafos con información
+            for p in parrafos:  # Recorre cada párrafo
+                textos.append(await p.inner_text())  # Obtiene el texto del párrafo
+
+        bloques.append({"nombre": nombre, "parrafos": textos})
+    return bloques
+
+
+def parsear_agencia(nombre, parrafos, provincia, invalidos):
+    """Arma el registro de una agencia a partir de su nombre y los textos de sus párrafos.
+
+    Si el correo no es válido, se agrega a la lista invalidos (la de la página que se está procesando) con el
+    correo original, y el registro queda con el correo vacío.
+    """
+    telefono = ""
+    correo = ""
+    localidad = ""
+
+    for texto in parrafos:  # Recorre cada párrafo
+        if "Teléfono:" in texto:  # Si contiene información de teléfono
+            telefono = texto.replace("Teléfono:", "").strip()  # Extrae el número de teléfono
+        if "Correo electrónico:" in texto:  # Si contiene información de correo
+            correo_original = texto.replace("Correo electrónico:", "").strip()
+            correo = normalizar_correo(correo_original)  # Normaliza el correo
+            if correo_original and not correo:  # Guardamos el correo original para poder corregirlo después
+                invalidos.append({"nombre_agencia": nombre, "correo": correo_original, "provincia": provincia})
+        if "Localidad:" in texto:  # Si contiene información de localidad
+            localidad = texto.replace("Localidad:", "").strip()  # Extrae la localidad
+
+    return {
+        "nombre": nombre,
+        "telefono": telefono,
+        "correo": correo,
+        "localidad": localidad,
+        "provincia": provincia
+    }
+
+
+async def verificar_entrega(agencias, invalidos):
+    """Con --verificar-entrega, trata como inválidos los correos cuyo dominio no tiene servidores de correo.
+
+    Esos correos se vacían y se agregan a invalidos, igual que los mal escritos, para poder corregirlos. Los
+    dominios se consultan una sola vez por página y el resultado queda en la caché de correos; si el DNS no
+    responde, el correo se conserva.
+    """
+    if resolvedor_entrega is None:
+        return
+    dominios = {dominio(agencia["correo"]) for agencia in agencias if agencia["correo"]}
+    entrega = await verificar_dominios(dominios, resolvedor_entrega, normalizador_correos.cache)
+    for agencia in agencias:
+        if agencia["correo"] and entrega.get(dominio(agencia["correo"]), (None, []))[0] is False:
+            invalidos.append({"nombre_agencia": agencia["nombre"], "correo": agencia["correo"],
+                              "provincia": agencia["provincia"]})
+            agencia["correo"] = ""
+
+
+async def avanzar_paginas(page, provincia, cantidad):
+    """Hace clic en 'Siguiente' la cantidad de veces indicada sin extraer datos. Devuelve False si no hay más páginas."""
+    for numero in range(2, cantidad + 2):
+        siguiente = page.locator("button[dusk='nextPage.after']")  # Localiza el botón "Siguiente"
+        if await siguiente.count() == 0 or not await siguiente.is_enabled():  # Si no existe o está deshabilitado
+            return False
+        firma_anterior = await firma_resultados(page)
+        await siguiente.scroll_into_view_if_needed()
+        await siguiente.click()
+        await esperar_cambio_resultados(page, firma_anterior)
+        print(f"[{provincia}] ⏩ Saltando a la página {numero}...")
+    return True
+
+
+async def extraer_agencias(page, provincia, escritor, diario=None):
+    """Recorre todas las páginas de resultados de una provincia y escribe cada página en el escritor CSV.
+
+    Devuelve (cantidad de agencias, completa, correos inválidos de la provincia). Cada página terminada se
+    registra en el diario junto con sus correos inválidos; si el diario ya tiene páginas de una corrida anterior,
+    se recuperan sus agencias y se continúa desde la página siguiente. Los correos inválidos se juntan por
+    página y no en la lista global: con varias provincias en paralelo, cada diario guarda solo los suyos.
+    """
+    ultima_pagina_guardada = 0  # Última página registrada en el checkpoint
+    invalidos = []  # Correos inválidos de esta provincia
+
+    if diario:
+        for entrada in diario.cargar():  # Páginas terminadas en una corrida anterior
+            await escritor.escribir(entrada["agencias"])
+            invalidos.extend(entrada["correos_invalidos"])
+            ultima_pagina_guardada = entrada["pagina"]
+        if ultima_pagina_guardada:
+            print(f"[{provincia}] ♻️ Reanudando desde la página {ultima_pagina_guardada + 1} "
+                  f"({escritor.filas_escritas} agencias recuperadas del checkpoint)")
+
+    espera_real = await buscar_provincia(page, provincia)  # Segundos esperados para cargar la página actual
+    espera_fija = ESPERA_FIJA_BUSQUEDA_MS / 1000  # Segundos que se esperaban antes con pausas fijas
+    total_espera_real = 0.0  # Acumulados de toda la provincia
+    total_espera_fija = 0.0
+
+    if ultima_pagina_guardada and not await avanzar_paginas(page, provincia, ultima_pagina_guardada):
+        print(f"[{provincia}] ⛔ No hay más páginas después del checkpoint.")
+        return escritor.filas_escritas, True, invalidos
+
+    pagina = ultima_pagina_guardada + 1  # Contador de páginas
+    completa = True  # Pasa a False si la paginación se corta por un error
+
+    while True:  # Bucle para recorrer todas las páginas de resultados
+        print(f"[{provincia}] 📃 Página {pagina}: extrayendo agencias...")
+
+        invalidos_pagina = []  # Correos inválidos de esta página
+        agencias = [  # Agencias de esta página (solo se guarda una página en memoria)
+            parsear_agencia(bloque["nombre"], bloque["parrafos"], provincia, invalidos_pagina)
+            for bloque in await extraer_pagina(page)  # Todas las agencias de la página en una sola evaluación
+        ]
+        await verificar_entrega(agencias, invalidos_pagina)  # Solo con --verificar-entrega
+
+        if diario:  # La página queda guardada aunque la ejecución se corte más adelante
+            diario.registrar({
+                "pagina": pagina,
+                "agencias": agencias,
+                "correos_invalidos": invalidos_pagina
+            })
+        await escritor.escribir(agencias)  # La página se agrega al CSV parcial
+        invalidos.extend(invalidos_pagina)
+
+        # Cerrar modal si está abierto
+        print(f"[{provincia}] 🧹 Cerrando modal si está abierto...")
+        inicio_espera = time.perf_counter()
+        habia_modal = await page.evaluate("""
+            () => {
+                const modal = document.querySelector('[role=dialog]');
+                if (modal) {
+                    window.dispatchEvent(new CustomEvent('close-modal', { detail: { id: 'video1year' }}));
+                    return true;
+                }
+                return false;
+            }
+        """)  # Ejecuta JavaScript para cerrar cualquier modal que pueda aparecer
+        if habia_modal:  # Solo se espera si realmente había un modal
+            try:
+                await page.wait_for_selector("[role=dialog]", state="hidden", timeout=5000)  # Espera a que el modal desaparezca
+            except TimeoutError:
+                print(f"[{provincia}] ⚠️ El modal no se cerró, se continúa igual.")
+        espera_real += time.perf_counter() - inicio_espera
+        espera_fija += ESPERA_FIJA_MODAL_MS / 1000
+
+        # Informe del tiempo de espera de la página
+        total_espera_real += espera_real
+        total_espera_fija += espera_fija
+        print(f"[{provincia}] ⏱️ Página {pagina}: esperas de {espera_real:.2f} s (antes {espera_fija:.2f} s, ahorro {espera_fija - espera_real:.2f} s)")
+
+        # Verificar si hay botón de siguiente
+        siguiente = page.locator("button[dusk='nextPage.after']")  # Localiza el botón "Siguiente"
+        if await siguiente.count() == 0 or not await siguiente.is_enabled():  # Si no existe o está deshabilitado
+            print(f"[{provincia}] ⛔ No hay más páginas.")
+            break  # Sale del bucle
+
+        try:
+            print(f"[{provincia}] ➡️ Haciendo clic en 'Siguiente'...")
+            firma_anterior = await firma_resultados(page)  # Firma de la página que ya se extrajo
+            await siguiente.scroll_into_view_if_needed()  # Desplaza hasta el botón si es necesario
+            inicio_espera = time.perf_counter()
+            await siguiente.click()  # Hace clic en el botón "Siguiente"
+            await esperar_cambio_resultados(page, firma_anterior)  # Espera a que se muestre la página siguiente
+            espera_real = time.perf_counter() - inicio_espera
+            espera_fija = ESPERA_FIJA_SIGUIENTE_MS / 1000
+            pagina += 1  # Incrementa el contador de páginas
+        except Exception as e:
+            print(f"[{provincia}] ⚠️ Error al hacer clic en 'Siguiente': {e}")
+            completa = False  # Quedan páginas sin recorrer: el checkpoint se conserva para reanudar
+            break  # Sale del bucle si hay un error
+
+    ahorro = total_espera_fija - total_espera_real
+    paginas_recorridas = pagina - ultima_pagina_guardada
+    print(f"[{provincia}] ⏱️ Esperas totales: {total_espera_real:.1f} s (antes {total_espera_fija:.1f} s), "
+          f"ahorro de {ahorro:.1f} s ({ahorro / paginas_recorridas:.2f} s por página)")
+    return escritor.filas_escritas, completa, invalidos
+
+
+def directorio_resultados():
+    """Devuelve la carpeta resultados junto al script (la crea si no existe)."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))  # Obtiene la ruta absoluta del directorio donde está el script
+    results_dir = os.path.join(script_dir, "resultados")  # Crea la ruta a la carpeta "resultados" dentro del directorio del script
+    os.makedirs(results_dir, exist_ok=True)  # Crea la carpeta "resultados" si no existe (exist_ok por si otra provincia la crea en paralelo)
+    return results_dir
+
+
+def nombre_base(provincia):
+    """Nombre de archivo (sin extensión) de los resultados de una provincia."""
+    return f"{provincia.lower().replace(' ', '_')}_agencias_viaje"
 
-async def scrapear_agencias_completo(provincia):
+
+def diario_provincia(provincia, reanudar=True):
+    """Diario de checkpoints de la provincia; si no se reanuda, se descarta el que hubiera."""
+    diario = DiarioCheckpoint(ruta_checkpoint(directorio_resultados(), nombre_base(provincia)))
+    if not reanudar:
+        diario.eliminar()
+    return diario
+
+
+def actualizar_almacen(ruta_csv, provincia):
+    """Reemplaza la provincia en el almacén consolidado (resultados/agencias.sqlite) con el CSV terminado."""
+    try:
+        actualizar_desde_csv(ruta_csv, provincia)
+    except Exception as e:  # El CSV ya quedó guardado: un error del almacén no debe perder la corrida
+        print(f"⚠️ No se pudo actualizar el almacén consolidado con {provincia}: {e}")
+
+
+def escritor_provincia(provincia):
+    """Escritor en streaming de resultados/<provincia>_agencias_viaje.csv (se completa al salir del bloque async with)."""
+    csv_filename = os.path.join(directorio_resultados(), f"{nombre_base(provincia)}.csv")  # Construye la ruta completa del archivo CSV
+    print(f"[{provincia}] 💾 Guardando en CSV: {csv_filename}")
+    return EscritorCSV(csv_filename, COLUMNAS_CSV)
+
+
+async def scrapear_agencias_completo(provincia, bloquear_recursos=True, reanudar=True):
     global correos_invalidos
-    global nombre_agencia_actual
     correos_invalidos = []  # Reiniciamos la lista para cada provincia
-    
+    bloqueador = BloqueadorRecursos.para_sitio("rnav") if bloquear_recursos else BloqueadorRecursos.sin_bloqueo()
+    diario = diario_provincia(provincia, reanudar)  # Checkpoint de páginas terminadas
+
     async with async_playwright() as p:  # Inicializa playwright
         browser = await p.chromium.launch(headless=True)  # Inicia el navegador en modo headless (sin interfaz gráfica)
         context = await browser.new_context()  # Crea un nuevo contexto de navegación
+        await bloqueador.instalar(context)  # No descarga imágenes, fuentes, videos ni recursos de terceros (y mide lo descargado)
         page = await context.new_page()  # Crea una nueva página
 
         try:
-            print("🌐 Cargando página...")
-            await page.goto("https://www.agenciasdeviajes.ar/#buscador", timeout=30000)  # Navega a la página de agencias de viaje
-
-            print(f"⌨️ Buscando '{provincia}'...")
-            await page.wait_for_selector("input[placeholder*='Ciudad o Provincia']", timeout=20000)  # Espera a que aparezca el campo de búsqueda
-            await page.fill("input[placeholder*='Ciudad o Provincia']", provincia)  # Completa el campo de búsqueda con la provincia
-            await page.wait_for_timeout(2000)  # Espera 2 segundos
-
-            print("⌛ Esperando resultados...")
-            await page.wait_for_selector("h3.text-lg", timeout=20000)  # Espera a que aparezcan los resultados
-
-            agencias = []  # Lista para almacenar los datos de las agencias
-            pagina = 1  # Contador de páginas
-
-            while True:  # Bucle para recorrer todas las páginas de resultados
-                print(f"📃 Página {pagina}: extrayendo agencias...")
-
-                h3_agencias = await page.query_selector_all("h3.text-lg")  # Obtiene todos los nombres de agencias
-                for h3 in h3_agencias:  # Recorre cada agencia encontrada
-                    nombre = await h3.inner_text()  # Obtiene el nombre de la agencia
-                    telefono = ""
-                    correo = ""
-                    localidad = ""
-
-                    contenedor = await h3.evaluate_handle("node => node.parentElement.parentElement")  # Obtiene el contenedor padre que tiene toda la info
-                    contenedor_element = contenedor.as_element()  # Convierte a elemento para poder interactuar
-                    
-                    if contenedor_element:  # Si se encontró el contenedor
-                        parrafos = await contenedor_element.query_selector_all("p.leading-relaxed.text-sm")  # Obtiene todos los párrafos con información
-                        for p in parrafos:  # Recorre cada párrafo
-                            texto = await p.inner_text()  # Obtiene el texto del párrafo
-                            if "Teléfono:" in texto:  # Si contiene información de teléfono
-                                telefono = texto.replace("Teléfono:", "").strip()  # Extrae el número de teléfono
-                            if "Correo electrónico:" in texto:  # Si contiene información de correo
-                                correo = texto.replace("Correo electrónico:", "").strip()
-                                nombre_agencia_actual = nombre  # Seteamos esta variable global temporal
-                                correo = normalizar_correo(correo)  # Normaliza el correo
-                            if "Localidad:" in texto:  # Si contiene información de localidad
-                                localidad = texto.replace("Localidad:", "").strip()  # Extrae la localidad
-
-                    # Agrega la información de la agencia a la lista
-                    agencias.append({
-                        "nombre": nombre,
-                        "telefono": telefono,
-                        "correo": correo,
-                        "localidad": localidad,
-                        "provincia": provincia
-                    })
-
-                # Cerrar modal si está abierto
-                print("🧹 Cerrando modal si está abierto...")
-                await page.evaluate("""
-                    () => {
-                        const modal = document.querySelector('[role=dialog]');
-                        if (modal) {
-                            window.dispatchEvent(new CustomEvent('close-modal', { detail: { id: 'video1year' }}));
-                        }
-                    }
-                """)  # Ejecuta JavaScript para cerrar cualquier modal que pueda aparecer
-                await page.wait_for_timeout(1000)  # Espera 1 segundo
-
-                # Verificar si hay botón de siguiente
-                siguiente = page.locator("button[dusk='nextPage.after']")  # Localiza el botón "Siguiente"
-                if await siguiente.count() == 0 or not await siguiente.is_enabled():  # Si no existe o está deshabilitado
-                    print("⛔ No hay más páginas.")
-                    break  # Sale del bucle
-
-                try:
-                    print("➡️ Haciendo clic en 'Siguiente'...")
-                    await siguiente.scroll_into_view_if_needed()  # Desplaza hasta el botón si es necesario
-                    await siguiente.click()  # Hace clic en el botón "Siguiente"
-                    await page.wait_for_timeout(2500)  # Espera 2.5 segundos para que cargue la siguiente página
-                    pagina += 1  # Incrementa el contador de páginas
-                except Exception as e:
-                    print(f"⚠️ Error al hacer clic en 'Siguiente': {e}")
-                    break  # Sale del bucle si hay un error
+            # Recorre todas las páginas de la provincia guardando el CSV local a medida que avanza
+            async with escritor_provincia(provincia) as escritor:
+                cantidad, completa, invalidos = await extraer_agencias(page, provincia, escritor, diario)
+            correos_invalidos.extend(invalidos)
+            normalizador_correos.guardar_cache()  # Escribe en disco las validaciones nuevas
 
             await browser.close()  # Cierra el navegador
+            print(bloqueador.resumen())
 
-            # Guardar CSV local
-            script_dir = os.path.dirname(os.path.abspath(__file__))  # Obtiene la ruta absoluta del directorio donde está el script
-            results_dir = os.path.join(script_dir, "resultados")  # Crea la ruta a la carpeta "resultados" dentro del directorio del script
-            # Crear la carpeta resultados si no existe
-            if not os.path.exists(results_dir):  # Verifica si la carpeta "resultados" no existe
-                os.makedirs(results_dir)  # Crea la carpeta "resultados" si no existe
-            csv_filename = os.path.join(results_dir, f"{provincia.lower().replace(' ', '_')}_agencias_viaje.csv")  # Construye la ruta completa del archivo CSV
-            print(f"💾 Guardando en CSV: {csv_filename}")
-            with open(csv_filename, "w", newline="", encoding="utf-8") as f:  # Abre el archivo CSV en modo escritura con codificación UTF-8
-                writer = csv.DictWriter(f, fieldnames=["nombre", "telefono", "correo", "localidad", "provincia"])  # Crea un escritor CSV con las columnas especificadas
-                writer.writeheader()  # Escribe la fila de encabezados
-                writer.writerows(agencias)  # Escribe todas las filas de datos de las agencias
+            if completa:
+                diario.eliminar()  # La provincia terminó: ya no hace falta el checkpoint
+                aplicar_correcciones_guardadas(provincia, escritor.ruta)  # Correcciones ingresadas en corridas anteriores
+            else:
+                print("⚠️ La provincia quedó incompleta; volvé a ejecutar para reanudar desde el checkpoint.")
 
             # Guardar Excel en Drive
-            #df = pd.DataFrame(agencias)  # Crea un DataFrame de pandas con los datos de las agencias (comentado)
+            #df = pd.read_csv(escritor.ruta)  # Lee el CSV recién guardado con pandas (comentado)
             #xlsx_path = f"/content/drive/MyDrive/{provincia.lower().replace(' ', '_')}_agencias_viaje.xlsx"  # Ruta del archivo Excel en Google Drive (comentado)
             #df.to_excel(xlsx_path, index=False)  # Guarda el DataFrame como Excel en Google Drive (comentado)
             #print(f"✅ Archivo Excel guardado en Google Drive: {xlsx_path}")  # Muestra mensaje de confirmación (comentado)
-            
+
             # Después de guardar los archivos, mostramos los correos inválidos
-            
+
             mostrar_correos_invalidos()
 
             if correos_invalidos:
                 intentar_corregir = input("\n¿Desea intentar corregir los correos inválidos encontrados antes de guardar? (s/n): ").lower()
                 if intentar_corregir == 's':
-                    corregir_correos_invalidos()
+                    corregir_correos_invalidos(provincia, escritor.ruta if completa else None)
+
+            if completa:
+                actualizar_almacen(escritor.ruta, provincia)  # Después de las correcciones, para guardar la versión final
 
-            print(f"📁 Total agencias: {len(agencias)}")  # Muestra el total de agencias encontradas
+            print(f"📁 Total agencias: {cantidad}")  # Muestra el total de agencias encontradas
 
         except KeyboardInterrupt:
             print("❌ Ejecución interrumpida por el usuario.")  # Maneja la interrupción por teclado
         except TimeoutError as e:
             print(f"❌ Timeout alcanzado: {e}")  # Maneja errores de tiempo de espera
+            print("♻️ Las páginas ya recorridas quedaron en el checkpoint; volvé a ejecutar para reanudar.")
         except Exception as e:
             print(f"⚠️ Ocurrió un error inesperado: {e}")  # Maneja cualquier otro error
+            print("♻️ Las páginas ya recorridas quedaron en el checkpoint; volvé a ejecutar para reanudar.")
+
+
+async def scrapear_provincia(browser, provincia, semaforo, progreso, bloqueador=None, reanudar=True):
+    """Scrapea una provincia en su propio contexto del navegador compartido, respetando el límite de concurrencia."""
+    async with semaforo:  # Espera un lugar libre en el pool antes de abrir el contexto
+        inicio = time.perf_counter()  # Momento de inicio para medir la duración
+        context = await browser.new_context()  # Cada provincia usa un contexto aislado (cookies, estado de Livewire)
+        if bloqueador:
+            await bloqueador.instalar(context)  # Todas las provincias suman a los mismos contadores
+        page = await context.new_page()  # Crea una nueva página dentro del contexto
+        resultado = {"provincia": provincia, "agencias": 0, "segundos": 0.0, "error": ""}
+
+        try:
+            diario = diario_provincia(provincia, reanudar)  # Checkpoint de páginas terminadas
+            async with escritor_provincia(provincia) as escritor:  # El CSV se escribe página por página
+                cantidad, completa, invalidos = await extraer_agencias(page, provincia, escritor, diario)
+            correos_invalidos.extend(invalidos)  # Sin await en el medio: se agrega a la lista vigente de la corrida
+            normalizador_correos.guardar_cache()  # Escribe en disco las validaciones nuevas
+            resultado["agencias"] = cantidad
+            if completa:
+                diario.eliminar()  # La provincia terminó: ya no hace falta el checkpoint
+                aplicar_correcciones_guardadas(provincia, escritor.ruta)
+                actualizar_almacen(escritor.ruta, provincia)
+            else:
+                resultado["error"] = "Incompleta (se puede reanudar desde el checkpoint)"
+        except TimeoutError as e:
+            resultado["error"] = f"Timeout alcanzado: {e}"  # Maneja errores de tiempo de espera
+        except Exception as e:
+            resultado["error"] = f"Error inesperado: {e}"  # Maneja cualquier otro error
+        finally:
+            await context.close()  # Libera el contexto para la siguiente provincia
+
+        resultado["segundos"] = time.perf_counter() - inicio
+        progreso["completadas"] += 1
+        estado = f"❌ {resultado['error']}" if resultado["error"] else f"✅ {resultado['agencias']} agencias"
+        print(f"\n🏁 [{progreso['completadas']}/{progreso['total']}] {provincia}: {estado} en {resultado['segundos']:.1f} s\n")
+        return resultado
+
+
+async def scrapear_todas_las_provincias(concurrencia=CONCURRENCIA_POR_DEFECTO, provincias=PROVINCIAS, bloquear_recursos=True, reanudar=True):
+    """Scrapea todas las provincias sin interacción, compartiendo un único navegador y un pool acotado de contextos."""
+    global correos_invalidos
+    correos_invalidos = []  # Una sola lista para toda la corrida (cada entrada indica su provincia)
+    bloqueador = BloqueadorRecursos.para_sitio("rnav") if bloquear_recursos else BloqueadorRecursos.sin_bloqueo()
+
+    concurrencia = max(1, concurrencia)  # Al menos una provincia a la vez
+    semaforo = asyncio.Semaphore(concurrencia)  # Limita la cantidad de contextos abiertos al mismo tiempo
+    progreso = {"completadas": 0, "total": len(provincias)}  # Contador compartido para reportar el avance
+
+    print(f"🚀 Scrapeando {len(provincias)} provincias con hasta {concurrencia} en paralelo...")
+    inicio = time.perf_counter()
+
+    async with async_playwright() as p:  # Inicializa playwright
+        browser = await p.chromium.launch(headless=True)  # Un único navegador para todas las provincias
+        try:
+            resultados = await asyncio.gather(
+                *(scrapear_provincia(browser, provincia, semaforo, progreso, bloqueador, reanudar) for provincia in provincias)
+            )
+        finally:
+            await browser.close()  # Cierra el navegador
+
+    total_segundos = time.perf_counter() - inicio
+
+    # Resumen por provincia
+    print("\n=== RESUMEN ===")
+    for r in resultados:
+        estado = f"ERROR: {r['error']}" if r["error"] else f"{r['agencias']} agencias"
+        print(f"{r['provincia']:<22} {r['segundos']:>7.1f} s  {estado}")
+    suma_segundos = sum(r["segundos"] for r in resultados)
+    print(f"\n📁 Total agencias: {sum(r['agencias'] for r in resultados)}")
+    print(f"⏱️ Tiempo total: {total_segundos:.1f} s (secuencial habría sido ~{suma_segundos:.1f} s)")
+
+    print(bloqueador.resumen())
+
+    fallidas = [r["provincia"] for r in resultados if r["error"]]
+    if fallidas:
+        print(f"⚠️ Provincias con error: {', '.join(fallidas)}")
+        print("♻️ Volvé a ejecutar con --todas para reanudarlas desde su último checkpoint.")
+
+    mostrar_correos_invalidos()  # En modo no interactivo solo se listan, sin pedir correcciones
+    return resultados
+
+
+async def comparar_extraccion(provincia, repeticiones=5):
+    """Benchmark: compara filas/segundo de la extracción en bloque contra la extracción elemento por elemento."""
+    async with async_playwright() as p:  # Inicializa playwright
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        try:
+            await buscar_provincia(page, provincia)  # Deja cargada la primera página de resultados
+
+            metodos = {"elemento por elemento": extraer_pagina_por_elemento, "evaluación única": extraer_pagina}
+            resultados = {}
+            for nombre_metodo, funcion in metodos.items():
+                inicio = time.perf_counter()
+                for _ in range(repeticiones):  # Se repite sobre la misma página para promediar
+                    bloques = await funcion(page)
+                segundos = time.perf_counter() - inicio
+                resultados[nombre_metodo] = bloques
+                filas_por_segundo = len(bloques) * repeticiones / segundos if segundos else 0.0
+                print(f"📊 {nombre_metodo:<22} {len(bloques)} filas x {repeticiones}: {segundos:.3f} s ({filas_por_segundo:.1f} filas/s)")
+
+            iguales = resultados["elemento por elemento"] == resultados["evaluación única"]
+            print("✅ Ambos métodos devuelven los mismos datos." if iguales else "⚠️ Los métodos devolvieron datos distintos.")
+        finally:
+            await browser.close()
+
+
+def comparar_normalizacion(repeticiones=3):
+    """Benchmark: compara correos/segundo de la normalización original contra el motor con caché.
+
+    Usa los correos de los CSV de resultados/ más variantes con errores comunes (mayúsculas, "(at)", @ faltante).
+    """
+    correos = []
+    for archivo in sorted(os.listdir(directorio_resultados())):
+        if archivo.endswith("_agencias_viaje.csv"):
+            df = pd.read_csv(os.path.join(directorio_resultados(), archivo), usecols=["correo"], dtype=str)
+            correos.extend(df["correo"].dropna())
+    if not correos:
+        print("⚠️ No hay CSV de agencias en resultados/ para medir.")
+        return
+    correos += [c.upper() for c in correos] + [c.replace("@", " (at) ") for c in correos] + [c.replace("@", "") for c in correos]
+    print(f"📬 {len(correos)} correos ({len(set(correos))} distintos), {repeticiones} repeticiones")
+
+    def medir(nombre_metodo, funcion):
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            resultado = funcion()
+        segundos = time.perf_counter() - inicio
+        print(f"📊 {nombre_metodo:<22} {len(correos) * repeticiones / segundos:,.0f} correos/s ({segundos:.3f} s)")
+        return resultado
+
+    anterior = medir("versión anterior", lambda: [normalizar_version_anterior(c) for c in correos])
+    normalizador = NormalizadorCorreos()  # Caché vacía: la primera repetición incluye las validaciones
+    uno_por_uno = medir("motor (uno por uno)", lambda: [normalizador.normalizar(c) for c in correos])
+    normalizador = NormalizadorCorreos()
+    lote = medir("motor (lote)", lambda: normalizador.normalizar_lote(pd.Series(correos)).tolist())
+    print(f"🗃️ Caché: {normalizador.cache_info()}")
+
+    iguales = anterior == uno_por_uno == lote
+    print("✅ Todos los métodos devuelven los mismos correos." if iguales else "⚠️ Los métodos devolvieron correos distintos.")
+
+
+def parsear_argumentos():
+    parser = argparse.ArgumentParser(description="Scraper de agencias de viaje del RNAV por provincia.")
+    parser.add_argument("--todas", action="store_true", help="Scrapea todas las provincias sin mostrar el menú")
+    parser.add_argument("--concurrencia", type=int, default=CONCURRENCIA_POR_DEFECTO,
+                        help=f"Cantidad máxima de provincias en paralelo (por defecto {CONCURRENCIA_POR_DEFECTO})")
+    parser.add_argument("--sin-bloqueo", action="store_true",
+                        help="Descarga todos los recursos (no bloquea imágenes, fuentes, videos ni dominios externos)")
+    parser.add_argument("--sin-reanudar", action="store_true",
+                        help="Ignora los checkpoints de corridas anteriores y empieza desde la primera página")
+    parser.add_argument("--verificar-entrega", action="store_true",
+                        help="Trata como inválidos los correos cuyo dominio no tiene servidores de correo (consulta los MX)")
+    parser.add_argument("--dns-servidor", nargs="+", metavar="IP",
+                        help="Servidores DNS para --verificar-entrega (por defecto, los del sistema)")
+    parser.add_argument("--dns-puerto", type=int, default=53, help="Puerto de los servidores DNS (por defecto 53)")
+    parser.add_argument("--benchmark-extraccion", metavar="PROVINCIA",
+                        help="Compara la velocidad de los dos métodos de extracción sobre la primera página de la provincia")
+    parser.add_argument("--benchmark-correos", action="store_true",
+                        help="Compara la velocidad de la normalización de correos original y la del motor con caché")
+    return parser.parse_args()
+
 
 async def main():
+    global resolvedor_entrega
+    args = parsear_argumentos()
+
+    if args.verificar_entrega:
+        resolvedor_entrega = ResolvedorDNS(args.dns_servidor, args.dns_puerto)
+
+    if args.benchmark_extraccion:  # Solo mide la extracción, no guarda resultados
+        await comparar_extraccion(args.benchmark_extraccion)
+        return
+
+    if args.benchmark_correos:  # Solo mide la normalización de correos sobre los CSV ya guardados
+        comparar_normalizacion()
+        return
+
+    if args.todas:  # Modo no interactivo: todas las provincias en una sola corrida
+        await scrapear_todas_las_provincias(args.concurrencia, bloquear_recursos=not args.sin_bloqueo,
+                                            reanudar=not args.sin_reanudar)
+        return
+
     while True:
         opcion = mostrar_menu()
-        
+
         if opcion == "0":
             print("¡Hasta luego!")
             break
-            
+
+        if opcion.strip().upper() == "T":  # Todas las provincias con la concurrencia indicada
+            await scrapear_todas_las_provincias(args.concurrencia, bloquear_recursos=not args.sin_bloqueo,
+                                            reanudar=not args.sin_reanudar)
+            break
+
         try:
             opcion = int(opcion)
             if 1 <= opcion <= len(PROVINCIAS):
                 provincia = PROVINCIAS[opcion - 1]
-                await scrapear_agencias_completo(provincia)
-                
+                await scrapear_agencias_completo(provincia, bloquear_recursos=not args.sin_bloqueo,
+                                                 reanudar=not args.sin_reanudar)
+
                 continuar = input("\n¿Desea buscar otra provincia? (s/n): ").lower()
                 if continuar != 's':
                     print("¡Hasta luego!")
@@ -0,0 +1,109 @@
+# Bloqueo de recursos para los scrapers con Playwright: cancela las descargas de imágenes, fuentes,
+# videos y de cualquier dominio que no sea del sitio (analítica, reproductores de video, etc.).
+# Se comparte entre los scrapers de RNAV y AHTRA; cada sitio tiene su perfil en PERFILES.
+# Los bytes descargados se miden (request.sizes() de cada request terminada). Los bytes de las requests
+# canceladas no se pueden medir porque nunca se descargan: el resumen muestra una estimación por tipo de
+# recurso. Para medir el ahorro real se comparan los bytes descargados de una corrida con bloqueo y otra
+# con --sin-bloqueo (que usa BloqueadorRecursos.sin_bloqueo() para medir sin cancelar nada).
+
+from urllib.parse import urlparse
+
+# Tipos de recurso de Playwright que nunca hacen falta para leer los datos
+TIPOS_BLOQUEADOS_POR_DEFECTO = ("image", "font", "media")
+
+# Configuración por sitio: tipos de recurso bloqueados y dominios desde los que se permite descargar
+PERFILES = {
+    "rnav": {
+        "tipos_bloqueados": TIPOS_BLOQUEADOS_POR_DEFECTO,
+        # Livewire y Alpine se sirven desde el propio sitio o desde estos CDN
+        "dominios_permitidos": ("agenciasdeviajes.ar", "cdn.jsdelivr.net", "unpkg.com"),
+    },
+    "ahtra": {
+        "tipos_bloqueados": TIPOS_BLOQUEADOS_POR_DEFECTO,
+        "dominios_permitidos": ("ahtra.com.ar",),
+    },
+}
+
+# Tamaño promedio supuesto (no medido) por tipo de recurso, para estimar los bytes que no se descargaron
+TAMANO_ESTIMADO_BYTES = {
+    "image": 40_000,
+    "font": 30_000,
+    "media": 500_000,
+    "script": 25_000,
+}
+TAMANO_ESTIMADO_OTROS = 5_000
+
+
+class BloqueadorRecursos:
+    """Intercepta las requests de un contexto de Playwright y cancela las que no hacen falta."""
+
+    def __init__(self, tipos_bloqueados=TIPOS_BLOQUEADOS_POR_DEFECTO, dominios_permitidos=()):
+        self.tipos_bloqueados = set(tipos_bloqueados)
+        self.dominios_permitidos = tuple(d.lower() for d in dominios_permitidos)
+        self.permitidas = 0  # Requests que se dejaron pasar
+        self.bloqueadas = {}  # Tipo de recurso -> cantidad de requests canceladas
+        self.bytes_estimados_bloqueados = 0  # Estimación según TAMANO_ESTIMADO_BYTES (no es una medición)
+        self.descargadas = 0  # Requests terminadas cuyo tamaño se midió
+        self.bytes_descargados = 0  # Medido: encabezados y cuerpo de cada respuesta, tal como llegaron por la red
+
+    @classmethod
+    def para_sitio(cls, sitio, dominios_extra=()):
+        """Crea un bloqueador con el perfil del sitio, sumando dominios permitidos (por ejemplo un servidor local)."""
+        perfil = PERFILES[sitio]
+        return cls(perfil["tipos_bloqueados"], tuple(perfil["dominios_permitidos"]) + tuple(dominios_extra))
+
+    @classmethod
+    def sin_bloqueo(cls):
+        """Crea un bloqueador que no cancela nada y solo mide los bytes descargados (corrida de referencia)."""
+        return cls(tipos_bloqueados=(), dominios_permitidos=())
+
+    @property
+    def bloquea(self):
+        return bool(self.tipos_bloqueados or self.dominios_permitidos)
+
+    def dominio_permitido(self, url):
+        host = (urlparse(url).hostname or "").lower()
+        if not host:  # data:, blob:, about:blank
+            return True
+        return any(host == d or host.endswith("." + d) for d in self.dominios_permitidos)
+
+    def debe_bloquear(self, tipo_recurso, url):
+        if tipo_recurso in self.tipos_bloqueados:
+            return True
+        return bool(self.dominios_permitidos) and not self.dominio_permitido(url)
+
+    async def instalar(self, context):
+        """Activa el bloqueo y la medición de bytes descargados en todas las páginas del contexto."""
+        context.on("requestfinished", self._medir)
+        if self.bloquea:  # Sin nada que bloquear no hace falta interceptar cada request
+            await context.route("**/*", self._interceptar)
+
+    async def _medir(self, request):
+        try:
+            tamanos = await request.sizes()
+        except Exception:  # La página o el contexto se cerraron antes de leer los tamaños
+            return
+        self.descargadas += 1
+        self.bytes_descargados += tamanos["responseHeadersSize"] + tamanos["responseBodySize"]
+
+    async def _interceptar(self, route):
+        request = route.request
+        if self.debe_bloquear(request.resource_type, request.url):
+            self.bloqueadas[request.resource_type] = self.bloqueadas.get(request.resource_type, 0) + 1
+            self.bytes_estimados_bloqueados += TAMANO_ESTIMADO_BYTES.get(request.resource_type, TAMANO_ESTIMADO_OTROS)
+            await route.abort()
+        else:
+            self.permitidas += 1
+            await route.continue_()
+
+    def resumen(self):
+        descargado = f"📦 Descargado (medido): {self.bytes_descargados / 1_000_000:.2f} MB en {self.descargadas} requests"
+        if not self.bloquea:
+            return f"{descargado} (sin bloqueo)."
+        total = sum(self.bloqueadas.values())
+        if not total:
+            return f"🛡️ No se bloquearon requests ({self.permitidas} permitidas).\n{descargado}."
+        detalle = ", ".join(f"{tipo}: {cantidad}" for tipo, cantidad in sorted(self.bloqueadas.items()))
+        return (f"🛡️ Requests bloqueadas: {total} ({detalle}); permitidas: {self.permitidas}\n"
+                f"{descargado}; las bloqueadas se estiman en ~{self.bytes_estimados_bloqueados / 1_000_000:.1f} MB "
+                f"según tamaños promedio supuestos, sin medir (para medir el ahorro, comparar con una corrida --sin-bloqueo)")
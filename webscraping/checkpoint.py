@@ -0,0 +1,50 @@
+# Checkpoints para los scrapers: diario append-only en formato JSONL (una entrada JSON por línea).
+# Cada página o cada hotel terminado se agrega al diario apenas se completa, de modo que si la
+# ejecución se corta (timeout, error de red, Ctrl+C) la siguiente corrida retoma desde ahí.
+
+import json
+import os
+
+
+def ruta_checkpoint(resultados_dir, nombre):
+    """Ruta del diario dentro de resultados/checkpoints (crea la carpeta si no existe)."""
+    carpeta = os.path.join(resultados_dir, "checkpoints")
+    os.makedirs(carpeta, exist_ok=True)
+    return os.path.join(carpeta, f"{nombre}.jsonl")
+
+
+class DiarioCheckpoint:
+    """Diario append-only de trabajo terminado."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+
+    def cargar(self):
+        """Devuelve las entradas registradas (lista vacía si no hay diario)."""
+        if not os.path.exists(self.ruta):
+            return []
+        entradas = []
+        cortado = False
+        with open(self.ruta, encoding="utf-8") as f:
+            for linea in f:
+                try:
+                    entradas.append(json.loads(linea))
+                except json.JSONDecodeError:
+                    cortado = True  # Última línea cortada por una interrupción: se descarta
+                    break
+        if cortado:  # Se reescribe sin la línea cortada para que las próximas entradas no queden pegadas a ella
+            with open(self.ruta, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(e, ensure_ascii=False) + "\n" for e in entradas)
+        return entradas
+
+    def registrar(self, entrada):
+        """Agrega una entrada y la fuerza a disco antes de seguir."""
+        with open(self.ruta, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def eliminar(self):
+        """Borra el diario cuando el trabajo terminó completo."""
+        if os.path.exists(self.ruta):
+            os.remove(self.ruta)
@@ -0,0 +1,83 @@
+# Escritor de CSV en streaming para los scrapers: las filas se escriben a medida que se extraen
+# (por página o por hotel) en un archivo temporal "<nombre>.parcial.csv", que al terminar bien se
+# renombra al nombre final. Así la memoria no crece con el tamaño del resultado, siempre hay una
+# salida parcial en disco y el CSV anterior no se pisa con uno incompleto si la ejecución se corta.
+
+import asyncio
+import csv
+import os
+
+
+class EscritorCSV:
+    """Sink asíncrono de filas (dicts) hacia un CSV, con escritura atómica al cerrar."""
+
+    def __init__(self, ruta, columnas):
+        self.ruta = ruta
+        base, extension = os.path.splitext(ruta)
+        self.ruta_parcial = f"{base}.parcial{extension}"
+        self.columnas = columnas
+        self.filas_escritas = 0
+        self._lock = asyncio.Lock()  # Serializa las escrituras de tareas concurrentes
+        self._pendientes = {}  # posición -> fila, para escribir_en_orden
+        self._siguiente = 0  # Próxima posición a escribir en escribir_en_orden
+        self._archivo = None
+        self._writer = None
+        self._descartado = False
+
+    async def __aenter__(self):
+        os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)
+        self._archivo = open(self.ruta_parcial, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._archivo, fieldnames=self.columnas, extrasaction="ignore")
+        self._writer.writeheader()
+        self._archivo.flush()
+        return self
+
+    def _escribir(self, filas):
+        self._writer.writerows(filas)
+        self._archivo.flush()  # La salida parcial queda en disco después de cada lote
+
+    async def escribir(self, filas):
+        """Escribe un lote de filas (por ejemplo, una página de resultados)."""
+        filas = list(filas)
+        if not filas:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._escribir, filas)
+            self.filas_escritas += len(filas)
+
+    async def escribir_en_orden(self, posicion, fila):
+        """Escribe la fila respetando el orden de las posiciones 0, 1, 2...
+
+        Las filas que llegan antes de tiempo esperan en memoria hasta que se completan las anteriores.
+        fila=None marca una posición sin datos, que se saltea.
+        """
+        self._pendientes[posicion] = fila
+        listas = []
+        while self._siguiente in self._pendientes:
+            fila_lista = self._pendientes.pop(self._siguiente)
+            self._siguiente += 1
+            if fila_lista is not None:
+                listas.append(fila_lista)
+        await self.escribir(listas)
+
+    def descartar(self):
+        """Al cerrar, borra la salida parcial y deja el CSV anterior sin cambios (por ejemplo, si el listado vino vacío)."""
+        self._descartado = True
+
+    async def __aexit__(self, tipo, excepcion, traza):
+        async with self._lock:
+            # Filas que quedaron esperando una posición que nunca llegó: se escriben en orden de posición
+            restantes = [self._pendientes[p] for p in sorted(self._pendientes) if self._pendientes[p] is not None]
+            self._pendientes.clear()
+            if restantes:
+                self._escribir(restantes)
+                self.filas_escritas += len(restantes)
+            self._archivo.close()
+
+        if self._descartado:
+            os.remove(self.ruta_parcial)
+        elif excepcion is None:
+            os.replace(self.ruta_parcial, self.ruta)  # Reemplazo atómico del CSV final
+        else:
+            print(f"⚠️ Salida parcial guardada en '{self.ruta_parcial}' ({self.filas_escritas} filas).")
+        return False